@@ -2,16 +2,37 @@
 Модуль пользовательского интерфейса для приложения "Театральный менеджер".
 Содержит классы для всех окон и диалогов приложения.
 """
+import os
 import sys
 from PySide6.QtWidgets import (QApplication, QMainWindow, QPushButton, QLabel, QVBoxLayout,
                               QHBoxLayout, QWidget, QDialog, QMessageBox, QComboBox,
                               QSpinBox, QTableWidget, QTableWidgetItem, QLineEdit,
-                              QFormLayout, QTabWidget, QScrollArea, QFrame, QHeaderView, QTextEdit)
-from PySide6.QtCore import Qt, Signal, QTimer
-from PySide6.QtGui import QFont, QIntValidator
+                              QFormLayout, QTabWidget, QScrollArea, QFrame, QHeaderView, QPlainTextEdit,
+                              QTableView, QAbstractItemView, QProgressBar, QFileDialog, QCheckBox,
+                              QDateTimeEdit)
+from PySide6.QtCore import Qt, Signal, QTimer, QAbstractTableModel, QModelIndex, QDateTime
+from PySide6.QtGui import QFont, QIntValidator, QColor, QTextCursor
 
 from controller import TheaterController
-from logger import Logger
+from data import PAGE_SIZE
+from log_archive import search_logs, LOG_LEVELS
+from logger import Logger, LogTailReader
+from worker import DbWorker
+
+
+# Интервал обновления статистики запросов в главном окне (мс)
+QUERY_STATS_REFRESH_MS = 2000
+# Допустимое число запросов к БД при создании спектакля с расчетом результатов
+PRODUCE_PERFORMANCE_QUERY_BUDGET = 25
+# Квантили прибыли, показываемые в прогнозе спектакля
+FORECAST_SHOWN_QUANTILES = (0.05, 0.5, 0.95)
+# Время ожидания завершения фоновых операций при закрытии окна (мс)
+WORKER_SHUTDOWN_TIMEOUT_MS = 5000
+# Окно логов: число последних строк при открытии, размер порции более старых строк
+# и максимальное число строк в окне
+LOG_VIEW_TAIL_LINES = 1000
+LOG_VIEW_CHUNK_LINES = 1000
+LOG_VIEW_MAX_LINES = 20000
 
 
 class ValidatedLoginLineEdit(QLineEdit):
@@ -244,16 +265,15 @@ class LoginDialog(QDialog):
             warn_box.exec()
             return
 
-        # Установка параметров подключения
+        # Установка параметров подключения (пул позволяет работать с БД из фоновых потоков)
         self.controller.set_connection_params(dbname, user, password, host, port)
+        self.controller.enable_connection_pool()
 
         # Попытка подключения
         if self.controller.connect_to_database():
             try:
                 # Проверка существования структуры базы данных
-                self.controller.db.cursor.execute(
-                    "SELECT 1 FROM information_schema.tables WHERE table_name = 'game_data'")
-                table_exists = self.controller.db.cursor.fetchone() is not None
+                table_exists = self.controller.is_schema_initialized()
 
                 # Если структура не существует, предлагаем создать
                 if not table_exists:
@@ -326,8 +346,9 @@ class LoginDialog(QDialog):
             warn_box.exec()
             return
 
-        # Установка параметров подключения
+        # Установка параметров подключения (пул позволяет работать с БД из фоновых потоков)
         self.controller.set_connection_params(dbname, user, password, host, port)
+        self.controller.enable_connection_pool()
 
         # Попытка создания базы данных
         if self.controller.create_database():
@@ -384,6 +405,10 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Театральный менеджер")
         self.setMinimumSize(900, 600)
 
+        # Фоновый исполнитель операций с БД
+        self.worker = DbWorker(self.controller, self)
+        self.worker.busy_changed.connect(self.set_busy)
+
         # Установка стилей для всего приложения
         self.set_application_style()
 
@@ -394,6 +419,14 @@ class MainWindow(QMainWindow):
         self.load_logs()
         self.update_game_info()
 
+        # Асинхронный доступ к БД для одновременной загрузки данных (подключается в фоне)
+        self.controller.enable_async_backend()
+
+        # Отслеживание изменений, сделанных другими клиентами
+        listener = self.controller.start_change_listener()
+        if listener:
+            listener.tables_changed.connect(self.on_remote_change)
+
         self.logger.info("Главное окно инициализировано")
 
     def setup_ui(self):
@@ -451,11 +484,16 @@ class MainWindow(QMainWindow):
         # Вкладка логов
         log_tab = QWidget()
         log_layout = QVBoxLayout(log_tab)
-        self.log_display = QTextEdit()
-        self.log_display.setReadOnly(True)
+        self.log_display = LogView(self.logger.log_file)
         self.log_display.setStyleSheet("background-color: white; color: black; ")
         log_layout.addWidget(self.log_display)
+        search_logs_btn = QPushButton("Поиск в логах")
+        search_logs_btn.clicked.connect(self.open_log_search)
+        log_layout.addWidget(search_logs_btn, alignment=Qt.AlignRight)
         self.data_tabs.addTab(log_tab, "Логи")
+
+        # Вкладка статистики запросов к БД
+        self.setup_query_stats_tab()
         self.data_tabs.setCurrentIndex(0)
 
         # Регистрация дисплея логов в логгере
@@ -471,6 +509,101 @@ class MainWindow(QMainWindow):
         disconnect_btn_layout.addStretch()
         main_layout.addLayout(disconnect_btn_layout)
 
+        # Индикатор выполнения фоновых операций с БД
+        self.busy_bar = QProgressBar()
+        self.busy_bar.setRange(0, 0)
+        self.busy_bar.setMaximumWidth(200)
+        self.busy_bar.setVisible(False)
+        self.cancel_btn = QPushButton("Отменить")
+        self.cancel_btn.clicked.connect(self.worker.cancel_all)
+        self.cancel_btn.setVisible(False)
+        self.statusBar().addPermanentWidget(self.busy_bar)
+        self.statusBar().addPermanentWidget(self.cancel_btn)
+
+    def setup_query_stats_tab(self):
+        """Настройка вкладки со статистикой времени выполнения запросов к БД."""
+        stats_tab = QWidget()
+        stats_layout = QVBoxLayout(stats_tab)
+
+        controls_layout = QHBoxLayout()
+        self.stats_kind_combo = QComboBox()
+        self.stats_kind_combo.addItem("По методам", "methods")
+        self.stats_kind_combo.addItem("По запросам", "queries")
+        self.stats_kind_combo.addItem("По действиям", "actions")
+        self.stats_kind_combo.currentIndexChanged.connect(self.update_query_stats)
+        controls_layout.addWidget(self.stats_kind_combo)
+
+        controls_layout.addStretch()
+        controls_layout.addWidget(QLabel("Медленный запрос от, мс:"))
+        self.slow_threshold_spin = QSpinBox()
+        self.slow_threshold_spin.setRange(1, 60000)
+        self.slow_threshold_spin.setValue(int(self.controller.db.query_stats.slow_threshold_ms))
+        self.slow_threshold_spin.valueChanged.connect(self.controller.set_slow_query_threshold)
+        controls_layout.addWidget(self.slow_threshold_spin)
+
+        reset_stats_btn = QPushButton("Сбросить")
+        reset_stats_btn.clicked.connect(self.reset_query_stats)
+        controls_layout.addWidget(reset_stats_btn)
+        stats_layout.addLayout(controls_layout)
+
+        self.query_stats_table = QTableWidget(0, 7)
+        self.query_stats_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.query_stats_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.query_stats_table.verticalHeader().setVisible(False)
+        stats_layout.addWidget(self.query_stats_table)
+
+        self.stats_tab_index = self.data_tabs.addTab(stats_tab, "Запросы")
+
+        # Таблица обновляется периодически, только пока вкладка открыта
+        self.query_stats_timer = QTimer(self)
+        self.query_stats_timer.setInterval(QUERY_STATS_REFRESH_MS)
+        self.query_stats_timer.timeout.connect(self.update_query_stats)
+        self.data_tabs.currentChanged.connect(self.on_data_tab_changed)
+
+    def on_data_tab_changed(self, index):
+        """Запуск обновления статистики запросов при открытии ее вкладки."""
+        if index == self.stats_tab_index:
+            self.update_query_stats()
+            self.query_stats_timer.start()
+        else:
+            self.query_stats_timer.stop()
+
+    def update_query_stats(self):
+        """Обновление таблицы статистики запросов."""
+        kind = self.stats_kind_combo.currentData()
+        stats = self.controller.get_query_stats()[kind]
+        if kind == "actions":
+            self.query_stats_table.setHorizontalHeaderLabels(
+                ["Действие", "Запросов", "Различных", "Повторяющихся", "Одинаковых", "Лимит", "Время, мс"])
+        else:
+            self.query_stats_table.setHorizontalHeaderLabels(
+                ["Метод / запрос", "Вызовов", "Строк", "Среднее, мс", "p50, мс", "p95, мс", "Макс., мс"])
+
+        self.query_stats_table.setRowCount(len(stats))
+        for row, item in enumerate(stats):
+            name_item = QTableWidgetItem(item["name"])
+            if kind == "actions":
+                # Повторяющиеся запросы (N+1) и превышение лимита выделяются цветом
+                problems = [f"{count} раз: {query}" for query, count in item["repeated"] + item["duplicates"]]
+                name_item.setToolTip("\n".join(problems) or item["name"])
+                if problems or item["over_budget"]:
+                    name_item.setForeground(QColor("#c0392b"))
+                values = (item["queries"], item["distinct"], len(item["repeated"]), len(item["duplicates"]),
+                          item["budget"] if item["budget"] is not None else "—", item["elapsed_ms"])
+            else:
+                name_item.setToolTip(item["name"])
+                values = (item["calls"], item["rows"], item["avg_ms"], item["p50_ms"], item["p95_ms"],
+                          item["max_ms"])
+            self.query_stats_table.setItem(row, 0, name_item)
+            for column, value in enumerate(values, start=1):
+                text = f"{value:.1f}" if isinstance(value, float) else str(value)
+                self.query_stats_table.setItem(row, column, NumericTableItem(text, value))
+
+    def reset_query_stats(self):
+        """Очистка статистики запросов."""
+        self.controller.reset_query_stats()
+        self.update_query_stats()
+
     def setup_buttons(self, main_layout):
         """Настройка панели кнопок главного окна."""
         buttons_layout = QHBoxLayout()
@@ -480,6 +613,12 @@ class MainWindow(QMainWindow):
         self.reset_db_btn.clicked.connect(self.reset_database)
         buttons_layout.addWidget(self.reset_db_btn)
 
+        # Режим быстрого сброса данных из шаблонной БД
+        self.template_reset_check = QCheckBox("Быстрый сброс")
+        self.template_reset_check.setToolTip("Сброс данных копированием заранее подготовленной шаблонной БД")
+        self.template_reset_check.toggled.connect(self.toggle_template_reset)
+        buttons_layout.addWidget(self.template_reset_check)
+
         # Кнопка обновления схемы
         self.reset_schema_btn = QPushButton("Обновить схему")
         self.reset_schema_btn.clicked.connect(self.reset_schema)
@@ -508,11 +647,24 @@ class MainWindow(QMainWindow):
         main_layout.addLayout(buttons_layout)
 
     def load_logs(self):
-        """Загрузка содержимого лог-файла в окно логов."""
+        """Загрузка последних строк лог-файла в окно логов после записи отправленных сообщений."""
+        # Запись в файл выполняется фоновым потоком логгера: ожидание - в потоке исполнителя
+        self.worker.submit(self.logger.flush,
+                           on_success=self.show_log_tail,
+                           on_error=lambda message: self.show_log_tail())
+
+    def show_log_tail(self, flushed_marker=None):
+        """
+        Вывод последних строк лог-файла в окно логов.
+
+        Args:
+            flushed_marker: Отметка Logger.flush; записи, ожидающие вывода и уже записанные
+                            в файл, отбрасываются (None - все ожидающие записи будут выведены)
+        """
         try:
-            with open("app.log", "r", encoding="utf-8") as f:
-                log_content = f.read()
-                self.log_display.setText(log_content)
+            if flushed_marker is not None:
+                self.logger.discard_pending_display(flushed_marker)
+            self.log_display.load_tail()
 
             # Прокрутка к последней записи
             QTimer.singleShot(100, lambda: self.log_display.verticalScrollBar().setValue(
@@ -520,10 +672,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.logger.error(f"Ошибка загрузки логов: {str(e)}")
 
+    def open_log_search(self):
+        """Открытие диалога поиска по журналу и его архивам."""
+        dialog = LogSearchDialog(self.logger.log_file, self)
+        dialog.exec()
+
     def append_log(self, message):
         """Добавление сообщения в окно логов с прокруткой вниз."""
         if hasattr(self, 'log_display') and self.log_display is not None:
-            self.log_display.append(message)
+            self.log_display.appendPlainText(message)
             # Прокрутка вниз для отображения новых сообщений
             scrollbar = self.log_display.verticalScrollBar()
             scrollbar.setValue(scrollbar.maximum())
@@ -551,11 +708,11 @@ class MainWindow(QMainWindow):
         QLabel {
             color: #333333;
         }
-        QTableWidget {
+        QTableView {
             border: 1px solid #d0d0d0;
             gridline-color: #e0e0e0;
         }
-        QTableWidget::item:selected {
+        QTableView::item:selected {
             background-color: #d0e8ff;
         }
         QHeaderView::section {
@@ -621,7 +778,7 @@ class MainWindow(QMainWindow):
             padding: 4px;
             min-width: 120px;
         }
-        QTextEdit {
+        QPlainTextEdit {
             border: 1px solid #c0c0c0;
             padding: 2px;
         }
@@ -664,19 +821,37 @@ class MainWindow(QMainWindow):
         """
         self.setStyleSheet(app_style)
 
+    def set_busy(self, busy):
+        """Отображение индикатора занятости и блокировка действий на время операций с БД."""
+        self.busy_bar.setVisible(busy)
+        self.cancel_btn.setVisible(busy)
+        self.statusBar().showMessage("Выполняется операция с базой данных..." if busy else "")
+        for button in (self.reset_db_btn, self.template_reset_check, self.reset_schema_btn, self.new_show_btn,
+                       self.history_btn, self.actors_btn, self.skip_year_btn):
+            button.setEnabled(not busy)
+
     def update_game_info(self):
         """Обновление информации о текущем годе и капитале в интерфейсе."""
-        try:
-            game_data = self.controller.get_game_state()
-            if game_data:
-                self.year_label.setText(f"Текущий год: {game_data['current_year']}")
-                # Форматирование числа с разделителями тысяч
-                self.capital_label.setText(f"Капитал: {game_data['capital']:,} ₽".replace(',', ' '))
-        except Exception as e:
-            self.logger.error(f"Ошибка при обновлении информации: {str(e)}")
+        self.worker.submit(self.controller.get_game_state, action="Обновление информации",
+                           on_success=self.show_game_info,
+                           on_error=lambda message: self.show_game_info(None))
+
+    def show_game_info(self, game_data):
+        """Отображение текущего года и капитала."""
+        if game_data:
+            self.year_label.setText(f"Текущий год: {game_data['current_year']}")
+            # Форматирование числа с разделителями тысяч
+            self.capital_label.setText(f"Капитал: {game_data['capital']:,} ₽".replace(',', ' '))
+        else:
+            self.logger.error("Ошибка при обновлении информации: игровые данные недоступны")
             self.year_label.setText("Текущий год: —")
             self.capital_label.setText("Капитал: —")
 
+    def on_remote_change(self, tables):
+        """Обновление информации при изменении данных другим клиентом."""
+        if 'game_data' in tables:
+            self.update_game_info()
+
     def reset_database(self):
         """Сброс данных базы данных к начальному состоянию."""
         # Запрос подтверждения
@@ -688,14 +863,39 @@ class MainWindow(QMainWindow):
         )
 
         if confirm == QMessageBox.Yes:
-            # Сброс базы данных
-            result = self.controller.reset_database()
-            if result:
-                QMessageBox.information(self, "Успех", "Данные успешно обновлены.")
-                self.update_game_info()
-            else:
-                QMessageBox.critical(self, "Ошибка",
-                                     "Не удалось обновить данные. Проверьте логи для получения подробной информации.")
+            # Сброс базы данных в фоновом потоке
+            self.worker.submit(self.controller.reset_database, action="Сброс данных",
+                               on_success=self.on_database_reset,
+                               on_error=lambda message: self.on_database_reset(False))
+
+    def on_database_reset(self, result):
+        """Обработка результата сброса данных."""
+        if self.controller.template_reset:
+            # При сбросе из шаблона соединение слушателя изменений было закрыто вместе с БД
+            self.controller.restart_change_listener()
+        if result:
+            QMessageBox.information(self, "Успех", "Данные успешно обновлены.")
+            self.update_game_info()
+        else:
+            QMessageBox.critical(self, "Ошибка",
+                                 "Не удалось обновить данные. Проверьте логи для получения подробной информации.")
+
+    def toggle_template_reset(self, enabled):
+        """Включение или отключение быстрого сброса данных из шаблонной БД."""
+        if not enabled:
+            self.controller.disable_template_reset()
+            return
+        # Создание шаблона может занять время, поэтому выполняется в фоновом потоке
+        self.worker.submit(self.controller.enable_template_reset, action="Подготовка шаблонной БД",
+                           on_success=self.on_template_reset_enabled,
+                           on_error=lambda message: self.on_template_reset_enabled(False))
+
+    def on_template_reset_enabled(self, result):
+        """Обработка результата включения быстрого сброса."""
+        if not result:
+            self.template_reset_check.setChecked(False)
+            QMessageBox.warning(self, "Ошибка",
+                                "Не удалось подготовить шаблонную БД. Проверьте логи для получения подробной информации.")
 
     def reset_schema(self):
         """Сброс схемы базы данных (удаление и пересоздание всех таблиц)."""
@@ -708,14 +908,19 @@ class MainWindow(QMainWindow):
         )
 
         if confirm == QMessageBox.Yes:
-            # Сброс схемы
-            result = self.controller.reset_schema()
-            if result:
-                QMessageBox.information(self, "Успех", "Схема базы данных успешно обновлена.")
-                self.update_game_info()
-            else:
-                QMessageBox.critical(self, "Ошибка",
-                                     "Не удалось обновить схему базы данных. Проверьте логи для получения подробной информации.")
+            # Сброс схемы в фоновом потоке
+            self.worker.submit(self.controller.reset_schema, action="Сброс схемы",
+                               on_success=self.on_schema_reset,
+                               on_error=lambda message: self.on_schema_reset(False))
+
+    def on_schema_reset(self, result):
+        """Обработка результата сброса схемы."""
+        if result:
+            QMessageBox.information(self, "Успех", "Схема базы данных успешно обновлена.")
+            self.update_game_info()
+        else:
+            QMessageBox.critical(self, "Ошибка",
+                                 "Не удалось обновить схему базы данных. Проверьте логи для получения подробной информации.")
 
     def open_new_show_dialog(self):
         """Открытие диалога создания новой постановки."""
@@ -730,7 +935,8 @@ class MainWindow(QMainWindow):
 
     def show_performance_details(self, performance_id):
         """Просмотр детальной информации о постановке."""
-        details = self.controller.get_performance_details(performance_id)
+        with self.controller.query_action("Просмотр спектакля"):
+            details = self.controller.get_performance_details(performance_id)
 
         if not details:
             QMessageBox.warning(self, "Ошибка", "Не удалось получить информацию о спектакле.")
@@ -759,16 +965,19 @@ class MainWindow(QMainWindow):
         )
 
         if result == QMessageBox.Yes:
-            # Пропуск года
-            skip_result = self.controller.skip_year()
-            # Отображение результата
-            QMessageBox.information(
-                self,
-                "Год пропущен",
-                f"Вы пропустили год. Сейчас {skip_result['year']} год.\n\n"
-                f"Театр получил {skip_result['rights_sale']:,} ₽ за продажу прав на постановку.".replace(',', ' ')
-            )
-            self.update_game_info()
+            # Пропуск года в фоновом потоке
+            self.worker.submit(self.controller.skip_year, action="Пропуск года",
+                               on_success=self.on_year_skipped)
+
+    def on_year_skipped(self, skip_result):
+        """Отображение результата пропуска года."""
+        QMessageBox.information(
+            self,
+            "Год пропущен",
+            f"Вы пропустили год. Сейчас {skip_result['year']} год.\n\n"
+            f"Театр получил {skip_result['rights_sale']:,} ₽ за продажу прав на постановку.".replace(',', ' ')
+        )
+        self.update_game_info()
 
     def disconnect_from_db(self):
         """Отключение от базы данных и выход из программы."""
@@ -782,17 +991,77 @@ class MainWindow(QMainWindow):
 
         if confirm == QMessageBox.Yes:
             self.logger.info("Отключение от базы данных и выход из программы")
-            self.controller.close()
             self.close()
 
     def closeEvent(self, event):
         """Обработка события закрытия окна."""
+        # Остановка фоновых операций перед закрытием соединения
+        self.worker.cancel_all()
+        if not self.worker.wait_for_done(WORKER_SHUTDOWN_TIMEOUT_MS):
+            self.logger.warning("Фоновые операции с БД не завершились до закрытия соединения")
         self.controller.close()
         event.accept()
 
 
 # Вспомогательные классы для таблиц
 
+class LogView(QPlainTextEdit):
+    """
+    Окно логов: показывает последние строки лог-файла и подгружает
+    более старые порциями при прокрутке к началу.
+    Число строк в окне ограничено LOG_VIEW_MAX_LINES.
+    """
+
+    def __init__(self, log_file, parent=None):
+        super().__init__(parent)
+        self.log_file = log_file
+        self.reader = None
+        self.setReadOnly(True)
+        # Без переноса строк одна строка лога соответствует одному шагу прокрутки
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setMaximumBlockCount(LOG_VIEW_MAX_LINES)
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+
+    def load_tail(self):
+        """Загрузка последних строк лог-файла."""
+        self.reader = LogTailReader(self.log_file)
+        self.clear()
+        try:
+            lines = self.reader.read_previous(LOG_VIEW_TAIL_LINES)
+        except FileNotFoundError:
+            return
+        self.setPlainText("\n".join(lines))
+
+    def on_scrolled(self, value):
+        """Подгрузка более старых строк при прокрутке к началу."""
+        if value == self.verticalScrollBar().minimum():
+            self.load_previous()
+
+    def load_previous(self):
+        """
+        Добавление порции более старых строк в начало окна.
+        При достижении LOG_VIEW_MAX_LINES подгрузка прекращается: иначе
+        ограничение числа строк удаляло бы только что добавленные строки.
+        """
+        available = LOG_VIEW_MAX_LINES - self.blockCount()
+        if self.reader is None or self.reader.at_start or available <= 0:
+            return
+        try:
+            lines = self.reader.read_previous(min(LOG_VIEW_CHUNK_LINES, available))
+        except OSError:
+            return
+        if not lines:
+            return
+
+        # Сохранение положения прокрутки относительно уже показанных строк
+        scrollbar = self.verticalScrollBar()
+        position = scrollbar.value()
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.Start)
+        cursor.insertText("\n".join(lines) + "\n")
+        scrollbar.setValue(position + len(lines))
+
+
 class NumericTableItem(QTableWidgetItem):
     """
     Элемент таблицы для числовых значений с правильной сортировкой.
@@ -842,6 +1111,199 @@ class CurrencyTableItem(QTableWidgetItem):
         return super().__lt__(other)
 
 
+class PagedTableModel(QAbstractTableModel):
+    """
+    Базовая модель таблицы с ленивой подгрузкой страниц из БД.
+    Строки хранятся компактно в виде кортежей, сортировка выполняется в SQL.
+    Первый столбец - уникальный ключ, по которому продолжается keyset-пагинация.
+    Страницы загружаются в фоновом потоке, поток интерфейса не ждет БД.
+    """
+
+    # Столбцы таблицы: (ключ в данных строки, заголовок)
+    COLUMNS = []
+
+    # Завершена загрузка страницы (успешно или с ошибкой)
+    page_loaded = Signal()
+
+    def __init__(self, load_page, worker, parent=None):
+        """
+        Args:
+            load_page: Функция загрузки страницы
+                       (after_key, after_value, order_by, descending) -> список словарей
+            worker: Исполнитель фоновых операций с БД
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.load_page = load_page
+        self.worker = worker
+        self._rows = []
+        self._has_more = True
+        self._sort_column = 0
+        self._descending = False
+        # Выполняющаяся загрузка страницы
+        self._task = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        value = self._rows[index.row()][index.column()]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and self._task is None
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Запуск фоновой подгрузки следующей страницы, продолжающей текущую сортировку."""
+        if parent.isValid() or not self._has_more or self._task is not None:
+            return
+
+        last = self._rows[-1] if self._rows else None
+        self._task = self.worker.submit(
+            self.load_page,
+            last[0] if last else None,
+            last[self._sort_column] if last else None,
+            self.COLUMNS[self._sort_column][0],
+            self._descending,
+            on_success=self._on_page_loaded,
+            on_error=self._on_page_failed
+        )
+
+    def is_loading(self):
+        """Выполняется ли загрузка страницы."""
+        return self._task is not None
+
+    def cancel_loading(self):
+        """Отмена выполняющейся загрузки: ее результат не будет добавлен в модель."""
+        self.worker.cancel(self._task)
+        self._task = None
+
+    def _on_page_loaded(self, page):
+        """Добавление загруженной страницы в модель."""
+        self._task = None
+        if len(page) < PAGE_SIZE:
+            self._has_more = False
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+            self._rows.extend(tuple(item[key] for key, _ in self.COLUMNS) for item in page)
+            self.endInsertRows()
+        self.page_loaded.emit()
+
+    def _on_page_failed(self, message):
+        """Остановка подгрузки после ошибки (ошибка записана в лог исполнителем)."""
+        self._task = None
+        self._has_more = False
+        self.page_loaded.emit()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Сортировка средствами БД: данные перезагружаются в новом порядке."""
+        self._sort_column = column
+        self._descending = order == Qt.DescendingOrder
+        self.reload()
+
+    def reload(self):
+        """Сброс загруженных строк; страницы подгружаются заново по мере прокрутки."""
+        # Страница, запрошенная для прежних данных или сортировки, не нужна
+        self.cancel_loading()
+        self.beginResetModel()
+        self._rows = []
+        self._has_more = True
+        self.endResetModel()
+        self.fetchMore()
+
+    def row_at(self, row):
+        """Данные строки в виде словаря."""
+        return dict(zip((key for key, _ in self.COLUMNS), self._rows[row]))
+
+
+class ActorsTableModel(PagedTableModel):
+    """
+    Модель таблицы актеров с постраничной загрузкой из БД.
+    """
+
+    COLUMNS = [
+        ("actor_id", "ID"),
+        ("last_name", "Фамилия"),
+        ("first_name", "Имя"),
+        ("patronymic", "Отчество"),
+        ("rank", "Звание"),
+        ("experience", "Опыт"),
+        ("awards_count", "Награды"),
+    ]
+
+    def __init__(self, controller, worker, parent=None):
+        def load_page(after_key, after_value, order_by, descending):
+            return controller.get_actors_page(
+                after_id=after_key, limit=PAGE_SIZE, order_by=order_by,
+                descending=descending, after_value=after_value)
+        super().__init__(load_page, worker, parent)
+
+    def actor_at(self, row):
+        """Данные актера в указанной строке в виде словаря."""
+        return self.row_at(row)
+
+
+class PerformanceHistoryModel(PagedTableModel):
+    """
+    Модель истории постановок с постраничной загрузкой по году.
+    Прибыль рассчитывается в запросе к БД.
+    """
+
+    COLUMNS = [
+        ("year", "Год"),
+        ("title", "Название"),
+        ("plot_title", "Сюжет"),
+        ("budget", "Бюджет"),
+        ("revenue", "Сборы"),
+        ("profit", "Прибыль/Убыток"),
+        ("performance_id", "ID"),
+    ]
+    # Денежные столбцы
+    CURRENCY_COLUMNS = (3, 4, 5)
+    PROFIT_COLUMN = 5
+
+    def __init__(self, controller, worker, parent=None):
+        def load_page(after_key, after_value, order_by, descending):
+            return controller.get_performances_page(
+                after_year=after_key, limit=PAGE_SIZE, order_by=order_by,
+                descending=descending, after_value=after_value)
+        super().__init__(load_page, worker, parent)
+
+    def columnCount(self, parent=QModelIndex()):
+        # Последний столбец (ID спектакля) не отображается
+        return 0 if parent.isValid() else len(self.COLUMNS) - 1
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        value = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            if index.column() in self.CURRENCY_COLUMNS and value is not None:
+                return f"{value:,} ₽".replace(',', ' ')
+            return "" if value is None else str(value)
+
+        # Окрашивание прибыли/убытка в зависимости от результата
+        if role == Qt.ForegroundRole and index.column() == self.PROFIT_COLUMN and value:
+            return QColor(Qt.green) if value > 0 else QColor(Qt.red)
+
+        return None
+
+    def performance_id_at(self, row):
+        """ID спектакля в указанной строке."""
+        return self.row_at(row)['performance_id']
+
+
 class ValidatedLineEdit(QLineEdit):
     """
     Поле ввода с валидацией текста.
@@ -882,18 +1344,58 @@ class NewPerformanceDialog(QDialog):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
-        self.game_data = controller.get_game_state()
-        self.all_plots = controller.get_all_plots()
-        self.all_actors = controller.get_all_actors()
+        self.worker = parent.worker
+        self.game_data = None
+        self.all_plots = []
+        self.all_actors = []
+        # Фоновые операции диалога: при закрытии отменяются только они
+        self.forecast_task = None
+        self.produce_task = None
 
         self.setWindowTitle("Новая постановка")
         self.setMinimumSize(800, 600)
 
+        # Данные загружаются в фоновом потоке, форма строится после их получения
+        self.loading_label = QLabel("Загрузка данных...")
+        self.loading_label.setAlignment(Qt.AlignCenter)
+        QVBoxLayout(self).addWidget(self.loading_label)
+        self.load_task = None
+        # При асинхронном доступе запросы выполняются одновременно, при его ошибке - в фоновом потоке
+        self.load_future = controller.submit_new_performance_data(self.on_data_loaded,
+                                                                  lambda message: self.load_with_worker())
+        if self.load_future is None:
+            self.load_with_worker()
+
+    def load_with_worker(self):
+        """Загрузка данных для постановки в фоновом потоке исполнителя."""
+        self.load_future = None
+        self.load_task = self.worker.submit(self.controller.get_new_performance_data,
+                                            action="Открытие новой постановки",
+                                            on_success=self.on_data_loaded,
+                                            on_error=self.on_data_load_failed)
+
+    def on_data_loaded(self, data):
+        """Построение формы по загруженным игровым данным, сюжетам и актерам."""
+        self.load_task = None
+        self.load_future = None
+        self.game_data, self.all_plots, self.all_actors = data
+        if not self.game_data:
+            self.on_data_load_failed("Игровые данные не найдены")
+            return
+
+        self.layout().removeWidget(self.loading_label)
+        self.loading_label.deleteLater()
         self.setup_ui()
 
+    def on_data_load_failed(self, message):
+        """Закрытие диалога, если данные для постановки не загружены."""
+        self.load_task = None
+        QMessageBox.warning(self, "Ошибка", f"Не удалось загрузить данные для постановки: {message}")
+        self.reject()
+
     def setup_ui(self):
         """Настройка пользовательского интерфейса диалога."""
-        main_layout = QVBoxLayout(self)
+        main_layout = self.layout()
 
         # Форма основных параметров спектакля
         form_layout = QFormLayout()
@@ -952,6 +1454,13 @@ class NewPerformanceDialog(QDialog):
 
         main_layout.addWidget(scroll_area)
 
+        # Прогноз результатов спектакля до его создания
+        self.forecast_label = QLabel()
+        self.forecast_label.setWordWrap(True)
+        self.forecast_label.setStyleSheet("background-color: #f0f0f0; padding: 8px; border-radius: 5px;")
+        self.forecast_label.setVisible(False)
+        main_layout.addWidget(self.forecast_label)
+
         # Кнопки действий
         buttons_layout = QHBoxLayout()
 
@@ -959,6 +1468,10 @@ class NewPerformanceDialog(QDialog):
         self.cancel_btn.clicked.connect(self.reject)
         buttons_layout.addWidget(self.cancel_btn)
 
+        self.forecast_btn = QPushButton("Прогноз")
+        self.forecast_btn.clicked.connect(self.forecast_performance)
+        buttons_layout.addWidget(self.forecast_btn)
+
         self.create_btn = QPushButton("Создать постановку")
         self.create_btn.clicked.connect(self.create_performance)
         buttons_layout.addWidget(self.create_btn)
@@ -1220,23 +1733,95 @@ class NewPerformanceDialog(QDialog):
             QMessageBox.warning(self, "Ошибка", "Введите название спектакля")
             return
 
+        performance_input = self.collect_performance_input()
+        if performance_input is None:
+            return
+        plot_id, budget, roles_data = performance_input
+
+        # Создание спектакля и расчет результатов одной транзакцией в фоновом потоке
+        self.create_btn.setEnabled(False)
+        self.produce_task = self.worker.submit(
+            self.controller.produce_performance,
+            self.title_edit.text().strip(),
+            plot_id,
+            self.game_data['current_year'],
+            budget,
+            [(actor_id, role_name, contract_cost) for role_name, actor_id, contract_cost in roles_data],
+            action="Создание спектакля",
+            query_budget=PRODUCE_PERFORMANCE_QUERY_BUDGET,
+            on_success=self.show_performance_result,
+            on_error=lambda message: self.show_performance_result((False, message))
+        )
+
+    def forecast_performance(self):
+        """Прогноз результатов спектакля с выбранными параметрами (в фоновом потоке)."""
+        performance_input = self.collect_performance_input()
+        if performance_input is None:
+            return
+        plot_id, budget, roles_data = performance_input
+
+        self.forecast_btn.setEnabled(False)
+        self.forecast_label.setText("Расчет прогноза...")
+        self.forecast_label.setVisible(True)
+        self.forecast_task = self.worker.submit(
+            self.controller.forecast_performance,
+            plot_id,
+            budget,
+            [(actor_id, role_name, contract_cost) for role_name, actor_id, contract_cost in roles_data],
+            action="Прогноз спектакля",
+            on_success=self.show_forecast,
+            on_error=lambda message: self.show_forecast((False, message))
+        )
+
+    def show_forecast(self, outcome):
+        """Отображение прогноза результатов спектакля."""
+        self.forecast_task = None
+        self.forecast_btn.setEnabled(True)
+        success, result = outcome
+        if not success:
+            self.forecast_label.setVisible(False)
+            QMessageBox.warning(self, "Ошибка", f"Не удалось рассчитать прогноз: {result}")
+            return
+
+        def money(value):
+            return f"{value:,.0f} ₽".replace(',', ' ')
+
+        quantiles = ", ".join(f"{int(q * 100)}% - {money(result['profit_quantiles'][q])}"
+                              for q in FORECAST_SHOWN_QUANTILES)
+        self.forecast_label.setText(
+            f"<b>Прогноз</b> ({result['samples']:,} испытаний, {result['elapsed_ms']:.0f} мс):<br>".replace(',', ' ') +
+            f"Ожидаемая выручка: {money(result['expected_revenue'])}; "
+            f"ожидаемая прибыль: {money(result['expected_profit'])}<br>"
+            f"Прибыль по квантилям: {quantiles}<br>"
+            f"Вероятность убытка: {result['loss_probability']:.1%}; "
+            f"вероятность повышения звания: {result['upgrade_probability']:.1%}"
+        )
+
+    def collect_performance_input(self):
+        """
+        Проверка и сбор параметров спектакля из полей диалога.
+        При ошибке показывает предупреждение.
+
+        Returns:
+            tuple or None: (ID сюжета, бюджет, список (роль, ID актера, стоимость контракта))
+        """
         # Получение данных выбранного сюжета
         plot_id = self.plot_combo.currentData()
         plot = next((p for p in self.all_plots if p['plot_id'] == plot_id), None)
 
         if not plot:
             QMessageBox.warning(self, "Ошибка", "Выберите сюжет")
-            return
+            return None
 
         # Проверка бюджета
         budget = self.budget_spin.value()
         if budget > self.game_data['capital']:
             QMessageBox.warning(self, "Ошибка", "Недостаточно средств в капитале")
-            return
+            return None
 
         if budget < plot['minimum_budget']:
             QMessageBox.warning(self, "Ошибка", f"Бюджет должен быть не менее {plot['minimum_budget']:,} ₽")
-            return
+            return None
 
         # Сбор данных о ролях и актерах
         roles_data = []
@@ -1261,16 +1846,16 @@ class NewPerformanceDialog(QDialog):
                 # Проверки заполнения полей
                 if not role_name:
                     QMessageBox.warning(self, "Ошибка", f"Введите название для роли {i + 1}")
-                    return
+                    return None
 
                 if not actor_id:
                     QMessageBox.warning(self, "Ошибка", f"Выберите актера для роли {i + 1}")
-                    return
+                    return None
 
                 # Проверка дублирования актеров
                 if actor_id in assigned_actors:
                     QMessageBox.warning(self, "Ошибка", "Один актер не может играть несколько ролей")
-                    return
+                    return None
 
                 assigned_actors.add(actor_id)
                 roles_data.append((role_name, actor_id, contract_cost))
@@ -1278,7 +1863,7 @@ class NewPerformanceDialog(QDialog):
         # Проверка количества ролей
         if len(roles_data) != plot['roles_count']:
             QMessageBox.warning(self, "Ошибка", f"Необходимо заполнить все {plot['roles_count']} ролей")
-            return
+            return None
 
         # Проверка превышения бюджета
         remaining_budget_text = self.remaining_budget_label.text().replace('₽', '').replace(' ', '').replace(',', '')
@@ -1286,32 +1871,19 @@ class NewPerformanceDialog(QDialog):
             remaining_budget = int(float(remaining_budget_text))
         except ValueError:
             QMessageBox.warning(self, "Ошибка", "Некорректное значение оставшегося бюджета")
-            return
+            return None
 
         if remaining_budget < 0:
             QMessageBox.warning(self, "Ошибка", "Превышен бюджет спектакля")
-            return
-
-        # Создание спектакля
-        success, result = self.controller.create_new_performance(
-            self.title_edit.text().strip(),
-            plot_id,
-            self.game_data['current_year'],
-            budget
-        )
-
-        if not success:
-            QMessageBox.warning(self, "Ошибка", f"Не удалось создать спектакль: {result}")
-            return
-
-        performance_id = result
+            return None
 
-        # Назначение актеров на роли
-        for role_name, actor_id, contract_cost in roles_data:
-            self.controller.assign_actor_to_performance(actor_id, performance_id, role_name, contract_cost)
+        return plot_id, budget, roles_data
 
-        # Расчет результатов спектакля
-        success, result = self.controller.calculate_performance_result(performance_id)
+    def show_performance_result(self, outcome):
+        """Отображение результатов спектакля."""
+        self.produce_task = None
+        self.create_btn.setEnabled(True)
+        success, result = outcome
 
         if success:
             # Форматирование результатов
@@ -1347,7 +1919,18 @@ class NewPerformanceDialog(QDialog):
             QMessageBox.information(self, "Результаты спектакля", result_text)
             self.accept()
         else:
-            QMessageBox.warning(self, "Ошибка", "Не удалось рассчитать результаты спектакля")
+            QMessageBox.warning(self, "Ошибка", result)
+
+    def reject(self):
+        """
+        Закрытие диалога с отменой его незавершенных операций.
+        Прерванное создание спектакля откатывается целиком; операции других окон продолжаются.
+        """
+        if self.load_future is not None:
+            self.load_future.cancel()
+        for task in (self.load_task, self.forecast_task, self.produce_task):
+            self.worker.cancel(task)
+        super().reject()
 
 
 class PerformanceDetailsDialog(QDialog):
@@ -1430,6 +2013,12 @@ class PerformanceHistoryDialog(QDialog):
 
         self.setup_ui()
 
+        # Обновление таблицы при изменениях от других клиентов (до закрытия диалога)
+        self.change_listener = controller.change_listener
+        if self.change_listener:
+            self.change_listener.tables_changed.connect(self.on_remote_change)
+            self.finished.connect(self.stop_remote_updates)
+
     def setup_ui(self):
         """Настройка пользовательского интерфейса диалога."""
         layout = QVBoxLayout(self)
@@ -1439,77 +2028,198 @@ class PerformanceHistoryDialog(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
 
-        # Получение списка постановок
-        self.performances = self.controller.get_performances_history()
+        # Таблица постановок: строки подгружаются из БД постранично при прокрутке
+        self.history_model = PerformanceHistoryModel(self.controller, self.parent_window.worker, self)
+        self.history_model.page_loaded.connect(self.update_empty_state)
+        self.finished.connect(self.history_model.cancel_loading)
+        self.history_table = QTableView()
+        self.history_table.setModel(self.history_model)
+        self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.history_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.history_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+
+        # Сортировка выполняется в БД; по умолчанию - от новых постановок к старым
+        self.history_table.horizontalHeader().setSortIndicator(0, Qt.DescendingOrder)
+        self.history_table.setSortingEnabled(True)
+        self.history_table.doubleClicked.connect(self.show_performance_details)
+        layout.addWidget(self.history_table)
+
+        # Если постановок нет, отображаем сообщение
+        self.empty_label = QLabel("Постановок нет.")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.empty_label)
+        self.update_empty_state()
+
+        # Кнопки выгрузки и закрытия
+        buttons_layout = QHBoxLayout()
 
-        if not self.performances:
-            # Если постановок нет, отображаем сообщение
-            empty_label = QLabel("Постановок нет.")
-            empty_label.setAlignment(Qt.AlignCenter)
-            layout.addWidget(empty_label)
-        else:
-            # Создание таблицы постановок
-            self.history_table = QTableWidget()
-            self.history_table.setColumnCount(6)
-            self.history_table.setHorizontalHeaderLabels(
-                ["Год", "Название", "Сюжет", "Бюджет", "Сборы", "Прибыль/Убыток"])
-            self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-            self.history_table.setRowCount(len(self.performances))
-
-            # Словарь для связи строк таблицы с ID постановок
-            self.row_to_performance_id = {}
-
-            # Заполнение таблицы данными
-            for i, perf in enumerate(self.performances):
-                year_item = NumericTableItem(str(perf['year']), perf['year'])
-                year_item.setData(Qt.UserRole, perf['performance_id'])
-
-                title_item = QTableWidgetItem(perf['title'])
-                plot_item = QTableWidgetItem(perf['plot_title'])
-                budget_item = CurrencyTableItem(f"{perf['budget']:,} ₽".replace(',', ' '), perf['budget'])
-                revenue_item = CurrencyTableItem(f"{perf['revenue']:,} ₽".replace(',', ' '), perf['revenue'])
-
-                # Расчет прибыли/убытка
-                profit = perf['revenue'] - perf['budget']
-                profit_item = CurrencyTableItem(f"{profit:,} ₽".replace(',', ' '), profit)
-
-                # Окрашивание прибыли/убытка в зависимости от результата
-                if profit > 0:
-                    profit_item.setForeground(Qt.green)
-                elif profit < 0:
-                    profit_item.setForeground(Qt.red)
-
-                # Добавление элементов в таблицу
-                self.history_table.setItem(i, 0, year_item)
-                self.history_table.setItem(i, 1, title_item)
-                self.history_table.setItem(i, 2, plot_item)
-                self.history_table.setItem(i, 3, budget_item)
-                self.history_table.setItem(i, 4, revenue_item)
-                self.history_table.setItem(i, 5, profit_item)
-
-                # Сохранение связи строки с ID постановки
-                self.row_to_performance_id[i] = perf['performance_id']
-
-            # Настройка параметров таблицы
-            self.history_table.setSortingEnabled(True)
-            self.history_table.setEditTriggers(QTableWidget.NoEditTriggers)
-            self.history_table.cellDoubleClicked.connect(self.show_performance_details)
-
-            layout.addWidget(self.history_table)
+        export_btn = QPushButton("Экспорт")
+        export_btn.clicked.connect(self.export_history)
+        buttons_layout.addWidget(export_btn)
 
-        # Кнопка закрытия
         close_btn = QPushButton("Закрыть")
         close_btn.clicked.connect(self.accept)
-        layout.addWidget(close_btn)
+        buttons_layout.addWidget(close_btn)
 
-    def show_performance_details(self, row, col):
+        layout.addLayout(buttons_layout)
+
+    def update_empty_state(self):
+        """Показ таблицы или сообщения об отсутствии постановок."""
+        has_rows = self.history_model.rowCount() > 0 or self.history_model.is_loading()
+        self.history_table.setVisible(has_rows)
+        self.empty_label.setVisible(not has_rows)
+
+    def on_remote_change(self, tables):
+        """Обновление таблицы, если постановки изменил другой клиент."""
+        if 'performances' in tables and self.isVisible():
+            self.history_model.reload()
+            self.update_empty_state()
+
+    def stop_remote_updates(self):
+        """Отключение от слушателя изменений после закрытия диалога."""
+        if self.change_listener:
+            self.change_listener.tables_changed.disconnect(self.on_remote_change)
+            self.change_listener = None
+
+    def export_history(self):
+        """Выгрузка истории постановок с составами в файл."""
+        # Формат Parquet предлагается, только если установлен pyarrow
+        file_filter = "CSV файлы (*.csv)"
+        if self.controller.is_parquet_export_available():
+            file_filter += ";;Parquet файлы (*.parquet)"
+        path, selected_filter = QFileDialog.getSaveFileName(self, "Экспорт постановок", "performances.csv",
+                                                            file_filter)
+        if not path:
+            return
+        # Формат определяется расширением: добавляем его, если пользователь не указал
+        if not os.path.splitext(path)[1]:
+            path += ".parquet" if "parquet" in selected_filter else ".csv"
+
+        # Выгрузка выполняется в фоновом потоке
+        self.parent_window.worker.submit(self.controller.export_performance_history, path,
+                                         action="Экспорт истории",
+                                         on_success=self.on_history_exported,
+                                         on_error=lambda message: self.on_history_exported((False, message)))
+
+    def on_history_exported(self, outcome):
+        """Обработка результата выгрузки истории постановок."""
+        success, message = outcome
+        if success:
+            QMessageBox.information(self, "Экспорт", message)
+        else:
+            QMessageBox.warning(self, "Ошибка", message)
+
+    def show_performance_details(self, index):
         """Открытие диалога с подробностями о выбранной постановке."""
-        # Получение ID постановки из данных ячейки
-        perf_id = self.history_table.item(row, 0).data(Qt.UserRole)
+        # Получение ID постановки из модели таблицы
+        perf_id = self.history_model.performance_id_at(index.row())
         # Отображение деталей постановки
         self.parent_window.show_performance_details(perf_id)
 
 
+class LogSearchDialog(QDialog):
+    """
+    Диалог поиска записей в журнале и его архивах по времени, уровню и тексту.
+    """
+    # Формат времени в полях интервала (соответствует TIMESTAMP_FORMAT)
+    DATETIME_FORMAT = "yyyy-MM-dd HH:mm:ss"
+
+    def __init__(self, log_file, parent=None):
+        super().__init__(parent)
+        self.log_file = log_file
+        self.worker = parent.worker
+
+        self.setWindowTitle("Поиск в логах")
+        self.setMinimumSize(800, 500)
+
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Настройка пользовательского интерфейса диалога."""
+        layout = QVBoxLayout(self)
+
+        filters_layout = QHBoxLayout()
+        filters_layout.addWidget(QLabel("С:"))
+        self.since_edit = QDateTimeEdit(QDateTime.currentDateTime().addDays(-7))
+        self.since_edit.setDisplayFormat(self.DATETIME_FORMAT)
+        self.since_edit.setCalendarPopup(True)
+        filters_layout.addWidget(self.since_edit)
+
+        filters_layout.addWidget(QLabel("по:"))
+        self.until_edit = QDateTimeEdit(QDateTime.currentDateTime().addSecs(60))
+        self.until_edit.setDisplayFormat(self.DATETIME_FORMAT)
+        self.until_edit.setCalendarPopup(True)
+        filters_layout.addWidget(self.until_edit)
+
+        self.level_combo = QComboBox()
+        self.level_combo.addItem("Все уровни", None)
+        for level in LOG_LEVELS:
+            self.level_combo.addItem(level, level)
+        filters_layout.addWidget(self.level_combo)
+
+        self.text_edit = QLineEdit()
+        self.text_edit.setPlaceholderText("Текст сообщения")
+        self.text_edit.returnPressed.connect(self.search)
+        filters_layout.addWidget(self.text_edit)
+
+        self.search_btn = QPushButton("Найти")
+        self.search_btn.clicked.connect(self.search)
+        filters_layout.addWidget(self.search_btn)
+        layout.addLayout(filters_layout)
+
+        self.results_display = QPlainTextEdit()
+        self.results_display.setReadOnly(True)
+        self.results_display.setLineWrapMode(QPlainTextEdit.NoWrap)
+        layout.addWidget(self.results_display)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        close_btn = QPushButton("Закрыть")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn, alignment=Qt.AlignRight)
+
+    def search(self):
+        """Запуск поиска в фоновом потоке."""
+        level = self.level_combo.currentData()
+        self.search_btn.setEnabled(False)
+        self.status_label.setText("Поиск...")
+        self.worker.submit(self.search_written_logs, self.log_file,
+                           self.since_edit.dateTime().toString(self.DATETIME_FORMAT),
+                           self.until_edit.dateTime().toString(self.DATETIME_FORMAT),
+                           [level] if level else None,
+                           self.text_edit.text().strip() or None,
+                           on_success=self.show_results,
+                           on_error=self.show_error)
+
+    @staticmethod
+    def search_written_logs(log_file, *args):
+        """
+        Поиск после записи в файл уже отправленных сообщений (в фоновом потоке).
+
+        Returns:
+            tuple: Результат search_logs
+        """
+        Logger().flush()
+        return search_logs(log_file, *args)
+
+    def show_results(self, outcome):
+        """Отображение найденных записей."""
+        results, truncated = outcome
+        self.search_btn.setEnabled(True)
+        self.results_display.setPlainText("\n".join(message for _, _, message in results))
+        status = f"Найдено записей: {len(results)}"
+        if truncated:
+            status += " (показаны первые)"
+        self.status_label.setText(status)
+
+    def show_error(self, message):
+        """Отображение ошибки поиска."""
+        self.search_btn.setEnabled(True)
+        self.status_label.setText("")
+        QMessageBox.warning(self, "Ошибка", f"Не удалось выполнить поиск: {message}")
+
+
 class EditActorDialog(QDialog):
     """
     Диалог редактирования данных актера.
@@ -1617,13 +2327,19 @@ class ActorsManagementDialog(QDialog):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self.controller = controller
-        self.all_actors = controller.get_all_actors()
+        self.worker = parent.worker
 
         self.setWindowTitle("Актёры")
         self.setMinimumSize(800, 600)
 
         self.setup_ui()
 
+        # Обновление таблицы при изменениях от других клиентов (до закрытия диалога)
+        self.change_listener = controller.change_listener
+        if self.change_listener:
+            self.change_listener.tables_changed.connect(self.on_remote_change)
+            self.finished.connect(self.stop_remote_updates)
+
     def setup_ui(self):
         """Настройка пользовательского интерфейса диалога."""
         layout = QVBoxLayout(self)
@@ -1633,20 +2349,20 @@ class ActorsManagementDialog(QDialog):
         title_label.setAlignment(Qt.AlignCenter)
         layout.addWidget(title_label)
 
-        # Таблица актеров
-        self.actors_table = QTableWidget()
-        self.actors_table.setColumnCount(7)
-        self.actors_table.setHorizontalHeaderLabels(
-            ["ID", "Фамилия", "Имя", "Отчество", "Звание", "Опыт", "Награды"])
+        # Таблица актеров: строки подгружаются из БД постранично при прокрутке
+        self.actors_model = ActorsTableModel(self.controller, self.worker, self)
+        self.finished.connect(self.actors_model.cancel_loading)
+        self.actors_table = QTableView()
+        self.actors_table.setModel(self.actors_model)
         self.actors_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.actors_table.setEditTriggers(QTableWidget.NoEditTriggers)
-
-        # Заполнение таблицы данными
-        self.update_actors_table()
+        self.actors_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.actors_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.actors_table.setSelectionMode(QAbstractItemView.SingleSelection)
 
-        # Включение сортировки и обработки двойного клика
+        # Включение сортировки (выполняется в БД) и обработки двойного клика
+        self.actors_table.horizontalHeader().setSortIndicator(0, Qt.AscendingOrder)
         self.actors_table.setSortingEnabled(True)
-        self.actors_table.cellDoubleClicked.connect(self.edit_actor)
+        self.actors_table.doubleClicked.connect(self.edit_actor)
 
         layout.addWidget(self.actors_table)
 
@@ -1661,6 +2377,10 @@ class ActorsManagementDialog(QDialog):
         delete_actor_btn.clicked.connect(self.delete_actor)
         buttons_layout.addWidget(delete_actor_btn)
 
+        import_btn = QPushButton("Импорт из CSV")
+        import_btn.clicked.connect(self.import_actors)
+        buttons_layout.addWidget(import_btn)
+
         close_btn = QPushButton("Закрыть")
         close_btn.clicked.connect(self.accept)
         buttons_layout.addWidget(close_btn)
@@ -1669,33 +2389,18 @@ class ActorsManagementDialog(QDialog):
 
     def update_actors_table(self):
         """Обновление содержимого таблицы актеров."""
-        # Получение актуального списка актеров
-        self.all_actors = self.controller.get_all_actors()
-        self.actors_table.setRowCount(len(self.all_actors))
-
-        # Временно отключаем сортировку для заполнения таблицы
-        self.actors_table.setSortingEnabled(False)
+        self.actors_model.reload()
 
-        # Заполнение таблицы данными
-        for i, actor in enumerate(self.all_actors):
-            id_item = NumericTableItem(str(actor['actor_id']), actor['actor_id'])
-            last_name_item = QTableWidgetItem(actor['last_name'])
-            first_name_item = QTableWidgetItem(actor['first_name'])
-            patronymic_item = QTableWidgetItem(actor['patronymic'])
-            rank_item = RankTableItem(actor['rank'])
-            exp_item = NumericTableItem(str(actor['experience']), actor['experience'])
-            awards_item = NumericTableItem(str(actor['awards_count']), actor['awards_count'])
-
-            self.actors_table.setItem(i, 0, id_item)
-            self.actors_table.setItem(i, 1, last_name_item)
-            self.actors_table.setItem(i, 2, first_name_item)
-            self.actors_table.setItem(i, 3, patronymic_item)
-            self.actors_table.setItem(i, 4, rank_item)
-            self.actors_table.setItem(i, 5, exp_item)
-            self.actors_table.setItem(i, 6, awards_item)
+    def on_remote_change(self, tables):
+        """Обновление таблицы, если актеров изменил другой клиент."""
+        if 'actors' in tables and self.isVisible():
+            self.update_actors_table()
 
-        # Включаем сортировку обратно
-        self.actors_table.setSortingEnabled(True)
+    def stop_remote_updates(self):
+        """Отключение от слушателя изменений после закрытия диалога."""
+        if self.change_listener:
+            self.change_listener.tables_changed.disconnect(self.on_remote_change)
+            self.change_listener = None
 
     def add_actor(self):
         """Открытие диалога добавления нового актера."""
@@ -1709,24 +2414,51 @@ class ActorsManagementDialog(QDialog):
             awards_count = dialog.awards_spin.value()
             experience = dialog.exp_spin.value()
 
-            # Добавление актера в БД
-            actor_id = self.controller.add_new_actor(last_name, first_name, patronymic, rank, awards_count, experience)
+            # Добавление актера в БД в фоновом потоке
+            self.worker.submit(self.controller.add_new_actor,
+                               last_name, first_name, patronymic, rank, awards_count, experience,
+                               action="Добавление актера",
+                               on_success=self.on_actor_added,
+                               on_error=lambda message: self.on_actor_added(None))
+
+    def on_actor_added(self, actor_id):
+        """Обработка результата добавления актера."""
+        if actor_id:
+            # Обновление таблицы при успешном добавлении
+            self.update_actors_table()
+            QMessageBox.information(self, "Успех", "Актер успешно добавлен.")
+        else:
+            QMessageBox.warning(self, "Ошибка", "Не удалось добавить актера.")
 
-            if actor_id:
-                # Обновление таблицы при успешном добавлении
-                self.update_actors_table()
-                QMessageBox.information(self, "Успех", "Актер успешно добавлен.")
-            else:
-                QMessageBox.warning(self, "Ошибка", "Не удалось добавить актера.")
+    def import_actors(self):
+        """Массовый импорт актеров из CSV-файла."""
+        path, _ = QFileDialog.getOpenFileName(self, "Импорт актеров", "", "CSV файлы (*.csv);;Все файлы (*)")
+        if not path:
+            return
 
-    def edit_actor(self, row, column):
-        """Открытие диалога редактирования актера."""
-        # Получение ID актера из таблицы
-        actor_id = int(self.actors_table.item(row, 0).text())
-        actor = next((a for a in self.all_actors if a['actor_id'] == actor_id), None)
+        # Импорт выполняется в фоновом потоке
+        self.worker.submit(self.controller.import_actors_csv, path, action="Импорт актеров",
+                           on_success=self.on_actors_imported,
+                           on_error=lambda message: self.on_actors_imported((False, message, [])))
 
-        if not actor:
-            return
+    def on_actors_imported(self, outcome):
+        """Обработка результата импорта актеров."""
+        success, message, rejected = outcome
+        if success:
+            self.update_actors_table()
+
+        box = QMessageBox(QMessageBox.Information if success else QMessageBox.Warning,
+                          "Импорт актеров", message, QMessageBox.Ok, self)
+        if rejected:
+            # Отклоненные строки показываются в раскрывающемся блоке подробностей
+            box.setDetailedText("\n".join(f"Строка {line_no}: {reason}" for line_no, reason in rejected))
+        box.exec()
+
+    def edit_actor(self, index):
+        """Открытие диалога редактирования актера."""
+        # Получение данных актера из модели таблицы
+        actor = self.actors_model.actor_at(index.row())
+        actor_id = actor['actor_id']
 
         # Открытие диалога редактирования
         dialog = EditActorDialog(self.controller, actor, self)
@@ -1739,28 +2471,33 @@ class ActorsManagementDialog(QDialog):
             awards_count = dialog.awards_spin.value()
             experience = dialog.exp_spin.value()
 
-            # Обновление актера в БД
-            success, message = self.controller.update_actor(
-                actor_id, last_name, first_name, patronymic, rank, awards_count, experience)
+            # Обновление актера в БД в фоновом потоке
+            self.worker.submit(self.controller.update_actor,
+                               actor_id, last_name, first_name, patronymic, rank, awards_count, experience,
+                               action="Изменение актера",
+                               on_success=self.on_actor_updated,
+                               on_error=lambda message: self.on_actor_updated((False, message)))
 
-            if success:
-                # Обновление таблицы при успешном обновлении
-                self.update_actors_table()
-                QMessageBox.information(self, "Успех", "Актер успешно обновлен.")
-            else:
-                QMessageBox.warning(self, "Ошибка", f"Не удалось обновить актера: {message}")
+    def on_actor_updated(self, outcome):
+        """Обработка результата обновления актера."""
+        success, message = outcome
+        if success:
+            # Обновление таблицы при успешном обновлении
+            self.update_actors_table()
+            QMessageBox.information(self, "Успех", "Актер успешно обновлен.")
+        else:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось обновить актера: {message}")
 
     def delete_actor(self):
         """Удаление выбранного актера."""
         # Проверка наличия выбранных строк
-        selected_rows = self.actors_table.selectedItems()
+        selected_rows = self.actors_table.selectionModel().selectedRows()
         if not selected_rows:
             QMessageBox.warning(self, "Ошибка", "Выберите актера для удаления.")
             return
 
         # Получение ID актера
-        row = selected_rows[0].row()
-        actor_id = int(self.actors_table.item(row, 0).text())
+        actor_id = self.actors_model.actor_at(selected_rows[0].row())['actor_id']
 
         # Запрос подтверждения
         confirm = QMessageBox.question(
@@ -1771,15 +2508,20 @@ class ActorsManagementDialog(QDialog):
         )
 
         if confirm == QMessageBox.Yes:
-            # Удаление актера из БД
-            success, message = self.controller.delete_actor_by_id(actor_id)
-
-            if success:
-                # Обновление таблицы при успешном удалении
-                self.update_actors_table()
-                QMessageBox.information(self, "Успех", "Актер успешно удален.")
-            else:
-                QMessageBox.warning(self, "Ошибка", f"Не удалось удалить актера: {message}")
+            # Удаление актера из БД в фоновом потоке
+            self.worker.submit(self.controller.delete_actor_by_id, actor_id, action="Удаление актера",
+                               on_success=self.on_actor_deleted,
+                               on_error=lambda message: self.on_actor_deleted((False, message)))
+
+    def on_actor_deleted(self, outcome):
+        """Обработка результата удаления актера."""
+        success, message = outcome
+        if success:
+            # Обновление таблицы при успешном удалении
+            self.update_actors_table()
+            QMessageBox.information(self, "Успех", "Актер успешно удален.")
+        else:
+            QMessageBox.warning(self, "Ошибка", f"Не удалось удалить актера: {message}")
 
 
 class AddActorDialog(QDialog):
@@ -0,0 +1,569 @@
+"""
+Модуль асинхронной работы с данными театра в базе данных PostgreSQL.
+Содержит асинхронный аналог DatabaseManager на драйвере asyncpg
+и исполнитель корутин, возвращающий результаты в цикл событий Qt.
+"""
+import asyncio
+import contextvars
+import threading
+from contextlib import asynccontextmanager
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+from PySide6.QtCore import QObject, Signal
+
+from data import (ActorRank, TransactionState, QueryCache, POOL_MIN_SIZE, POOL_MAX_SIZE,
+                  CACHE_ACTORS, CACHE_PLOTS, CACHE_GAME_DATA, copy_row)
+from logger import Logger
+
+
+# Ошибки драйвера, которые методы обрабатывают так же, как psycopg2.Error в DatabaseManager
+DB_ERRORS = (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) if asyncpg else (OSError,)
+
+# Время ожидания остановки цикла asyncio при закрытии приложения (с)
+RUNNER_STOP_TIMEOUT = 5
+
+
+def is_available():
+    """Установлен ли асинхронный драйвер PostgreSQL."""
+    return asyncpg is not None
+
+
+class AsyncDatabaseManager:
+    """
+    Асинхронный менеджер базы данных театра.
+    Повторяет интерфейс DatabaseManager, но методы являются корутинами,
+    поэтому независимые запросы можно выполнять одновременно.
+    Строки возвращаются словарями, как в DatabaseManager, и кэшируются в общем кэше.
+    """
+
+    def __init__(self, cache=None):
+        """
+        Инициализация менеджера БД.
+
+        Args:
+            cache: Общий с DatabaseManager кэш справочных данных (опционально)
+        """
+        self.logger = Logger()
+        self.connection_params = None
+        self.pool = None
+        self.cache = cache if cache is not None else QueryCache()
+        # Соединение и состояние открытой транзакции в текущей задаче asyncio
+        self._connection = contextvars.ContextVar("connection", default=None)
+        self._transaction = contextvars.ContextVar("transaction", default=None)
+
+    def set_connection_params(self, dbname, user, password, host, port):
+        """Установка параметров подключения к базе данных."""
+        self.connection_params = {
+            "database": dbname,
+            "user": user,
+            "password": password,
+            "host": host,
+            "port": int(port)
+        }
+
+    async def connect(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE):
+        """
+        Создание пула асинхронных соединений.
+
+        Returns:
+            bool: Успешность подключения
+        """
+        if self.connection_params is None:
+            self.logger.error("Параметры подключения не установлены")
+            return False
+
+        try:
+            self.pool = await asyncpg.create_pool(min_size=min_size, max_size=max_size, **self.connection_params)
+            self.logger.info(f"Асинхронный пул соединений с БД {self.connection_params['database']} создан")
+            return True
+        except DB_ERRORS as e:
+            self.logger.error(f"Ошибка асинхронного подключения к БД: {str(e)}")
+            return False
+
+    async def disconnect(self):
+        """Закрытие пула соединений."""
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            self.logger.info("Асинхронный пул соединений с БД закрыт")
+
+    async def expire_connections(self):
+        """
+        Замена соединений пула при следующей выдаче
+        (после пересоздания БД их серверные процессы завершены).
+        """
+        if self.pool is not None:
+            await self.pool.expire_connections()
+            self.logger.info("Соединения асинхронного пула будут открыты заново")
+
+    @asynccontextmanager
+    async def _acquire(self):
+        """Соединение открытой транзакции или свободное соединение из пула."""
+        connection = self._connection.get()
+        if connection is not None:
+            yield connection
+            return
+        async with self.pool.acquire() as connection:
+            yield connection
+
+    @asynccontextmanager
+    async def transaction(self):
+        """
+        Единица работы: операции внутри блока выполняются на одном соединении
+        в одной транзакции. Вложенные блоки присоединяются к внешней транзакции.
+
+        Yields:
+            TransactionState: Состояние транзакции
+        """
+        current = self._transaction.get()
+        if current is not None:
+            yield current
+            return
+
+        state = TransactionState()
+        async with self.pool.acquire() as connection:
+            transaction = connection.transaction()
+            await transaction.start()
+            connection_token = self._connection.set(connection)
+            state_token = self._transaction.set(state)
+            try:
+                yield state
+            except BaseException:
+                state.failed = True
+                raise
+            finally:
+                self._connection.reset(connection_token)
+                self._transaction.reset(state_token)
+                try:
+                    if state.failed:
+                        await transaction.rollback()
+                        self.logger.error("Транзакция отменена")
+                    else:
+                        await transaction.commit()
+                        state.committed = True
+                except DB_ERRORS as e:
+                    state.failed = True
+                    self.logger.error(f"Ошибка фиксации транзакции: {str(e)}")
+                self.cache.invalidate(*state.invalidated)
+
+    def _fail(self):
+        """Пометка открытой транзакции как неудачной."""
+        state = self._transaction.get()
+        if state is not None:
+            state.failed = True
+
+    def _invalidate(self, *keys):
+        """Сброс записей кэша после изменения данных."""
+        self.cache.invalidate(*keys)
+        state = self._transaction.get()
+        if state is not None:
+            state.invalidated.update(keys)
+
+    async def _read_through(self, key, loader):
+        """Чтение через кэш; внутри транзакции кэш не используется."""
+        if self._transaction.get() is not None:
+            return await loader()
+
+        found, value, version = self.cache.lookup(key)
+        if found:
+            return value
+        value = await loader()
+        self.cache.store(key, version, value)
+        return value
+
+    async def _fetch(self, query, *args, error_message):
+        """Выполнение запроса, возвращающего строки-словари (None при ошибке)."""
+        try:
+            async with self._acquire() as connection:
+                return [dict(row) for row in await connection.fetch(query, *args)]
+        except DB_ERRORS as e:
+            self._fail()
+            self.logger.error(f"{error_message}: {str(e)}")
+            return None
+
+    async def _fetchrow(self, query, *args, error_message):
+        """Выполнение запроса, возвращающего одну строку-словарь (None при ошибке)."""
+        try:
+            async with self._acquire() as connection:
+                row = await connection.fetchrow(query, *args)
+                return dict(row) if row is not None else None
+        except DB_ERRORS as e:
+            self._fail()
+            self.logger.error(f"{error_message}: {str(e)}")
+            return None
+
+    async def _execute(self, query, *args, error_message):
+        """Выполнение изменяющего запроса (False при ошибке)."""
+        try:
+            async with self._acquire() as connection:
+                await connection.execute(query, *args)
+            return True
+        except DB_ERRORS as e:
+            self._fail()
+            self.logger.error(f"{error_message}: {str(e)}")
+            return False
+
+    async def get_actors(self):
+        """
+        Получение списка всех актеров (через кэш).
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+        actors = await self._read_through(CACHE_ACTORS, lambda: self._fetch(
+            "SELECT * FROM actors ORDER BY actor_id",
+            error_message="Ошибка получения списка актеров"))
+        return [copy_row(actor) for actor in actors] if actors is not None else []
+
+    async def get_plots(self):
+        """
+        Получение списка всех сюжетов (через кэш).
+
+        Returns:
+            list: Список словарей с данными сюжетов
+        """
+        plots = await self._read_through(CACHE_PLOTS, lambda: self._fetch(
+            "SELECT * FROM plots ORDER BY title",
+            error_message="Ошибка получения списка сюжетов"))
+        return [copy_row(plot) for plot in plots] if plots is not None else []
+
+    async def get_plot(self, plot_id):
+        """Получение сюжета по его ID."""
+        return await self._fetchrow("SELECT * FROM plots WHERE plot_id = $1", plot_id,
+                                    error_message="Ошибка получения сюжета")
+
+    async def get_performances(self, year=None):
+        """
+        Получение списка всех спектаклей с возможностью фильтрации по году.
+
+        Returns:
+            list: Список записей с данными спектаклей
+        """
+        if year:
+            performances = await self._fetch("""
+                SELECT p.*, pl.title as plot_title
+                FROM performances p
+                JOIN plots pl ON p.plot_id = pl.plot_id
+                WHERE p.year = $1
+            """, year, error_message="Ошибка получения спектаклей")
+        else:
+            performances = await self._fetch("""
+                SELECT p.*, pl.title as plot_title
+                FROM performances p
+                JOIN plots pl ON p.plot_id = pl.plot_id
+                ORDER BY p.year DESC
+            """, error_message="Ошибка получения спектаклей")
+        return performances if performances is not None else []
+
+    async def get_performance(self, performance_id):
+        """Получение спектакля по его ID."""
+        return await self._fetchrow("""
+            SELECT p.*, pl.title as plot_title
+            FROM performances p
+            JOIN plots pl ON p.plot_id = pl.plot_id
+            WHERE p.performance_id = $1
+        """, performance_id, error_message="Ошибка получения спектакля")
+
+    async def get_actors_in_performance(self, performance_id):
+        """Получение списка актеров, участвующих в спектакле."""
+        actors = await self._fetch("""
+            SELECT a.*, ap.role, ap.contract_cost
+            FROM actors a
+            JOIN actor_performances ap ON a.actor_id = ap.actor_id
+            WHERE ap.performance_id = $1
+            ORDER BY ap.contract_cost DESC
+        """, performance_id, error_message="Ошибка получения актеров в спектакле")
+        return actors if actors is not None else []
+
+    async def get_game_data(self):
+        """Получение игровых данных (текущий год и капитал) через кэш."""
+        game_data = await self._read_through(CACHE_GAME_DATA, lambda: self._fetchrow(
+            "SELECT * FROM game_data WHERE id = 1",
+            error_message="Ошибка получения игровых данных"))
+        return copy_row(game_data) if game_data is not None else None
+
+    async def load_new_performance_data(self):
+        """
+        Одновременная загрузка данных для диалога новой постановки.
+
+        Returns:
+            tuple: (игровые данные, список сюжетов, список актеров)
+        """
+        return tuple(await asyncio.gather(self.get_game_data(), self.get_plots(), self.get_actors()))
+
+    async def update_game_data(self, year, capital):
+        """Обновление игровых данных."""
+        result = await self._execute("""
+            UPDATE game_data SET current_year = $1, capital = $2 WHERE id = 1
+        """, year, capital, error_message="Ошибка обновления игровых данных")
+        self._invalidate(CACHE_GAME_DATA)
+        if result:
+            self.logger.info(f"Обновлены игровые данные: год={year}, капитал={capital}")
+        return result
+
+    async def add_actor(self, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Добавление нового актера в базу данных.
+
+        Returns:
+            int or None: ID добавленного актера или None при ошибке
+        """
+        row = await self._fetchrow("""
+            INSERT INTO actors (last_name, first_name, patronymic, rank, awards_count, experience)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            RETURNING actor_id
+        """, last_name, first_name, patronymic, rank, awards_count, experience,
+            error_message="Ошибка добавления актера")
+        self._invalidate(CACHE_ACTORS)
+        if row is None:
+            return None
+        self.logger.info(f"Добавлен актер с ID {row['actor_id']}")
+        return row['actor_id']
+
+    async def update_actor(self, actor_id, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Обновление данных актера.
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+        try:
+            async with self._acquire() as connection:
+                updated_id = await connection.fetchval("""
+                    UPDATE actors
+                    SET last_name = $1, first_name = $2, patronymic = $3,
+                        rank = $4, awards_count = $5, experience = $6
+                    WHERE actor_id = $7
+                    RETURNING actor_id
+                """, last_name, first_name, patronymic, rank, awards_count, experience, actor_id)
+        except DB_ERRORS as e:
+            self._fail()
+            self.logger.error(f"Ошибка обновления актера: {str(e)}")
+            return False, str(e)
+        finally:
+            self._invalidate(CACHE_ACTORS)
+
+        if not updated_id:
+            self.logger.error(f"Актер с ID {actor_id} не найден")
+            return False, "Актер не найден"
+        self.logger.info(f"Обновлен актер с ID {actor_id}")
+        return True, ""
+
+    async def delete_actor(self, actor_id):
+        """
+        Удаление актера из базы данных (с теми же проверками, что и в DatabaseManager).
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+        try:
+            async with self.transaction() as state, self._acquire() as connection:
+                busy = await connection.fetchval("""
+                    SELECT COUNT(*) FROM actor_performances ap
+                    JOIN performances p ON ap.performance_id = p.performance_id
+                    WHERE ap.actor_id = $1 AND p.is_completed = FALSE
+                """, actor_id)
+                if busy > 0:
+                    state.rollback()
+                    self.logger.error(f"Актер с ID {actor_id} занят в текущих постановках")
+                    return False, "Актер занят в текущих постановках"
+
+                if await connection.fetchval("SELECT COUNT(*) FROM actors") <= 8:
+                    state.rollback()
+                    self.logger.error("Невозможно удалить актера: минимальное число актеров - 8")
+                    return False, "Минимальное число актеров - 8"
+
+                await connection.execute("""
+                    DELETE FROM actor_performances
+                    WHERE actor_id = $1 AND performance_id IN (
+                        SELECT performance_id FROM performances WHERE is_completed = TRUE
+                    )
+                """, actor_id)
+                await connection.execute("DELETE FROM actors WHERE actor_id = $1", actor_id)
+                self._invalidate(CACHE_ACTORS)
+        except DB_ERRORS as e:
+            self.logger.error(f"Ошибка удаления актера: {str(e)}")
+            return False, str(e)
+
+        if not state.committed:
+            return False, "Ошибка удаления актера"
+        self.logger.info(f"Удален актер с ID {actor_id}")
+        return True, ""
+
+    async def create_performance(self, title, plot_id, year, budget):
+        """
+        Создание нового спектакля.
+
+        Returns:
+            int or None: ID созданного спектакля или None при ошибке
+        """
+        row = await self._fetchrow("""
+            INSERT INTO performances (title, plot_id, year, budget, is_completed)
+            VALUES ($1, $2, $3, $4, FALSE)
+            RETURNING performance_id
+        """, title, plot_id, year, budget, error_message="Ошибка создания спектакля")
+        if row is None:
+            return None
+        self.logger.info(f"Создан спектакль с ID {row['performance_id']}")
+        return row['performance_id']
+
+    async def assign_cast(self, performance_id, roles):
+        """
+        Назначение всего состава спектакля одним запросом.
+
+        Args:
+            performance_id: ID спектакля
+            roles: Список кортежей (actor_id, role, contract_cost)
+
+        Returns:
+            bool: Успешность назначения
+        """
+        if not roles:
+            return True
+
+        actor_ids, role_names, contract_costs = zip(*roles)
+        result = await self._execute("""
+            INSERT INTO actor_performances (actor_id, performance_id, role, contract_cost)
+            SELECT actor_id, $1, role, contract_cost
+            FROM unnest($2::int[], $3::varchar[], $4::int[]) AS cast_rows(actor_id, role, contract_cost)
+        """, performance_id, list(actor_ids), list(role_names), [int(cost) for cost in contract_costs],
+            error_message="Ошибка назначения состава спектакля")
+        if result:
+            self.logger.info(f"Назначен состав спектакля {performance_id}: {len(roles)} ролей")
+        return result
+
+    async def complete_performance(self, performance_id, revenue):
+        """Завершение спектакля с указанием выручки и увеличением опыта актеров."""
+        async with self.transaction() as state:
+            await self._execute("""
+                UPDATE performances SET revenue = $1, is_completed = TRUE WHERE performance_id = $2
+            """, revenue, performance_id, error_message="Ошибка завершения спектакля")
+            await self._execute("""
+                UPDATE actors a
+                SET experience = a.experience + 1
+                FROM actor_performances ap
+                WHERE a.actor_id = ap.actor_id AND ap.performance_id = $1
+            """, performance_id, error_message="Ошибка завершения спектакля")
+            self._invalidate(CACHE_ACTORS)
+
+        if state.failed:
+            return False
+        self.logger.info(f"Спектакль {performance_id} завершен с выручкой {revenue}")
+        return True
+
+    async def update_performance_budget(self, performance_id, budget):
+        """Обновление бюджета спектакля."""
+        result = await self._execute("""
+            UPDATE performances SET budget = $1 WHERE performance_id = $2
+        """, budget, performance_id, error_message="Ошибка обновления бюджета")
+        if result:
+            self.logger.info(f"Обновлен бюджет спектакля {performance_id}: {budget}")
+        return result
+
+    async def upgrade_actor_rank(self, actor_id):
+        """
+        Повышение звания актера на одну ступень.
+
+        Returns:
+            bool: Успешность повышения
+        """
+        current_rank = await self._fetchrow("SELECT rank FROM actors WHERE actor_id = $1", actor_id,
+                                            error_message="Ошибка повышения звания")
+        if current_rank is None:
+            return False
+
+        # Определение нового звания
+        rank_order = list(ActorRank)
+        rank_idx = [r.value for r in rank_order].index(current_rank['rank'])
+        if rank_idx >= len(rank_order) - 1:
+            self.logger.info(f"Актер {actor_id} уже имеет максимальное звание")
+            return False
+
+        new_rank = rank_order[rank_idx + 1].value
+        result = await self._execute("UPDATE actors SET rank = $1 WHERE actor_id = $2", new_rank, actor_id,
+                                     error_message="Ошибка повышения звания")
+        self._invalidate(CACHE_ACTORS)
+        if result:
+            self.logger.info(f"Актер {actor_id} повышен до звания '{new_rank}'")
+        return result
+
+    async def award_actor(self, actor_id):
+        """Присвоение награды актеру."""
+        result = await self._execute("""
+            UPDATE actors SET awards_count = awards_count + 1 WHERE actor_id = $1
+        """, actor_id, error_message="Ошибка присвоения награды")
+        self._invalidate(CACHE_ACTORS)
+        if result:
+            self.logger.info(f"Актеру {actor_id} присвоена награда")
+        return result
+
+
+class AsyncRunner(QObject):
+    """
+    Исполнитель корутин: цикл asyncio работает в отдельном потоке,
+    а результаты доставляются в цикл событий Qt через очередь сигналов.
+    """
+    _completed = Signal(object, object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run_loop, name="asyncio-db", daemon=True)
+        self._completed.connect(self._deliver)
+
+    def start(self):
+        """Запуск цикла asyncio."""
+        if not self.thread.is_alive():
+            self.thread.start()
+
+    def stop(self, final=None, timeout=RUNNER_STOP_TIMEOUT):
+        """
+        Остановка цикла asyncio после завершения корутины final (например, закрытия пула).
+        Вызывающий поток ждет остановки не дольше timeout секунд.
+        """
+        if not self.thread.is_alive():
+            return
+
+        async def finish():
+            try:
+                if final is not None:
+                    await final
+            except Exception as e:
+                Logger().error(f"Ошибка асинхронной операции: {str(e)}")
+            finally:
+                self.loop.stop()
+
+        asyncio.run_coroutine_threadsafe(finish(), self.loop)
+        self.thread.join(timeout)
+
+    def submit(self, coro, on_success=None, on_error=None):
+        """
+        Запуск корутины без ожидания. Обработчики вызываются в потоке интерфейса.
+
+        Returns:
+            concurrent.futures.Future: Будущий результат корутины
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(lambda f: self._completed.emit(f, on_success, on_error))
+        return future
+
+    def _run_loop(self):
+        """Цикл asyncio (выполняется в отдельном потоке)."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def _deliver(self, future, on_success, on_error):
+        """Передача результата корутины обработчику в потоке интерфейса."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            Logger().error(f"Ошибка асинхронной операции: {str(error)}")
+            if on_error:
+                on_error(str(error))
+        elif on_success:
+            on_success(future.result())
@@ -0,0 +1,83 @@
+"""
+Модуль отслеживания изменений данных, сделанных другими клиентами.
+Слушатель работает в цикле событий Qt, поэтому относится к уровню приложения:
+слой данных (DatabaseManager) только создает триггеры уведомлений
+и сбрасывает кэш по списку измененных таблиц.
+"""
+import psycopg2
+from psycopg2 import sql
+from PySide6.QtCore import QObject, QSocketNotifier, Signal
+from data import CHANGE_CHANNEL
+from logger import Logger
+
+
+class ChangeListener(QObject):
+    """
+    Слушатель уведомлений PostgreSQL (LISTEN/NOTIFY) об изменении таблиц.
+    Работает в цикле событий Qt: сокет отдельного соединения отслеживается
+    через QSocketNotifier, поэтому опрос БД не требуется.
+    """
+    tables_changed = Signal(list)
+
+    def __init__(self, connection_params, ignored_pids=None, parent=None):
+        """
+        Args:
+            connection_params: Параметры подключения к БД
+            ignored_pids: Множество PID собственных соединений, уведомления от которых пропускаются
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.logger = Logger()
+        self.connection_params = connection_params
+        self.ignored_pids = ignored_pids if ignored_pids is not None else set()
+        self.connection = None
+        self.notifier = None
+
+    def start(self):
+        """
+        Подключение к БД и подписка на канал уведомлений.
+
+        Returns:
+            bool: Успешность запуска
+        """
+        try:
+            self.connection = psycopg2.connect(**self.connection_params)
+            self.connection.autocommit = True
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(CHANGE_CHANNEL)))
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка запуска слушателя изменений БД: {str(e)}")
+            self.stop()
+            return False
+
+        self.notifier = QSocketNotifier(self.connection.fileno(), QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self._on_activated)
+        self.logger.info("Слушатель изменений БД запущен")
+        return True
+
+    def stop(self):
+        """Отписка от уведомлений и закрытие соединения."""
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+            self.notifier = None
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def _on_activated(self, *args):
+        """Чтение пришедших уведомлений и оповещение о затронутых таблицах."""
+        try:
+            self.connection.poll()
+        except psycopg2.Error as e:
+            self.logger.error(f"Соединение слушателя изменений БД потеряно: {str(e)}")
+            self.stop()
+            return
+
+        tables = set()
+        while self.connection.notifies:
+            notify = self.connection.notifies.pop(0)
+            if notify.pid not in self.ignored_pids:
+                tables.add(notify.payload)
+
+        if tables:
+            self.tables_changed.emit(sorted(tables))
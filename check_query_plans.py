@@ -0,0 +1,280 @@
+"""
+Модуль проверки планов запросов DatabaseManager.
+Создает временную БД с большим объемом синтетических данных, вызывает методы
+DatabaseManager и для каждого запроса выполняет EXPLAIN. Проверка не проходит,
+если запрос читает большую таблицу последовательным сканированием или вызов
+не использует ожидаемый для него индекс.
+Потоковые методы iter_actors, iter_performances и iter_performance_casts не вызываются:
+EXPLAIN нельзя объявить серверным курсором, а их запросы совпадают с запросами
+get_actors, get_performances и copy_performance_casts, планы которых проверяются.
+Запуск из командной строки: python check_query_plans.py [параметры подключения]
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+import tempfile
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import DictCursor
+from data import DatabaseManager, ActorRank
+from logger import Logger
+
+
+# Объем синтетических данных
+CHECK_ACTORS = 50000
+CHECK_PLOTS = 50
+CHECK_PERFORMANCES = 5000
+CHECK_ROLES_PER_PERFORMANCE = 8
+# Таблицы, в которых меньше строк, могут читаться последовательно
+SEQ_SCAN_MIN_ROWS = 1000
+# Запросы, которые объясняются перед выполнением
+EXPLAINED_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# Выгрузка COPY (запрос) TO: объясняется вложенный запрос
+COPY_QUERY_PATTERN = re.compile(r"\s*COPY\s*\((.*)\)\s*TO\s", re.DOTALL | re.IGNORECASE)
+
+# Планы запросов, выполненных через ExplainingCursor: (текст запроса, план)
+recorded_plans = []
+
+
+class ExplainingCursor(DictCursor):
+    """Курсор, выполняющий EXPLAIN перед каждым запросом и сохраняющий план."""
+
+    def execute(self, query, vars=None):
+        if isinstance(query, sql.Composable):
+            text = query.as_string(self)
+        elif isinstance(query, bytes):
+            text = query.decode(self.connection.encoding)
+        else:
+            text = query
+
+        words = text.split(None, 1)
+        if words and words[0].upper() in EXPLAINED_STATEMENTS:
+            self._explain(text, vars)
+        return super().execute(query, vars)
+
+    def copy_expert(self, statement, file, size=8192):
+        match = COPY_QUERY_PATTERN.match(statement)
+        if match:
+            self._explain(match.group(1), None)
+        return super().copy_expert(statement, file, size)
+
+    def _explain(self, text, vars):
+        """Получение и сохранение плана запроса."""
+        super().execute("EXPLAIN (FORMAT JSON) " + text, vars)
+        recorded_plans.append((" ".join(text.split()), self.fetchone()[0][0]["Plan"]))
+
+
+def seq_scanned_tables(plan):
+    """Таблицы, читаемые последовательным сканированием в узлах плана."""
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan":
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= seq_scanned_tables(child)
+    return tables
+
+
+def used_indexes(plan):
+    """Индексы, читаемые в узлах плана."""
+    indexes = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", []):
+        indexes |= used_indexes(child)
+    return indexes
+
+
+def write_fixture(fixture_dir):
+    """Запись синтетической фикстуры большого объема в каталог."""
+    ranks = [rank.value for rank in ActorRank]
+
+    with open(os.path.join(fixture_dir, "actors.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("last_name", "first_name", "patronymic", "rank", "awards_count", "experience"))
+        for i in range(CHECK_ACTORS):
+            writer.writerow((f"Фамилия{i}", f"Имя{i % 997}", f"Отчество{i % 101}", ranks[i % len(ranks)],
+                             i % 11, i % 40))
+
+    with open(os.path.join(fixture_dir, "plots.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("title", "minimum_budget", "production_cost", "roles_count", "demand", "required_ranks"))
+        for i in range(CHECK_PLOTS):
+            writer.writerow((f"Сюжет {i}", 400000, 250000, CHECK_ROLES_PER_PERFORMANCE, 1 + i % 10,
+                             "{" + ranks[i % len(ranks)] + "}"))
+
+    with open(os.path.join(fixture_dir, "performances.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("title", "plot_id", "year", "budget", "revenue", "is_completed"))
+        for i in range(CHECK_PERFORMANCES):
+            # Незавершенными остаются только последние постановки, как в реальной игре
+            completed = i < CHECK_PERFORMANCES - 3
+            writer.writerow((f"Постановка {i}", 1 + i % CHECK_PLOTS, 2022 + i, 500000 + i * 10,
+                             (450000 + i * 37) if completed else 0, "true" if completed else "false"))
+
+    with open(os.path.join(fixture_dir, "actor_performances.csv"), "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("actor_id", "performance_id", "role", "contract_cost"))
+        for i in range(CHECK_PERFORMANCES):
+            for role in range(CHECK_ROLES_PER_PERFORMANCE):
+                actor_id = 1 + (i * CHECK_ROLES_PER_PERFORMANCE + role) % CHECK_ACTORS
+                writer.writerow((actor_id, i + 1, f"Роль {role}", 50000 + role * 1000))
+
+
+def exercises(db):
+    """
+    Вызовы методов DatabaseManager для проверки.
+
+    Returns:
+        list: Кортежи (название, вызов, таблицы, которые вызов по смыслу читает целиком
+              [, индексы, которые должен использовать хотя бы один запрос вызова])
+    """
+    open_performance = CHECK_PERFORMANCES
+    free_actor = CHECK_ACTORS
+    return [
+        # Запрос к системному каталогу: размеры считаются только для таблиц схемы public
+        ("schema_exists", db.schema_exists, set()),
+        ("get_actors", db.get_actors, {"actors"}),
+        ("get_plots", db.get_plots, set()),
+        ("get_game_data", db.get_game_data, set()),
+        ("get_plot", lambda: db.get_plot(1), set()),
+        ("get_actors_page", lambda: db.get_actors_page(), set()),
+        ("get_actors_page(after)", lambda: db.get_actors_page(after_id=1000), set()),
+        *[(f"get_actors_page({order_by})",
+           lambda order_by=order_by: db.get_actors_page(order_by=order_by, descending=True), set())
+          for order_by in ("last_name", "first_name", "patronymic", "rank", "experience", "awards_count")],
+        ("get_performances", db.get_performances, {"performances"}),
+        ("get_performances(year)", lambda: db.get_performances(year=2030), set()),
+        ("get_performances_page", lambda: db.get_performances_page(), set()),
+        *[(f"get_performances_page({order_by})",
+           lambda order_by=order_by: db.get_performances_page(order_by=order_by), set())
+          for order_by in ("title", "budget", "revenue", "profit")],
+        # Сортировка по названию сюжета требует соединения с plots до сортировки
+        ("get_performances_page(plot_title)",
+         lambda: db.get_performances_page(order_by="plot_title"), {"performances"}),
+        ("get_performance", lambda: db.get_performance(100), set()),
+        ("get_actors_in_performance", lambda: db.get_actors_in_performance(100), set()),
+        # Выгрузка всей истории с составами читает таблицы целиком
+        ("copy_performance_casts", lambda: db.copy_performance_casts(io.StringIO()),
+         {"performances", "actor_performances", "actors"}),
+        ("update_game_data", lambda: db.update_game_data(2025, 1000000), set()),
+        ("add_actor", lambda: db.add_actor("Проверкин", "Петр", "", "Начинающий", 0, 0), set()),
+        # Временная таблица импорта читается целиком; конфликт ищется по уникальному индексу ФИО
+        ("import_actors", lambda: db.import_actors([(1, "Фамилия5", "Имя5", "Отчество5", "Мастер", 1, 2),
+                                                    (2, "Импортов", "Иван", "", "Начинающий", 0, 0)]), set()),
+        ("update_actor", lambda: db.update_actor(10, "Фамилия9", "Имя9", "Отчество9", "Ведущий", 1, 1), set()),
+        ("award_actor", lambda: db.award_actor(10), set()),
+        ("upgrade_actor_rank", lambda: db.upgrade_actor_rank(10), set()),
+        ("create_performance", lambda: db.create_performance("Проверка", 1, 9999, 500000), set()),
+        ("assign_actor_to_role",
+         lambda: db.assign_actor_to_role(free_actor - 2, open_performance, "Проверка", 50000), set()),
+        ("update_performance_budget", lambda: db.update_performance_budget(open_performance, 600000), set()),
+        ("assign_cast", lambda: db.assign_cast(open_performance, [(free_actor - 1, "Проверка", 50000)]), set()),
+        ("complete_performance", lambda: db.complete_performance(open_performance, 700000), set()),
+        # Проверка минимального числа актеров считает всех актеров;
+        # занятость актера проверяется по частичному индексу незавершенных постановок
+        ("delete_actor", lambda: db.delete_actor(free_actor), {"actors"}, {"performances_open_idx"}),
+    ]
+
+
+def table_sizes(db):
+    """Оценка числа строк в таблицах (после ANALYZE)."""
+    with db.connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT relname, reltuples FROM pg_class
+            WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace
+        """)
+        return dict(cursor.fetchall())
+
+
+def run_check(connection_params):
+    """
+    Проверка планов всех запросов на временной БД.
+
+    Returns:
+        list: Нарушения (название вызова, таблица, текст запроса)
+    """
+    logger = Logger()
+    check_params = dict(connection_params, dbname=f"{connection_params['dbname']}_plancheck")
+
+    admin = DatabaseManager()
+    admin.set_connection_params(**check_params)
+    conn, cursor = admin.connect_to_postgres()
+    if not conn:
+        raise RuntimeError("Не удалось подключиться к системной БД postgres")
+    cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(check_params["dbname"])))
+    cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(check_params["dbname"])))
+
+    db = DatabaseManager()
+    db.set_connection_params(**check_params)
+    db.cursor_factory = ExplainingCursor
+    try:
+        with tempfile.TemporaryDirectory() as fixture_dir:
+            write_fixture(fixture_dir)
+            if not (db.connect() and db.create_schema() and db.migrate() and db.init_sample_data(fixture_dir)):
+                raise RuntimeError("Не удалось подготовить БД для проверки")
+
+        with db.connection.cursor() as analyze_cursor:
+            analyze_cursor.execute("ANALYZE")
+        db.connection.commit()
+        sizes = table_sizes(db)
+
+        violations = []
+        for name, call, full_scan_tables, *required in exercises(db):
+            recorded_plans.clear()
+            call()
+            if not recorded_plans:
+                violations.append((name, None, "запрос не выполнен"))
+            for index in (required[0] if required else set()):
+                if not any(index in used_indexes(plan) for _, plan in recorded_plans):
+                    violations.append((name, None, f"не используется индекс {index}"))
+            for query, plan in recorded_plans:
+                for table in seq_scanned_tables(plan) - full_scan_tables:
+                    if sizes.get(table, 0) >= SEQ_SCAN_MIN_ROWS:
+                        violations.append((name, table, query))
+        logger.info(f"Проверка планов запросов завершена, нарушений: {len(violations)}")
+        return violations
+    finally:
+        db.disconnect()
+        cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(check_params["dbname"])))
+        conn.close()
+
+
+def main(argv=None):
+    """
+    Проверка планов запросов с параметрами из командной строки.
+
+    Returns:
+        int: Код завершения процесса (1 - найдены последовательные сканирования)
+    """
+    parser = argparse.ArgumentParser(description="Проверка планов запросов DatabaseManager")
+    parser.add_argument("--dbname", default="task1", help="Имя базы данных (проверка использует <имя>_plancheck)")
+    parser.add_argument("--user", default="postgres", help="Имя пользователя")
+    parser.add_argument("--password", default="postgres", help="Пароль")
+    parser.add_argument("--host", default="localhost", help="Хост сервера БД")
+    parser.add_argument("--port", default="5432", help="Порт сервера БД")
+    args = parser.parse_args(argv)
+
+    try:
+        violations = run_check({
+            "dbname": args.dbname,
+            "user": args.user,
+            "password": args.password,
+            "host": args.host,
+            "port": args.port
+        })
+    except (RuntimeError, psycopg2.Error) as e:
+        print(f"Ошибка проверки: {str(e)}", file=sys.stderr)
+        return 2
+
+    for name, table, query in violations:
+        if table is None:
+            print(f"{name}: {query}")
+        else:
+            print(f"{name}: последовательное сканирование {table}\n    {query}")
+    print(f"Результат проверки: {'Успешно' if not violations else f'нарушений - {len(violations)}'}")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
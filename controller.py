@@ -2,45 +2,186 @@
 Модуль управления театральными постановками.
 Содержит основную бизнес-логику приложения.
 """
+import csv
 import random
 import re
-from data import DatabaseManager, ActorRank
+from data import DatabaseManager, ActorRank, PAGE_SIZE, POOL_MIN_SIZE, POOL_MAX_SIZE
+import async_data
+from change_listener import ChangeListener
+import export_data
+import forecast
 from logger import Logger
 
+
+# Столбцы CSV-файла импорта актеров (обязательны только фамилия и имя)
+ACTOR_IMPORT_COLUMNS = ("last_name", "first_name", "patronymic", "rank", "awards_count", "experience")
+ACTOR_IMPORT_REQUIRED = ("last_name", "first_name")
+# Максимальная длина ФИО актера (как в схеме БД)
+MAX_NAME_LENGTH = 100
+# Наибольшее значение счетчиков актера (тип INTEGER в БД)
+MAX_COUNT_VALUE = 2 ** 31 - 1
+
  
 class TheaterController:
     """
     Основной контроллер театра, отвечающий за бизнес-логику приложения.
     Управляет актерами, постановками, бюджетом и результатами спектаклей.
     """
-    def __init__(self):
-        """Инициализация контроллера."""
-        self.db = DatabaseManager()
+    def __init__(self, repository=None):
+        """
+        Инициализация контроллера.
+
+        Args:
+            repository: Хранилище данных (TheaterRepository); по умолчанию - DatabaseManager.
+                        Пул соединений, асинхронный доступ, шаблон БД, статистика запросов
+                        и выгрузка истории доступны только с DatabaseManager.
+        """
+        self.db = repository if repository is not None else DatabaseManager()
         self.logger = Logger()
         self.is_connected = False
+        self.change_listener = None
+        # Асинхронный доступ к БД (включается после подключения, если доступен asyncpg)
+        self.async_db = None
+        self.async_runner = None
+        # Быстрый сброс БД копированием шаблонной БД
+        self.template_reset = False
 
     def set_connection_params(self, dbname, user, password, host, port):
         """Установка параметров подключения к БД."""
         self.db.set_connection_params(dbname, user, password, host, port)
 
+    def enable_connection_pool(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE):
+        """Включение пула соединений для параллельной работы с БД."""
+        self.db.set_pool_params(min_size, max_size)
+
     def connect_to_database(self):
         """Установка соединения с БД."""
         self.is_connected = self.db.connect()
         return self.is_connected
 
+    def enable_async_backend(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE, on_done=None):
+        """
+        Включение асинхронного доступа к БД для одновременного выполнения запросов.
+        Пул создается без ожидания; до его готовности используется синхронный доступ.
+
+        Args:
+            on_done: Обработчик результата подключения (bool), вызывается в потоке интерфейса
+
+        Returns:
+            bool: Запущено ли подключение
+        """
+        if not async_data.is_available():
+            self.logger.warning("Модуль asyncpg не установлен, асинхронный доступ к БД отключен")
+            return False
+
+        params = self.db.connection_params
+        async_db = async_data.AsyncDatabaseManager(cache=self.db.cache)
+        async_db.set_connection_params(params["dbname"], params["user"], params["password"],
+                                       params["host"], params["port"])
+        runner = async_data.AsyncRunner()
+        runner.start()
+        self.async_runner = runner
+
+        def on_connected(connected):
+            # Контроллер мог быть закрыт до завершения подключения
+            if self.async_runner is not runner:
+                return
+            if connected:
+                self.async_db = async_db
+            else:
+                runner.stop()
+                self.async_runner = None
+            if on_done:
+                on_done(connected)
+
+        runner.submit(async_db.connect(min_size, max_size), on_success=on_connected,
+                      on_error=lambda message: on_connected(False))
+        return True
+
+    def start_change_listener(self):
+        """
+        Запуск отслеживания изменений данных другими клиентами.
+        При уведомлении сбрасываются только затронутые записи кэша.
+        Должно вызываться из потока интерфейса.
+
+        Returns:
+            ChangeListener or None: Слушатель или None при ошибке
+        """
+        if self.change_listener is not None:
+            return self.change_listener
+
+        self.db.ensure_change_triggers()
+        listener = ChangeListener(self.db.connection_params, self.db.own_backends)
+        if not listener.start():
+            return None
+
+        listener.tables_changed.connect(self.db.invalidate_tables)
+        self.change_listener = listener
+        return listener
+
+    def stop_change_listener(self):
+        """Остановка отслеживания изменений данных другими клиентами."""
+        if self.change_listener is not None:
+            self.change_listener.stop()
+            self.change_listener = None
+
     def create_database(self):
         """Создание новой базы данных."""
         return self.db.create_database()
 
-    def initialize_database(self):
-        """Инициализация схемы БД и заполнение тестовыми данными."""
-        result1 = self.db.create_schema()
-        result2 = self.db.init_sample_data()
+    def is_schema_initialized(self):
+        """Проверка наличия схемы БД."""
+        return self.db.schema_exists()
+
+    def initialize_database(self, fixture_dir=None):
+        """Инициализация схемы БД и заполнение данными фикстуры (по умолчанию - тестовыми)."""
+        result1 = self.db.create_schema() and self.db.migrate()
+        result2 = self.db.init_sample_data(fixture_dir)
         return result1 and result2
 
-    def reset_database(self):
-        """Сброс данных БД к начальному состоянию."""
-        return self.db.reset_database()
+    def reset_database(self, fixture_dir=None):
+        """
+        Сброс данных БД к начальному состоянию.
+        В режиме быстрого сброса БД заменяется копией шаблона (если не задана другая фикстура).
+        """
+        if self.template_reset and fixture_dir is None:
+            result = self.db.reset_from_template()
+            # Соединения асинхронного пула с прежней БД закрыты сервером
+            if self.async_db is not None:
+                self.async_runner.submit(self.async_db.expire_connections())
+            return result
+        return self.db.reset_database(fixture_dir)
+
+    def enable_template_reset(self, rebuild=False):
+        """
+        Включение быстрого сброса БД из шаблона. Шаблон создается, если его еще нет
+        или его схема старше последней миграции.
+
+        Args:
+            rebuild: Пересоздать шаблон, даже если он существует
+
+        Returns:
+            bool: Успешность включения
+        """
+        if rebuild or not self.db.template_is_current():
+            if not self.db.build_template():
+                return False
+        self.template_reset = True
+        self.logger.info("Включен быстрый сброс БД из шаблона")
+        return True
+
+    def disable_template_reset(self):
+        """Возврат к обычному сбросу БД (очистка таблиц и загрузка данных)."""
+        self.template_reset = False
+
+    def restart_change_listener(self):
+        """
+        Переподключение слушателя изменений (например, после замены БД из шаблона).
+        Должно вызываться из потока интерфейса.
+        """
+        if self.change_listener is not None:
+            self.change_listener.stop()
+            self.change_listener.start()
 
     def reset_schema(self):
         """Сброс схемы БД и пересоздание всех таблиц."""
@@ -58,10 +199,55 @@ class TheaterController:
         """Получение списка всех сюжетов."""
         return self.db.get_plots()
 
+    def export_performance_history(self, path):
+        """
+        Выгрузка истории спектаклей с составами в CSV или Parquet.
+
+        Returns:
+            tuple: (успех операции (bool), сообщение (str))
+        """
+        return export_data.export_performance_casts(self.db, path)
+
+    def is_parquet_export_available(self):
+        """Доступна ли выгрузка истории в Parquet (установлен ли pyarrow)."""
+        return export_data.is_parquet_available()
+
+    def get_new_performance_data(self):
+        """
+        Получение данных для новой постановки: игровые данные, сюжеты и актеры.
+
+        Returns:
+            tuple: (игровые данные, список сюжетов, список актеров)
+        """
+        return self.db.get_game_data(), self.db.get_plots(), self.db.get_actors()
+
+    def submit_new_performance_data(self, on_success, on_error=None):
+        """
+        Одновременная загрузка данных для новой постановки через асинхронный доступ к БД.
+        Обработчики вызываются в потоке интерфейса с результатом get_new_performance_data.
+
+        Returns:
+            concurrent.futures.Future or None: Будущий результат или None,
+                                               если асинхронный доступ не включен
+        """
+        if self.async_db is None:
+            return None
+        return self.async_runner.submit(self.async_db.load_new_performance_data(), on_success, on_error)
+
     def get_performances_history(self):
         """Получение истории всех постановок."""
         return self.db.get_performances()
 
+    def get_actors_page(self, after_id=None, limit=PAGE_SIZE, order_by="actor_id", descending=False,
+                        after_value=None):
+        """Постраничное получение актеров с сортировкой на стороне БД."""
+        return self.db.get_actors_page(after_id, limit, order_by, descending, after_value)
+
+    def get_performances_page(self, after_year=None, limit=PAGE_SIZE, order_by="year", descending=True,
+                              after_value=None):
+        """Постраничное получение истории постановок с сортировкой на стороне БД."""
+        return self.db.get_performances_page(after_year, limit, order_by, descending, after_value)
+
     def get_performance_details(self, performance_id):
         """
         Получение детальной информации о спектакле.
@@ -72,8 +258,7 @@ class TheaterController:
         Returns:
             dict: Информация о спектакле и задействованных актерах
         """
-        performances = self.db.get_performances()
-        performance = next((p for p in performances if p['performance_id'] == performance_id), None)
+        performance = self.db.get_performance(performance_id)
 
         if not performance:
             return None
@@ -85,15 +270,17 @@ class TheaterController:
             'actors': actors
         }
 
-    def create_new_performance(self, title, plot_id, year, budget):
+    def create_new_performance(self, title, plot_id, year, budget, roles=None):
         """
         Создание нового спектакля.
+        Спектакль, его состав и списание бюджета сохраняются одной транзакцией.
 
         Args:
             title: Название спектакля
             plot_id: ID сюжета
             year: Год постановки
             budget: Бюджет спектакля
+            roles: Список кортежей (actor_id, role, contract_cost) (опционально)
 
         Returns:
             tuple: (успех операции (bool), ID спектакля или сообщение об ошибке)
@@ -104,8 +291,7 @@ class TheaterController:
             return False, "Недостаточно средств в капитале"
 
         # Проверка сюжета и минимального бюджета
-        plots = self.db.get_plots()
-        plot = next((p for p in plots if p['plot_id'] == plot_id), None)
+        plot = self.db.get_plot(plot_id)
 
         if not plot:
             return False, "Сюжет не найден"
@@ -113,21 +299,64 @@ class TheaterController:
         if budget < plot['minimum_budget']:
             return False, "Бюджет меньше минимально необходимого для данного сюжета"
 
-        # Создание спектакля в БД
-        performance_id = self.db.create_performance(title, plot_id, year, budget)
+        with self.db.transaction() as tx:
+            # Создание спектакля в БД
+            performance_id = self.db.create_performance(title, plot_id, year, budget)
+
+            if performance_id:
+                # Назначение состава одним запросом
+                if roles:
+                    self.db.assign_cast(performance_id, roles)
+
+                # Обновление капитала театра
+                new_capital = game_data['capital'] - budget
+                self.db.update_game_data(year, new_capital)
 
-        if performance_id:
-            # Обновление капитала театра
-            new_capital = game_data['capital'] - budget
-            self.db.update_game_data(year, new_capital)
+        # Внутри внешней единицы работы фиксация произойдет при выходе из нее
+        if performance_id and not tx.failed:
             return True, performance_id
         else:
             return False, "Ошибка при создании спектакля"
 
+    def produce_performance(self, title, plot_id, year, budget, roles=None):
+        """
+        Создание спектакля и расчет его результатов одной транзакцией:
+        при ошибке или отмене любого шага не остается незавершенного спектакля
+        и списанного бюджета.
+
+        Args:
+            title: Название спектакля
+            plot_id: ID сюжета
+            year: Год постановки
+            budget: Бюджет спектакля
+            roles: Список кортежей (actor_id, role, contract_cost) (опционально)
+
+        Returns:
+            tuple: (успех операции (bool), результаты спектакля или сообщение об ошибке)
+        """
+        with self.db.transaction() as tx:
+            success, result = self.create_new_performance(title, plot_id, year, budget, roles)
+            if not success:
+                tx.rollback()
+                return False, f"Не удалось создать спектакль: {result}"
+
+            success, result = self.calculate_performance_result(result)
+            if not success:
+                tx.rollback()
+                return False, "Не удалось рассчитать результаты спектакля"
+
+        if not tx.committed:
+            return False, "Не удалось сохранить результаты спектакля"
+        return True, result
+
     def assign_actor_to_performance(self, actor_id, performance_id, role, contract_cost):
         """Назначение актера на роль в спектакле."""
         return self.db.assign_actor_to_role(actor_id, performance_id, role, contract_cost)
 
+    def assign_cast(self, performance_id, roles):
+        """Назначение всего состава спектакля одним запросом."""
+        return self.db.assign_cast(performance_id, roles)
+
     def calculate_contract_cost(self, actor):
         """
         Расчет стоимости контракта актера.
@@ -159,46 +388,31 @@ class TheaterController:
             'total': contract_cost + premium
         }
 
-    def calculate_performance_result(self, performance_id):
+    def performance_model(self, plot, budget, actors):
         """
-        Расчет результатов спектакля.
+        Неслучайные параметры модели результатов спектакля.
 
         Args:
-            performance_id: ID спектакля
+            plot: Данные сюжета
+            budget: Бюджет спектакля
+            actors: Актеры состава (с contract_cost) в порядке убывания стоимости контракта
 
         Returns:
-            tuple: (успех операции (bool), результаты спектакля (dict))
+            dict: Фактический бюджет и экономия, базовая выручка, бонус за актеров,
+                  соответствие званий требованиям ролей, возможность повышения звания
         """
-        # Получение данных спектакля
-        performances = self.db.get_performances()
-        performance = next((p for p in performances if p['performance_id'] == performance_id), None)
-
-        if not performance or performance['is_completed']:
-            return False, "Спектакль не найден или уже завершен"
-
-        # Получение данных сюжета
-        plots = self.db.get_plots()
-        plot = next((p for p in plots if p['plot_id'] == performance['plot_id']), None)
-
-        # Получение списка актеров в спектакле
-        actors = self.db.get_actors_in_performance(performance_id)
-
         # Расчет фактических затрат
         total_spent = plot['production_cost']
         for actor in actors:
             total_spent += actor['contract_cost']
 
         # Определение фактического бюджета и экономии
-        actual_budget = min(performance['budget'], total_spent)
-        saved_budget = performance['budget'] - actual_budget
+        actual_budget = min(budget, total_spent)
+        saved_budget = budget - actual_budget
 
         # Расчет базовой выручки (увеличена для лучшего баланса)
         base_revenue = actual_budget * (0.7 + 0.08 * plot['demand'])
 
-        # Непредвиденные расходы (5-15% от бюджета)
-        unexpected_expenses = int(actual_budget * random.uniform(0.05, 0.15))
-        self.logger.info(f"Непредвиденные расходы спектакля {performance_id}: {unexpected_expenses}")
-
         # Проверка соответствия званий актеров требованиям ролей
         rank_order = ['Начинающий', 'Постоянный', 'Ведущий', 'Мастер', 'Заслуженный', 'Народный']
         actors_match_requirements = True
@@ -238,60 +452,158 @@ class TheaterController:
             actor_contribution = actor['contract_cost'] * rank_multiplier * (1 + award_bonus + exp_bonus)
             actors_bonus += actor_contribution
 
+        # Повысить можно лучшего актера, если его звание не максимальное
+        best_actors = self._actors_by_merit(actors)
+        can_upgrade = bool(best_actors) and best_actors[0]['rank'] != rank_order[-1]
+
+        return {
+            'actual_budget': actual_budget,
+            'saved_budget': saved_budget,
+            'base_revenue': base_revenue,
+            'actors_bonus': actors_bonus,
+            'matches_requirements': actors_match_requirements,
+            'can_upgrade': can_upgrade
+        }
+
+    @staticmethod
+    def _actors_by_merit(actors):
+        """Актеры в порядке убывания звания, опыта и числа наград (для награждения)."""
+        rank_order = ['Начинающий', 'Постоянный', 'Ведущий', 'Мастер', 'Заслуженный', 'Народный']
+        return sorted(actors,
+                      key=lambda a: (rank_order.index(a['rank']), a['experience'], a['awards_count']),
+                      reverse=True)
+
+    def forecast_performance(self, plot_id, budget, roles, samples=forecast.FORECAST_SAMPLES):
+        """
+        Прогноз результатов планируемого спектакля методом Монте-Карло
+        по той же модели, что и calculate_performance_result.
+
+        Args:
+            plot_id: ID сюжета
+            budget: Бюджет спектакля
+            roles: Список кортежей (actor_id, role, contract_cost)
+            samples: Число испытаний
+
+        Returns:
+            tuple: (успех операции (bool), прогноз (dict, см. forecast.simulate) или сообщение об ошибке)
+        """
+        plot = self.db.get_plot(plot_id)
+        if not plot:
+            return False, "Сюжет не найден"
+
+        actors_by_id = {actor['actor_id']: actor for actor in self.db.get_actors() or []}
+        actors = []
+        for actor_id, role, contract_cost in roles:
+            actor = actors_by_id.get(actor_id)
+            if actor is None:
+                return False, f"Актер с ID {actor_id} не найден"
+            actors.append(dict(actor, contract_cost=contract_cost))
+        # Порядок состава как в get_actors_in_performance (для проверки требований ролей)
+        actors.sort(key=lambda actor: actor['contract_cost'], reverse=True)
+
+        result = forecast.simulate(self.performance_model(plot, budget, actors), samples)
+        self.logger.metric("performance_forecast", plot_id=plot_id, budget=budget, samples=result['samples'],
+                           expected_profit=result['expected_profit'], loss_probability=result['loss_probability'],
+                           duration_ms=round(result['elapsed_ms'], 3))
+        return True, result
+
+    def calculate_performance_result(self, performance_id):
+        """
+        Расчет результатов спектакля.
+
+        Args:
+            performance_id: ID спектакля
+
+        Returns:
+            tuple: (успех операции (bool), результаты спектакля (dict))
+        """
+        # Получение данных спектакля
+        performance = self.db.get_performance(performance_id)
+
+        if not performance or performance['is_completed']:
+            return False, "Спектакль не найден или уже завершен"
+
+        # Получение данных сюжета
+        plot = self.db.get_plot(performance['plot_id'])
+
+        # Получение списка актеров в спектакле
+        actors = self.db.get_actors_in_performance(performance_id)
+
+        model = self.performance_model(plot, performance['budget'], actors)
+        actual_budget = model['actual_budget']
+        saved_budget = model['saved_budget']
+
+        # Непредвиденные расходы (5-15% от бюджета)
+        unexpected_expenses = int(actual_budget * random.uniform(*forecast.UNEXPECTED_EXPENSES_RANGE))
+        self.logger.info(f"Непредвиденные расходы спектакля {performance_id}: {unexpected_expenses}",
+                         event="unexpected_expenses", performance_id=performance_id, amount=unexpected_expenses)
+
         # Определение типа спектакля с учетом соответствия требованиям
         fate_roll = random.random()
 
-        # Корректировка шанса провала в зависимости от соответствия званий
-        fail_chance = 0.4 if actors_match_requirements else 0.6
+        # Шанс провала и множители выручки зависят от соответствия званий
+        fail_chance, fail_range, normal_range, success_range = forecast.revenue_factor_ranges(
+            model['matches_requirements'])
 
         # Провал: шанс зависит от соответствия званий
         if fate_roll < fail_chance:
-            self.logger.info(f"Спектакль {performance_id} оказался провальным!")
+            self.logger.info(f"Спектакль {performance_id} оказался провальным!",
+                             event="performance_outcome", performance_id=performance_id, outcome="failure")
             # При несоответствии званий - еще хуже результат
-            random_factor = random.uniform(0.4, 0.7) if actors_match_requirements else random.uniform(0.3, 0.5)
+            random_factor = random.uniform(*fail_range)
         # Норма: ~30% шанс с доходом 70-100% от ожидаемого
-        elif fate_roll < 0.9:
-            self.logger.info(f"Спектакль {performance_id} прошел в обычном режиме")
-            random_factor = random.uniform(0.7, 1.0)
+        elif fate_roll < forecast.SUCCESS_THRESHOLD:
+            self.logger.info(f"Спектакль {performance_id} прошел в обычном режиме",
+                             event="performance_outcome", performance_id=performance_id, outcome="normal")
+            random_factor = random.uniform(*normal_range)
         # Успех: 10% шанс с доходом 100-140% от ожидаемого (увеличен максимальный бонус)
         else:
-            self.logger.info(f"Спектакль {performance_id} прошел с большим успехом!")
-            random_factor = random.uniform(1.0, 1.4)
+            self.logger.info(f"Спектакль {performance_id} прошел с большим успехом!",
+                             event="performance_outcome", performance_id=performance_id, outcome="success")
+            random_factor = random.uniform(*success_range)
 
         # Итоговая выручка
-        total_revenue = int((base_revenue + actors_bonus) * random_factor)
+        total_revenue = int((model['base_revenue'] + model['actors_bonus']) * random_factor)
 
         # Учитываем непредвиденные расходы при расчете прибыли
         total_expenses = actual_budget + unexpected_expenses
         profit = total_revenue - total_expenses
 
-        # Обновление данных в БД - передаем полные расходы включая непредвиденные
-        self.db.update_performance_budget(performance_id, total_expenses)
-        self.db.complete_performance(performance_id, total_revenue)
-
-        # Обновление игровых данных - ИСПРАВЛЕННЫЙ РАСЧЕТ
-        game_data = self.db.get_game_data()
-        new_capital = game_data['capital'] + total_revenue + saved_budget - unexpected_expenses
-        current_year = game_data['current_year'] + 1
-        self.db.update_game_data(current_year, new_capital)
-
-        # Определение успешных актеров для награждения (только если прибыль положительная)
+        # Все изменения по итогам спектакля сохраняются одной транзакцией
         successful_actors = []
-        if profit > 0:
-            sorted_actors = sorted(actors,
-                                   key=lambda a: (rank_order.index(a['rank']),
-                                                  a['experience'],
-                                                  a['awards_count']),
-                                   reverse=True)
-
-            # Награждение лучших актеров
-            for i, actor in enumerate(sorted_actors[:3]):
-                self.db.award_actor(actor['actor_id'])
-                successful_actors.append(actor)
-
-                # Повышение звания самого успешного актера
-                if i == 0 and profit > total_expenses * 0.3:  # Снизили порог для повышения
-                    self.db.upgrade_actor_rank(actor['actor_id'])
+        with self.db.transaction() as tx:
+            # Обновление данных в БД - передаем полные расходы включая непредвиденные
+            self.db.update_performance_budget(performance_id, total_expenses)
+            self.db.complete_performance(performance_id, total_revenue)
+
+            # Обновление игровых данных - ИСПРАВЛЕННЫЙ РАСЧЕТ
+            game_data = self.db.get_game_data()
+            if not game_data:
+                tx.rollback()
+            else:
+                new_capital = game_data['capital'] + total_revenue + saved_budget - unexpected_expenses
+                current_year = game_data['current_year'] + 1
+                self.db.update_game_data(current_year, new_capital)
+
+                # Определение успешных актеров для награждения (только если прибыль положительная)
+                if profit > 0:
+                    sorted_actors = self._actors_by_merit(actors)
+
+                    # Награждение лучших актеров
+                    for i, actor in enumerate(sorted_actors[:3]):
+                        self.db.award_actor(actor['actor_id'])
+                        successful_actors.append(actor)
+
+                        # Повышение звания самого успешного актера
+                        if i == 0 and profit > total_expenses * forecast.RANK_UPGRADE_PROFIT_SHARE:
+                            self.db.upgrade_actor_rank(actor['actor_id'])
+
+        if tx.failed:
+            return False, "Не удалось сохранить результаты спектакля"
+
+        self.logger.metric("performance_result", performance_id=performance_id, revenue=total_revenue,
+                           expenses=total_expenses, profit=profit, saved_budget=saved_budget,
+                           actors=len(actors), awarded=len(successful_actors))
 
         # Формирование результатов
         return True, {
@@ -342,6 +654,88 @@ class TheaterController:
         """Удаление актера по его ID."""
         return self.db.delete_actor(actor_id)
 
+    def import_actors_csv(self, path):
+        """
+        Массовый импорт актеров из CSV-файла.
+        Файл читается потоково, строки с ошибками пропускаются и попадают в отчет.
+
+        Args:
+            path: Путь к CSV-файлу с заголовком (разделитель ',', ';' или табуляция)
+
+        Returns:
+            tuple: (успех операции (bool), сообщение (str),
+                    список отклоненных строк [(номер строки, причина)])
+        """
+        rejected = []
+        try:
+            with open(path, newline='', encoding='utf-8-sig') as csv_file:
+                try:
+                    dialect = csv.Sniffer().sniff(csv_file.readline(), delimiters=",;\t")
+                except csv.Error:
+                    dialect = csv.excel
+                csv_file.seek(0)
+                reader = csv.DictReader(csv_file, dialect=dialect)
+
+                header = [name.strip() for name in reader.fieldnames or []]
+                missing = [name for name in ACTOR_IMPORT_REQUIRED if name not in header]
+                if missing:
+                    return False, f"В файле нет обязательных столбцов: {', '.join(missing)}", rejected
+                reader.fieldnames = header
+
+                result = self.db.import_actors(self._parse_actor_rows(reader, rejected))
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            self.logger.error(f"Ошибка чтения файла импорта {path}: {str(e)}")
+            return False, f"Ошибка чтения файла: {str(e)}", rejected
+
+        if result is None:
+            return False, "Ошибка записи актеров в базу данных", rejected
+
+        inserted, updated = result
+        if rejected:
+            self.logger.warning(f"Импорт актеров: отклонено строк - {len(rejected)}")
+        return True, f"Добавлено: {inserted}, обновлено: {updated}, отклонено: {len(rejected)}", rejected
+
+    def _parse_actor_rows(self, reader, rejected):
+        """
+        Проверка строк CSV-файла импорта по тем же правилам, что и при вводе вручную.
+
+        Args:
+            reader: csv.DictReader файла импорта
+            rejected: Список, в который добавляются отклоненные строки
+
+        Yields:
+            tuple: (номер строки, фамилия, имя, отчество, звание, награды, опыт)
+        """
+        for row in reader:
+            line_no = reader.line_num
+            try:
+                values = {name: (row.get(name) or "").strip() for name in ACTOR_IMPORT_COLUMNS}
+
+                for name in ("last_name", "first_name", "patronymic"):
+                    text = values[name]
+                    if not text and name in ACTOR_IMPORT_REQUIRED:
+                        raise ValueError(f"не заполнено поле {name}")
+                    if text and not self.is_valid_text_input(text):
+                        raise ValueError(f"недопустимые символы в поле {name}")
+                    if len(text) > MAX_NAME_LENGTH:
+                        raise ValueError(f"поле {name} длиннее {MAX_NAME_LENGTH} символов")
+
+                rank = ActorRank.from_value(values["rank"]).value if values["rank"] else ActorRank.BEGINNER.value
+
+                counts = []
+                for name in ("awards_count", "experience"):
+                    if not values[name]:
+                        counts.append(0)
+                        continue
+                    if not values[name].isdigit() or int(values[name]) > MAX_COUNT_VALUE:
+                        raise ValueError(f"поле {name} должно быть неотрицательным целым числом")
+                    counts.append(int(values[name]))
+            except ValueError as e:
+                rejected.append((line_no, str(e)))
+                continue
+
+            yield (line_no, values["last_name"], values["first_name"], values["patronymic"], rank, *counts)
+
     def is_valid_text_input(self, text):
         """
         Проверка валидности текстового ввода.
@@ -349,6 +743,49 @@ class TheaterController:
         """
         return bool(re.match(r'^[а-яА-Яa-zA-Z0-9\s]+$', text))
 
+    def get_query_stats(self):
+        """Статистика времени выполнения методов и запросов к БД."""
+        return self.db.get_query_stats()
+
+    def reset_query_stats(self):
+        """Очистка статистики запросов к БД."""
+        self.db.query_stats.reset()
+
+    def set_slow_query_threshold(self, threshold_ms):
+        """Установка порога (мс), после которого запрос попадает в журнал медленных запросов."""
+        self.db.query_stats.set_slow_threshold(threshold_ms)
+
+    def query_action(self, name, budget=None):
+        """
+        Учет запросов к БД, выполненных в текущем потоке в рамках действия пользователя.
+
+        Args:
+            name: Название действия
+            budget: Допустимое число запросов (None - лимит, заданный set_query_budget)
+
+        Returns:
+            Контекстный менеджер, возвращающий ActionQueries
+        """
+        return self.db.query_stats.action(name, budget)
+
+    def set_query_budget(self, action, max_queries):
+        """Установка лимита числа запросов к БД для действия пользователя."""
+        self.db.query_stats.set_query_budget(action, max_queries)
+
+    def set_strict_query_budgets(self, strict):
+        """Включение ошибки QueryBudgetExceeded при превышении лимита запросов действием."""
+        self.db.query_stats.strict_budgets = strict
+
+    def cancel_queries(self, thread_ids=None):
+        """Прерывание выполняющихся запросов к БД (всех или только указанных потоков)."""
+        self.db.cancel_queries(thread_ids)
+
     def close(self):
         """Закрытие соединения с БД."""
+        self.stop_change_listener()
+        if self.async_runner is not None:
+            # Пул закрывается в цикле asyncio перед его остановкой
+            self.async_runner.stop(self.async_db.disconnect() if self.async_db is not None else None)
+            self.async_db = None
+            self.async_runner = None
         self.db.disconnect()
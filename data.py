@@ -4,10 +4,279 @@
 """
 import psycopg2
 from psycopg2 import sql, extensions
-from psycopg2.extras import DictCursor
+from psycopg2 import pool as pg_pool
+from psycopg2.extras import DictCursor, execute_values
+import copy
+import csv
 import enum
+import io
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
 from datetime import datetime
 from logger import Logger
+from migrations import MigrationRunner
+from query_stats import QueryStats
+from repository import TheaterRepository, TransactionState
+
+
+# Параметры пула соединений по умолчанию
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+# Интервал простоя (сек.), после которого соединение проверяется перед выдачей
+POOL_HEALTH_CHECK_INTERVAL = 30
+# Максимальное время ожидания свободного соединения (сек.)
+POOL_TIMEOUT = 10
+
+# Размер страницы при постраничной выборке и размер пакета при потоковом чтении
+PAGE_SIZE = 500
+STREAM_ITERSIZE = 2000
+# Число строк в одной порции COPY при массовом импорте
+IMPORT_CHUNK_SIZE = 10000
+
+# Допустимые столбцы сортировки актеров: ключ -> (выражение SQL, замена NULL для keyset-условия)
+ACTOR_SORT_COLUMNS = {
+    "actor_id": ("actor_id", None),
+    "last_name": ("last_name", None),
+    "first_name": ("first_name", None),
+    "patronymic": ("COALESCE(patronymic, '')", ""),
+    "rank": ("rank", None),
+    "experience": ("experience", None),
+    "awards_count": ("awards_count", None),
+}
+
+# Допустимые столбцы сортировки спектаклей: ключ -> выражение SQL
+PERFORMANCE_SORT_COLUMNS = {
+    "year": "p.year",
+    "title": "p.title",
+    "plot_title": "pl.title",
+    "budget": "p.budget",
+    "revenue": "p.revenue",
+    "profit": "(p.revenue - p.budget)",
+}
+
+# Столбцы выгрузки истории спектаклей с составами: имя -> выражение SQL
+PERFORMANCE_CAST_COLUMNS = (
+    ("performance_id", "p.performance_id"),
+    ("title", "p.title"),
+    ("plot_title", "pl.title"),
+    ("year", "p.year"),
+    ("budget", "p.budget"),
+    ("revenue", "p.revenue"),
+    ("profit", "p.revenue - p.budget"),
+    ("is_completed", "p.is_completed"),
+    ("actor_id", "a.actor_id"),
+    ("last_name", "a.last_name"),
+    ("first_name", "a.first_name"),
+    ("patronymic", "a.patronymic"),
+    ("rank", "a.rank::text"),
+    ("role", "ap.role"),
+    ("contract_cost", "ap.contract_cost"),
+)
+# Число строк в одном пакете при потоковой выгрузке
+EXPORT_BATCH_SIZE = 50000
+
+# Каталог тестовых данных и порядок загрузки таблиц из фикстур (с учетом внешних ключей)
+SAMPLE_FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "sample")
+FIXTURE_TABLES = ("game_data", "actors", "plots", "performances", "actor_performances")
+# Таблицы с автоинкрементными ключами: таблица -> столбец ключа
+FIXTURE_SERIAL_COLUMNS = {
+    "actors": "actor_id",
+    "plots": "plot_id",
+    "performances": "performance_id",
+}
+
+# Суффиксы имен шаблонной БД для быстрого сброса и временной копии при замене
+TEMPLATE_SUFFIX = "_template"
+CLONE_SUFFIX = "_reset"
+
+# Ключи кэша справочных данных
+CACHE_ACTORS = "actors"
+CACHE_PLOTS = "plots"
+CACHE_GAME_DATA = "game_data"
+CACHE_KEYS = (CACHE_ACTORS, CACHE_PLOTS, CACHE_GAME_DATA)
+
+# Канал уведомлений PostgreSQL об изменении данных и отслеживаемые таблицы
+CHANGE_CHANNEL = "theater_changes"
+NOTIFY_TABLES = ("actors", "plots", "performances", "game_data")
+# Соответствие таблиц ключам кэша
+TABLE_CACHE_KEYS = {
+    "actors": (CACHE_ACTORS,),
+    "plots": (CACHE_PLOTS,),
+    "game_data": (CACHE_GAME_DATA,),
+}
+
+
+def _uses_connection(on_error):
+    """
+    Декоратор методов DatabaseManager, работающих с БД.
+    На время вызова закрепляет за текущим потоком соединение и курсор
+    (из пула или общее соединение) и освобождает их после завершения.
+
+    Args:
+        on_error: Значение, возвращаемое, если соединение получить не удалось
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            # Время вызова учитывается вместе с ожиданием соединения
+            with self.query_stats.track(method.__name__):
+                try:
+                    self._enter_operation()
+                except psycopg2.Error as e:
+                    self.logger.error(f"Не удалось получить соединение с БД: {str(e)}")
+                    return copy.copy(on_error)
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    self._exit_operation()
+        return wrapper
+    return decorator
+
+
+def _invalidates(*keys):
+    """
+    Декоратор изменяющих методов DatabaseManager.
+    После вызова сбрасывает указанные записи кэша.
+
+    Args:
+        keys: Ключи кэша, которые затрагивает метод
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                self._invalidate(keys)
+        return wrapper
+    return decorator
+
+
+def copy_row(row):
+    """
+    Копия строки из кэша: кэшированные строки общие для всех потоков
+    и не должны изменяться вызывающим кодом.
+    """
+    return {key: list(value) if isinstance(value, list) else value for key, value in row.items()}
+
+
+class QueryCache:
+    """
+    Кэш результатов запросов в памяти процесса.
+    Каждая запись хранит версию ключа на момент загрузки: сброс увеличивает
+    версию, поэтому результат загрузки, начатой до сброса, не сохраняется.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, loader):
+        """
+        Получение значения из кэша или загрузка его через loader.
+        Результат None (ошибка загрузки) не кэшируется.
+        """
+        found, value, version = self.lookup(key)
+        if found:
+            return value
+
+        value = loader()
+        self.store(key, version, value)
+        return value
+
+    def lookup(self, key):
+        """
+        Поиск актуальной записи в кэше.
+
+        Returns:
+            tuple: (найдена ли запись, значение, текущая версия ключа)
+        """
+        with self._lock:
+            version = self._versions.get(key, 0)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return True, entry[1], version
+            self.misses += 1
+            return False, None, version
+
+    def store(self, key, version, value):
+        """Сохранение загруженного значения, если ключ не сбрасывался после lookup()."""
+        with self._lock:
+            if value is not None and self._versions.get(key, 0) == version:
+                self._entries[key] = (version, value)
+
+    def invalidate(self, *keys):
+        """Сброс записей кэша по ключам."""
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Сброс всех записей кэша."""
+        self.invalidate(*list(self._versions.keys() | self._entries.keys()))
+
+    def stats(self):
+        """
+        Статистика использования кэша.
+
+        Returns:
+            dict: Число попаданий, промахов и записей
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries)
+            }
+
+
+class OperationGate:
+    """
+    Допуск операций с БД. Обычные операции выполняются одновременно;
+    исключительная операция (замена БД) ждет завершения выполняющихся
+    и до своего окончания не допускает новых.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._active = 0
+        self._exclusive = False
+
+    def enter(self):
+        """Начало обычной операции (ожидает окончания исключительной)."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._exclusive)
+            self._active += 1
+
+    def leave(self):
+        """Окончание обычной операции."""
+        with self._condition:
+            self._active -= 1
+            if not self._active:
+                self._condition.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        """Исключительная операция: новые операции ждут, выполняющиеся завершаются."""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._exclusive)
+            self._exclusive = True
+            self._condition.wait_for(lambda: not self._active)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._exclusive = False
+                self._condition.notify_all()
 
 
 class ActorRank(enum.Enum):
@@ -51,19 +320,52 @@ class ActorRank(enum.Enum):
         return -1 if idx1 < idx2 else 1
 
 
-class DatabaseManager:
+class DatabaseManager(TheaterRepository):
     """
     Менеджер базы данных театра.
     Отвечает за взаимодействие с PostgreSQL, выполнение запросов
-    и преобразование данных.
+    и преобразование данных. Реализация хранилища TheaterRepository.
     """
 
     def __init__(self):
         """Инициализация менеджера БД."""
         self.logger = Logger()
         self.connection_params = None
-        self.connection = None
-        self.cursor = None
+        self.pool_params = None
+        self.pool = None
+        self._connection = None
+        self._cursor = None
+        # Состояние текущей операции для каждого потока (соединение, курсор, вложенность)
+        self._local = threading.local()
+        # Блокировка общего соединения в режиме без пула
+        self._lock = threading.RLock()
+        # Допуск операций в обоих режимах: замена БД из шаблона ждет их завершения
+        self._gate = OperationGate()
+        self._pool_slots = None
+        self._last_used = {}
+        self.cache = QueryCache()
+        # Статистика времени выполнения методов и запросов
+        self.query_stats = QueryStats()
+        # Класс курсоров рабочих операций (подкласс DictCursor; по умолчанию измеряет время запросов)
+        self.cursor_factory = self.query_stats.cursor_class()
+        self._stream_ids = itertools.count(1)
+        # Соединения, занятые операциями, по идентификатору потока
+        self._active_connections = {}
+        # PID серверных процессов открытых собственных соединений (все и по id соединения)
+        self._own_backends = set()
+        self._backend_pids = {}
+
+    @property
+    def connection(self):
+        """Соединение, закрепленное за текущим потоком (или общее соединение)."""
+        connection = getattr(self._local, 'connection', None)
+        return connection if connection is not None else self._connection
+
+    @property
+    def cursor(self):
+        """Курсор, закрепленный за текущим потоком (или общий курсор)."""
+        cursor = getattr(self._local, 'cursor', None)
+        return cursor if cursor is not None else self._cursor
 
     def set_connection_params(self, dbname, user, password, host, port):
         """Установка параметров подключения к базе данных."""
@@ -76,9 +378,32 @@ class DatabaseManager:
         }
         self.logger.info(f"Установлены параметры подключения: {dbname}@{host}:{port}")
 
+    def set_pool_params(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                        health_check_interval=POOL_HEALTH_CHECK_INTERVAL, timeout=POOL_TIMEOUT):
+        """
+        Включение режима пула соединений. Применяется при следующем вызове connect().
+
+        Args:
+            min_size: Минимальное число открытых соединений
+            max_size: Максимальное число соединений
+            health_check_interval: Время простоя (сек.), после которого соединение проверяется
+            timeout: Время ожидания свободного соединения (сек.)
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Некорректные размеры пула соединений")
+
+        self.pool_params = {
+            "min_size": min_size,
+            "max_size": max_size,
+            "health_check_interval": health_check_interval,
+            "timeout": timeout
+        }
+        self.logger.info(f"Установлены параметры пула соединений: {min_size}-{max_size}")
+
     def connect(self):
         """
         Подключение к базе данных с использованием установленных параметров.
+        Если заданы параметры пула, создается пул соединений.
 
         Returns:
             bool: Успешность подключения
@@ -87,15 +412,267 @@ class DatabaseManager:
             self.logger.error("Параметры подключения не установлены")
             return False
 
+        # Кэш мог быть заполнен данными другой БД
+        self.cache.clear()
+
         try:
-            self.connection = psycopg2.connect(**self.connection_params)
-            self.cursor = self.connection.cursor(cursor_factory=DictCursor)
+            if self.pool_params:
+                self._close_pool()
+                self.pool = pg_pool.ThreadedConnectionPool(
+                    self.pool_params["min_size"], self.pool_params["max_size"], **self.connection_params)
+                self._pool_slots = threading.BoundedSemaphore(self.pool_params["max_size"])
+                self.logger.info(f"Пул соединений с БД {self.connection_params['dbname']} создан "
+                                 f"({self.pool_params['min_size']}-{self.pool_params['max_size']})")
+                return True
+
+            self._connection = psycopg2.connect(**self.connection_params)
+            self._register_backend(self._connection)
+            self._cursor = self._connection.cursor(cursor_factory=self.cursor_factory)
             self.logger.info(f"Подключение к БД {self.connection_params['dbname']} успешно")
             return True
         except psycopg2.Error as e:
             self.logger.error(f"Ошибка подключения к БД: {str(e)}")
             return False
 
+    def _enter_operation(self):
+        """
+        Закрепление соединения и курсора за текущим потоком на время операции.
+        Вложенные вызовы используют уже закрепленное соединение.
+        """
+        local = self._local
+        depth = getattr(local, 'depth', 0)
+        if depth > 0:
+            local.depth = depth + 1
+            return
+
+        self._gate.enter()
+        if self.pool is None:
+            # Без пула все потоки по очереди работают с общим соединением
+            self._lock.acquire()
+            local.connection, local.cursor = self._connection, self._cursor
+        else:
+            try:
+                connection = self._acquire_connection()
+            except BaseException:
+                self._gate.leave()
+                raise
+            try:
+                cursor = connection.cursor(cursor_factory=self.cursor_factory)
+            except BaseException:
+                # Соединение и место в пуле не должны остаться занятыми
+                self._release_connection(connection)
+                self._gate.leave()
+                raise
+            local.connection, local.cursor = connection, cursor
+        local.depth = 1
+        if local.connection is not None:
+            self._active_connections[threading.get_ident()] = local.connection
+
+    def _exit_operation(self):
+        """Освобождение соединения и курсора после завершения операции."""
+        local = self._local
+        local.depth -= 1
+        if local.depth > 0:
+            return
+
+        connection, cursor = local.connection, local.cursor
+        local.connection = local.cursor = None
+        self._active_connections.pop(threading.get_ident(), None)
+
+        try:
+            if self.pool is None:
+                self._lock.release()
+            else:
+                cursor.close()
+                self._release_connection(connection)
+        finally:
+            self._gate.leave()
+
+    def cancel_queries(self, thread_ids=None):
+        """
+        Прерывание запросов, выполняющихся сейчас в других потоках.
+        Прерванные операции завершаются ошибкой и откатывают свои изменения.
+
+        Args:
+            thread_ids: Идентификаторы потоков, запросы которых прерываются (по умолчанию - все)
+        """
+        for thread_id, connection in list(self._active_connections.items()):
+            if thread_ids is not None and thread_id not in thread_ids:
+                continue
+            try:
+                connection.cancel()
+            except psycopg2.Error as e:
+                self.logger.error(f"Ошибка отмены запроса: {str(e)}")
+
+    @contextmanager
+    def transaction(self):
+        """
+        Единица работы: все операции внутри блока выполняются на одном соединении
+        и фиксируются одним COMMIT при выходе. Если любой шаг завершился ошибкой
+        или была вызвана state.rollback(), вся транзакция откатывается.
+        Вложенные блоки присоединяются к внешней транзакции.
+
+        Yields:
+            TransactionState: Состояние транзакции
+        """
+        local = self._local
+        current = getattr(local, 'transaction', None)
+        if current is not None:
+            yield current
+            return
+
+        state = TransactionState()
+        local.transaction = state
+        try:
+            self._enter_operation()
+        except psycopg2.Error as e:
+            # Без соединения шаги внутри блока завершатся ошибкой и ничего не зафиксируют
+            self.logger.error(f"Не удалось получить соединение с БД: {str(e)}")
+            state.failed = True
+        if state.failed:
+            try:
+                yield state
+            finally:
+                local.transaction = None
+            return
+
+        try:
+            yield state
+        except BaseException:
+            state.failed = True
+            raise
+        finally:
+            local.transaction = None
+            try:
+                if state.failed:
+                    self.connection.rollback()
+                    self.logger.error("Транзакция отменена")
+                else:
+                    self.connection.commit()
+                    state.committed = True
+            except psycopg2.Error as e:
+                state.failed = True
+                self.connection.rollback()
+                self.logger.error(f"Ошибка фиксации транзакции: {str(e)}")
+            finally:
+                self._exit_operation()
+                # Повторный сброс после фиксации: другие потоки могли загрузить старые данные
+                self.cache.invalidate(*state.invalidated)
+
+    def _commit(self):
+        """Фиксация изменений, если операция не входит в единицу работы."""
+        if getattr(self._local, 'transaction', None) is None:
+            self.connection.commit()
+
+    def _rollback(self):
+        """Откат изменений; внутри единицы работы помечает ее как неудачную."""
+        self.connection.rollback()
+        state = getattr(self._local, 'transaction', None)
+        if state is not None:
+            state.failed = True
+
+    def _invalidate(self, keys):
+        """Сброс записей кэша после изменения данных."""
+        self.cache.invalidate(*keys)
+        state = getattr(self._local, 'transaction', None)
+        if state is not None:
+            state.invalidated.update(keys)
+
+    def _read_through(self, key, loader):
+        """
+        Чтение через кэш. Внутри транзакции кэш не используется,
+        чтобы не сохранить в нем незафиксированные данные.
+        """
+        if getattr(self._local, 'transaction', None) is not None:
+            return loader()
+        return self.cache.get(key, loader)
+
+    def get_query_stats(self):
+        """
+        Статистика времени выполнения методов и запросов.
+
+        Returns:
+            dict: {"methods": [...], "queries": [...]} - сводки гистограмм,
+                  {"actions": [...]} - отчеты о последних действиях (см. QueryStats)
+        """
+        return {"methods": self.query_stats.method_stats(), "queries": self.query_stats.query_stats(),
+                "actions": self.query_stats.action_stats()}
+
+    def get_cache_stats(self):
+        """
+        Статистика кэша справочных данных.
+
+        Returns:
+            dict: Число попаданий, промахов и записей
+        """
+        return self.cache.stats()
+
+    def _acquire_connection(self):
+        """
+        Получение исправного соединения из пула.
+
+        Returns:
+            connection: Соединение psycopg2
+        """
+        if not self._pool_slots.acquire(timeout=self.pool_params["timeout"]):
+            raise pg_pool.PoolError("Превышено время ожидания свободного соединения")
+
+        try:
+            # Неисправные соединения закрываются и заменяются новыми
+            for _ in range(self.pool_params["max_size"] + 1):
+                connection = self.pool.getconn()
+                if self._is_connection_alive(connection):
+                    self._register_backend(connection)
+                    return connection
+                self.logger.warning("Обнаружено неисправное соединение в пуле, оно будет закрыто")
+                self._forget_backend(connection)
+                self.pool.putconn(connection, close=True)
+            raise pg_pool.PoolError("Не удалось получить исправное соединение из пула")
+        except BaseException:
+            self._pool_slots.release()
+            raise
+
+    def _release_connection(self, connection):
+        """Возврат соединения в пул."""
+        try:
+            self._last_used[id(connection)] = time.monotonic()
+            # Пул сам откатывает незавершенную транзакцию при возврате
+            # и закрывает соединения сверх минимального размера
+            self.pool.putconn(connection, close=connection.closed != 0)
+            if connection.closed:
+                self._forget_backend(connection)
+        finally:
+            self._pool_slots.release()
+
+    def _is_connection_alive(self, connection):
+        """
+        Проверка исправности соединения.
+        Запрос к серверу выполняется только после длительного простоя.
+        """
+        if connection.closed:
+            return False
+
+        last_used = self._last_used.get(id(connection))
+        if last_used is not None and time.monotonic() - last_used < self.pool_params["health_check_interval"]:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _close_pool(self):
+        """Закрытие всех соединений пула."""
+        if self.pool is not None:
+            self.pool.closeall()
+            self.pool = None
+            self._last_used.clear()
+            self._backend_pids.clear()
+            self._own_backends.clear()
+
     def connect_to_postgres(self):
         """
         Подключение к системной базе данных postgres для создания новой БД.
@@ -153,14 +730,254 @@ class DatabaseManager:
             self.logger.error(f"Ошибка создания БД: {str(e)}")
             return False
 
+    def template_name(self):
+        """Имя шаблонной БД для быстрого сброса."""
+        return f"{self.connection_params['dbname']}{TEMPLATE_SUFFIX}"
+
+    def template_exists(self):
+        """
+        Проверка наличия шаблонной БД.
+
+        Returns:
+            bool: Существует ли шаблон
+        """
+        conn, cursor = self.connect_to_postgres()
+        if not conn:
+            return False
+        try:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.template_name(),))
+            return cursor.fetchone() is not None
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка проверки шаблонной БД: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
+    def template_is_current(self):
+        """
+        Проверка, что шаблонная БД существует и ее схема обновлена до последней миграции.
+        К шаблону нельзя подключиться, поэтому версия схемы хранится в комментарии к нему.
+
+        Returns:
+            bool: Можно ли сбрасывать БД из шаблона без его пересоздания
+        """
+        conn, cursor = self.connect_to_postgres()
+        if not conn:
+            return False
+        try:
+            cursor.execute("SELECT shobj_description(oid, 'pg_database') FROM pg_database WHERE datname = %s",
+                           (self.template_name(),))
+            row = cursor.fetchone()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка проверки шаблонной БД: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
+        latest = MigrationRunner(self.connection_params).latest_version
+        return row is not None and row[0] == str(latest)
+
+    def build_template(self, fixture_dir=None):
+        """
+        Создание (пересоздание) шаблонной БД: схема и начальные данные фикстуры.
+        К шаблону запрещены подключения, чтобы ничто не мешало копированию.
+
+        Args:
+            fixture_dir: Каталог фикстуры с начальными данными (по умолчанию - тестовые данные)
+
+        Returns:
+            bool: Успешность создания шаблона
+        """
+        conn, cursor = self.connect_to_postgres()
+        if not conn:
+            return False
+
+        template = sql.Identifier(self.template_name())
+        try:
+            cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", (self.template_name(),))
+            if cursor.fetchone() is not None:
+                cursor.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false").format(template))
+                cursor.execute(sql.SQL("DROP DATABASE {}").format(template))
+            cursor.execute(sql.SQL("CREATE DATABASE {}").format(template))
+
+            # Схема и данные создаются тем же кодом, что и для основной БД
+            template_db = DatabaseManager()
+            params = self.connection_params
+            template_db.set_connection_params(self.template_name(), params["user"], params["password"],
+                                              params["host"], params["port"])
+            try:
+                success = template_db.connect() and template_db.create_schema() and \
+                    template_db.migrate() and template_db.init_sample_data(fixture_dir)
+            finally:
+                template_db.disconnect()
+            if not success:
+                cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(template))
+                return False
+
+            cursor.execute(sql.SQL("COMMENT ON DATABASE {} IS %s").format(template),
+                           (str(MigrationRunner(template_db.connection_params).latest_version),))
+            cursor.execute(sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false")
+                           .format(template))
+            self.logger.info(f"Шаблонная БД {self.template_name()} создана")
+            return True
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка создания шаблонной БД: {str(e)}")
+            return False
+        finally:
+            conn.close()
+
+    def reset_from_template(self):
+        """
+        Быстрый сброс БД заменой на копию шаблона (время не зависит от объема данных).
+        Копия создается заранее, поэтому при ошибке копирования текущая БД не затрагивается.
+        Шаблон со схемой старше последней миграции предварительно пересоздается.
+        Замена начинается после завершения выполняющихся операций этого клиента;
+        новые операции ждут ее окончания. Соединения других клиентов с БД
+        принудительно закрываются. Если шаблона нет, выполняется обычный сброс.
+
+        Returns:
+            bool: Успешность сброса
+        """
+        if getattr(self._local, 'depth', 0) > 0:
+            # Ожидание завершения операций включало бы операцию самого вызывающего потока
+            self.logger.error("Сброс БД из шаблона нельзя выполнять внутри операции с БД")
+            return False
+
+        if not self.template_exists():
+            self.logger.warning("Шаблонная БД не найдена, выполняется обычный сброс")
+            return self.reset_database()
+
+        # Копия устаревшего шаблона вернула бы схему без новых миграций
+        if not self.template_is_current():
+            self.logger.warning("Схема шаблонной БД устарела, шаблон пересоздается")
+            if not self.build_template():
+                return False
+
+        conn, cursor = self.connect_to_postgres()
+        if not conn:
+            return False
+
+        dbname = self.connection_params["dbname"]
+        clone = f"{dbname}{CLONE_SUFFIX}"
+        try:
+            cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(clone)))
+            cursor.execute(sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(clone), sql.Identifier(self.template_name())))
+        except psycopg2.Error as e:
+            conn.close()
+            self.logger.error(f"Ошибка копирования шаблонной БД: {str(e)}")
+            return False
+
+        # На время замены БД остальные операции этого клиента ожидают
+        with self._gate.exclusive():
+            self._close_connections()
+            try:
+                cursor.execute("""
+                    SELECT pg_terminate_backend(pid) FROM pg_stat_activity
+                    WHERE datname = %s AND pid <> pg_backend_pid()
+                """, (dbname,))
+                cursor.execute(sql.SQL("DROP DATABASE {}").format(sql.Identifier(dbname)))
+                cursor.execute(sql.SQL("ALTER DATABASE {} RENAME TO {}").format(
+                    sql.Identifier(clone), sql.Identifier(dbname)))
+                self.logger.info(f"База данных {dbname} сброшена из шаблона")
+                success = True
+            except psycopg2.Error as e:
+                self.logger.error(f"Ошибка сброса БД из шаблона: {str(e)}")
+                success = False
+            finally:
+                conn.close()
+                # Повторное подключение (кэш при этом очищается)
+                success = self.connect() and success
+        return success
+
+    def _close_connections(self):
+        """Закрытие рабочих соединений с БД."""
+        if self.pool is not None:
+            self._close_pool()
+            return
+        if self._cursor:
+            self._cursor.close()
+        if self._connection:
+            self._connection.close()
+            self._forget_backend(self._connection)
+        self._connection = self._cursor = None
+
+    @property
+    def own_backends(self):
+        """
+        PID серверных процессов открытых соединений этого клиента
+        (уведомления от них не считаются изменениями других клиентов).
+        Множество обновляется на месте при открытии и закрытии соединений.
+        """
+        return self._own_backends
+
+    def _register_backend(self, connection):
+        """Запоминание PID серверного процесса соединения."""
+        pid = connection.get_backend_pid()
+        self._backend_pids[id(connection)] = pid
+        self._own_backends.add(pid)
+
+    def _forget_backend(self, connection):
+        """Удаление PID закрытого соединения."""
+        pid = self._backend_pids.pop(id(connection), None)
+        if pid is not None:
+            self._own_backends.discard(pid)
+        self._last_used.pop(id(connection), None)
+
+    def invalidate_tables(self, tables):
+        """
+        Сброс кэша по таблицам, измененным другими клиентами
+        (вызывается слушателем изменений, см. change_listener.ChangeListener).
+        """
+        keys = [key for table in tables for key in TABLE_CACHE_KEYS.get(table, ())]
+        if keys:
+            self.cache.invalidate(*keys)
+        self.logger.info(f"Данные изменены другим клиентом: {', '.join(tables)}")
+
     def disconnect(self):
-        """Закрытие соединения с базой данных."""
-        if self.cursor:
-            self.cursor.close()
-        if self.connection:
-            self.connection.close()
+        """Закрытие соединения с базой данных (или пула соединений)."""
+        if self.pool is not None:
+            self._close_pool()
+            self.logger.info("Пул соединений с БД закрыт")
+            return
+        if self._cursor:
+            self._cursor.close()
+        if self._connection:
+            self._connection.close()
+            self._forget_backend(self._connection)
             self.logger.info("Соединение с БД закрыто")
 
+    @_uses_connection(on_error=False)
+    def schema_exists(self):
+        """
+        Проверка наличия схемы БД (таблицы game_data).
+
+        Returns:
+            bool: Существует ли схема
+        """
+        try:
+            self.cursor.execute("SELECT 1 FROM information_schema.tables WHERE table_name = 'game_data'")
+            return self.cursor.fetchone() is not None
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка проверки схемы БД: {str(e)}")
+            return False
+
+    def migrate(self, target=None):
+        """
+        Применение миграций схемы (см. модуль migrations).
+
+        Args:
+            target: Версия, до которой выполняется обновление (по умолчанию - последняя)
+
+        Returns:
+            bool: Успешность применения
+        """
+        success, message = MigrationRunner(self.connection_params).upgrade(target)
+        self.logger.info(f"Миграции схемы БД: {message}")
+        return success
+
+    @_invalidates(*CACHE_KEYS)
+    @_uses_connection(on_error=False)
     def create_schema(self):
         """
         Создание схемы базы данных с таблицами и типами данных.
@@ -249,163 +1066,180 @@ class DatabaseManager:
                 WHERE NOT EXISTS (SELECT 1 FROM game_data WHERE id = 1);
             """)
 
-            self.connection.commit()
+            # Триггеры уведомлений об изменениях для других клиентов
+            self._create_change_triggers()
+
+            self._commit()
             self.logger.info("Схема БД успешно создана")
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка создания схемы БД: {str(e)}")
             return False
 
-    def init_sample_data(self):
+    def _create_change_triggers(self):
+        """Создание триггеров NOTIFY на отслеживаемых таблицах (без фиксации)."""
+        self.cursor.execute(sql.SQL("""
+            CREATE OR REPLACE FUNCTION notify_theater_change() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify({}, TG_TABLE_NAME);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """).format(sql.Literal(CHANGE_CHANNEL)))
+
+        # Триггеры уровня оператора: одно уведомление на запрос, а не на каждую строку
+        for table in NOTIFY_TABLES:
+            self.cursor.execute(sql.SQL("""
+                DROP TRIGGER IF EXISTS {trigger} ON {table};
+                CREATE TRIGGER {trigger}
+                AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_theater_change();
+            """).format(trigger=sql.Identifier(f"{table}_notify_change"), table=sql.Identifier(table)))
+
+    @_uses_connection(on_error=False)
+    def ensure_change_triggers(self):
         """
-        Инициализация БД тестовыми данными.
+        Создание триггеров уведомлений в существующей БД, если их еще нет.
 
         Returns:
-            bool: Успешность инициализации
+            bool: Успешность проверки/создания
         """
         try:
-            # Проверка наличия записи в game_data
-            self.cursor.execute("SELECT COUNT(*) FROM game_data")
-            if self.cursor.fetchone()[0] == 0:
-                self.cursor.execute("""
-                    INSERT INTO game_data (id, current_year, capital)
-                    VALUES (1, 2025, 1000000)
-                """)
+            self.cursor.execute("""
+                SELECT COUNT(*) FROM pg_trigger
+                WHERE tgname = ANY(%s) AND NOT tgisinternal
+            """, ([f"{table}_notify_change" for table in NOTIFY_TABLES],))
+            if self.cursor.fetchone()[0] < len(NOTIFY_TABLES):
+                self._create_change_triggers()
+                self._commit()
+                self.logger.info("Созданы триггеры уведомлений об изменениях")
+            return True
+        except psycopg2.Error as e:
+            self._rollback()
+            self.logger.error(f"Ошибка создания триггеров уведомлений: {str(e)}")
+            return False
 
-            # Добавление тестовых актеров
-            actors = [
-                ('Иванов', 'Иван', 'Иванович', 'Ведущий', 3, 5),
-                ('Петров', 'Петр', 'Петрович', 'Заслуженный', 5, 10),
-                ('Сидорова', 'Анна', 'Сергеевна', 'Народный', 8, 15),
-                ('Смирнов', 'Алексей', 'Игоревич', 'Мастер', 4, 8),
-                ('Козлова', 'Екатерина', 'Дмитриевна', 'Постоянный', 2, 4),
-                ('Морозов', 'Дмитрий', 'Александрович', 'Начинающий', 0, 2),
-                ('Новикова', 'Ольга', 'Владимировна', 'Постоянный', 1, 3),
-                ('Соколов', 'Владимир', 'Михайлович', 'Ведущий', 3, 7),
-                ('Попова', 'Мария', 'Андреевна', 'Мастер', 5, 9),
-                ('Лебедев', 'Сергей', 'Николаевич', 'Заслуженный', 6, 12)
-            ]
-
-            for actor in actors:
-                self.cursor.execute("""
-                    INSERT INTO actors (last_name, first_name, patronymic, rank, awards_count, experience)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (last_name, first_name, patronymic) DO NOTHING
-                """, actor)
-
-            # Добавление тестовых сюжетов
-            plots = [
-                ('Ромео и Джульетта', 500000, 350000, 6, 8, ['Ведущий', 'Мастер']),
-                ('Гамлет', 800000, 500000, 8, 9, ['Мастер', 'Заслуженный']),
-                ('Чайка', 400000, 250000, 5, 7, ['Постоянный', 'Ведущий']),
-                ('Вишневый сад', 600000, 400000, 7, 8, ['Ведущий', 'Мастер']),
-                ('Три сестры', 550000, 350000, 6, 7, ['Постоянный', 'Ведущий']),
-                ('Отелло', 700000, 450000, 7, 9, ['Мастер', 'Заслуженный']),
-                ('Ревизор', 450000, 300000, 6, 7, ['Ведущий']),
-                ('Горе от ума', 500000, 350000, 7, 8, ['Ведущий', 'Мастер']),
-                ('Дядя Ваня', 400000, 250000, 5, 6, ['Постоянный']),
-                ('Маскарад', 650000, 400000, 8, 8, ['Мастер'])
-            ]
-
-            for plot in plots:
-                self.cursor.execute("""
-                    INSERT INTO plots (title, minimum_budget, production_cost, roles_count, demand, required_ranks)
-                    VALUES (%s, %s, %s, %s, %s, %s::actor_rank[])
-                    ON CONFLICT (title) DO NOTHING
-                """, plot)
-
-            # Добавление тестовых постановок
-            past_performances = [
-                ('Ромео и Джульетта в современном мире', 1, 2022, 600000, 950000, True),
-                ('Гамлет: Перезагрузка', 2, 2023, 850000, 1200000, True),
-                ('Чайка над морем', 3, 2024, 500000, 780000, True)
-            ]
-
-            for perf in past_performances:
-                self.cursor.execute("""
-                    INSERT INTO performances (title, plot_id, year, budget, revenue, is_completed)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (year) DO NOTHING
-                """, perf)
-
-            # Добавление связей актеров с постановками
-            actor_perfs = [
-                (1, 1, 'Ромео', 100000),
-                (5, 1, 'Джульетта', 90000),
-                (8, 1, 'Меркуцио', 80000),
-                (4, 1, 'Тибальт', 70000),
-                (7, 1, 'Кормилица', 60000),
-                (6, 1, 'Бенволио', 50000),
-
-                (2, 2, 'Гамлет', 150000),
-                (9, 2, 'Офелия', 120000),
-                (8, 2, 'Клавдий', 110000),
-                (7, 2, 'Гертруда', 100000),
-                (4, 2, 'Полоний', 90000),
-                (6, 2, 'Горацио', 80000),
-                (1, 2, 'Лаэрт', 80000),
-                (5, 2, 'Розенкранц', 70000),
-
-                (3, 3, 'Нина Заречная', 130000),
-                (2, 3, 'Константин Треплев', 120000),
-                (9, 3, 'Ирина Аркадина', 110000),
-                (4, 3, 'Борис Тригорин', 100000),
-                (7, 3, 'Маша', 90000)
-            ]
-
-            for ap in actor_perfs:
-                self.cursor.execute("""
-                    INSERT INTO actor_performances (actor_id, performance_id, role, contract_cost)
-                    VALUES (%s, %s, %s, %s)
-                    ON CONFLICT (actor_id, performance_id) DO NOTHING
-                """, ap)
+    @_invalidates(*CACHE_KEYS)
+    @_uses_connection(on_error=False)
+    def init_sample_data(self, fixture_dir=None):
+        """
+        Инициализация БД данными из набора CSV-файлов (фикстуры).
+        Каждая таблица загружается через COPY во временную таблицу и переносится
+        одним запросом; уже существующие записи пропускаются. Все таблицы
+        загружаются в одной транзакции.
 
-            self.connection.commit()
-            self.logger.info("Тестовые данные успешно добавлены")
+        Args:
+            fixture_dir: Каталог с файлами <таблица>.csv (по умолчанию - тестовые данные)
+
+        Returns:
+            bool: Успешность инициализации
+        """
+        fixture_dir = fixture_dir or SAMPLE_FIXTURE_DIR
+        try:
+            self._load_fixtures(fixture_dir)
+            self._commit()
+            self.logger.info(f"Тестовые данные успешно добавлены из {fixture_dir}")
             return True
-        except psycopg2.Error as e:
-            self.connection.rollback()
+        except (psycopg2.Error, OSError, ValueError) as e:
+            self._rollback()
             self.logger.error(f"Ошибка добавления тестовых данных: {str(e)}")
             return False
 
-    def reset_database(self):
+    def _load_fixtures(self, fixture_dir):
+        """
+        Загрузка всех таблиц фикстуры без фиксации транзакции.
+
+        Args:
+            fixture_dir: Каталог с файлами <таблица>.csv
+        """
+        for table in FIXTURE_TABLES:
+            path = os.path.join(fixture_dir, f"{table}.csv")
+            if os.path.exists(path):
+                self._load_fixture_table(table, path)
+
+        # Начальные игровые данные, если фикстура их не содержит
+        self.cursor.execute("""
+            INSERT INTO game_data (id, current_year, capital)
+            VALUES (1, 2025, 1000000)
+            ON CONFLICT (id) DO NOTHING
+        """)
+
+        # Синхронизация последовательностей, если идентификаторы заданы в фикстуре явно
+        for table, id_column in FIXTURE_SERIAL_COLUMNS.items():
+            self.cursor.execute(sql.SQL("""
+                SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({id_column}), 0) + 1, false)
+                FROM {table}
+            """).format(id_column=sql.Identifier(id_column), table=sql.Identifier(table)),
+                (table, id_column))
+
+    def _load_fixture_table(self, table, path):
+        """
+        Загрузка одного CSV-файла фикстуры в таблицу.
+        Столбцы определяются заголовком файла.
+
+        Args:
+            table: Имя таблицы из FIXTURE_TABLES
+            path: Путь к CSV-файлу
+        """
+        with open(path, newline="", encoding="utf-8") as fixture_file:
+            columns = next(csv.reader(fixture_file), None)
+            if not columns:
+                raise ValueError(f"Файл фикстуры {path} не содержит заголовка")
+            fixture_file.seek(0)
+
+            staging = sql.Identifier(f"{table}_fixture")
+            column_list = sql.SQL(", ").join(sql.Identifier(column.strip()) for column in columns)
+
+            # Временная таблица с типами столбцов целевой таблицы, но без ограничений и значений по умолчанию
+            self.cursor.execute(sql.SQL("DROP TABLE IF EXISTS {staging}").format(staging=staging))
+            self.cursor.execute(sql.SQL("""
+                CREATE TEMP TABLE {staging} ON COMMIT DROP AS
+                SELECT {columns} FROM {table} WITH NO DATA
+            """).format(staging=staging, columns=column_list, table=sql.Identifier(table)))
+
+            self.cursor.copy_expert(sql.SQL("COPY {staging} FROM STDIN WITH (FORMAT csv, HEADER)")
+                                    .format(staging=staging).as_string(self.connection), fixture_file)
+
+            self.cursor.execute(sql.SQL("""
+                INSERT INTO {table} ({columns})
+                SELECT {columns} FROM {staging}
+                ON CONFLICT DO NOTHING
+            """).format(table=sql.Identifier(table), columns=column_list, staging=staging))
+
+    @_invalidates(*CACHE_KEYS)
+    @_uses_connection(on_error=False)
+    def reset_database(self, fixture_dir=None):
         """
         Сброс всей базы данных к начальному состоянию.
+        Очистка и загрузка данных выполняются в одной транзакции.
+
+        Args:
+            fixture_dir: Каталог фикстуры с начальными данными (по умолчанию - тестовые данные)
 
         Returns:
             bool: Успешность сброса
         """
         try:
-            # Очистка всех таблиц
-            self.cursor.execute("TRUNCATE TABLE actor_performances CASCADE")
-            self.cursor.execute("TRUNCATE TABLE performances CASCADE")
-            self.cursor.execute("TRUNCATE TABLE actors CASCADE")
-            self.cursor.execute("TRUNCATE TABLE plots CASCADE")
-            self.cursor.execute("TRUNCATE TABLE game_data CASCADE")
-
-            # Сброс последовательностей идентификаторов
-            self.cursor.execute("ALTER SEQUENCE actors_actor_id_seq RESTART WITH 1")
-            self.cursor.execute("ALTER SEQUENCE plots_plot_id_seq RESTART WITH 1")
-            self.cursor.execute("ALTER SEQUENCE performances_performance_id_seq RESTART WITH 1")
-
-            # Вставка начальных данных игры
+            # Очистка всех таблиц со сбросом последовательностей идентификаторов
             self.cursor.execute("""
-                INSERT INTO game_data (id, current_year, capital)
-                VALUES (1, 2025, 1000000)
+                TRUNCATE TABLE actor_performances, performances, actors, plots, game_data
+                RESTART IDENTITY CASCADE
             """)
 
-            # Инициализация тестовыми данными
-            self.init_sample_data()
+            # Заполнение начальными данными
+            self._load_fixtures(fixture_dir or SAMPLE_FIXTURE_DIR)
 
-            self.connection.commit()
+            self._commit()
             self.logger.info("База данных успешно сброшена")
             return True
-        except psycopg2.Error as e:
-            self.connection.rollback()
+        except (psycopg2.Error, OSError, ValueError) as e:
+            self._rollback()
             self.logger.error(f"Ошибка сброса БД: {str(e)}")
             return False
 
+    @_invalidates(*CACHE_KEYS)
+    @_uses_connection(on_error=False)
     def reset_schema(self):
         """
         Сброс схемы базы данных (удаление всех таблиц и типов).
@@ -421,48 +1255,132 @@ class DatabaseManager:
                 DROP TABLE IF EXISTS actors CASCADE;
                 DROP TABLE IF EXISTS plots CASCADE;
                 DROP TABLE IF EXISTS game_data CASCADE;
+                DROP TABLE IF EXISTS schema_version;
                 DROP TYPE IF EXISTS actor_rank CASCADE;
             """)
-            self.connection.commit()
+            self._commit()
             self.logger.info("Схема БД успешно удалена")
 
-            # Создание новой схемы
-            success = self.create_schema()
+            # Создание новой схемы и применение миграций
+            success = self.create_schema() and self.migrate()
 
             return success
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка сброса схемы БД: {str(e)}")
             return False
 
     def get_actors(self):
         """
-        Получение списка всех актеров.
+        Получение списка всех актеров (через кэш).
 
         Returns:
             list: Список словарей с данными актеров
         """
+        actors = self._read_through(CACHE_ACTORS, self._fetch_actors)
+        return [copy_row(actor) for actor in actors] if actors is not None else []
+
+    @_uses_connection(on_error=None)
+    def _fetch_actors(self):
+        """Загрузка списка всех актеров из БД."""
         try:
             self.cursor.execute("SELECT * FROM actors ORDER BY actor_id")
-            return self.cursor.fetchall()
+            return [dict(row) for row in self.cursor.fetchall()]
         except psycopg2.Error as e:
             self.logger.error(f"Ошибка получения списка актеров: {str(e)}")
-            return []
+            return None
 
     def get_plots(self):
         """
-        Получение списка всех сюжетов.
+        Получение списка всех сюжетов (через кэш).
 
         Returns:
             list: Список словарей с данными сюжетов
         """
+        plots = self._read_through(CACHE_PLOTS, self._fetch_plots)
+        return [copy_row(plot) for plot in plots] if plots is not None else []
+
+    @_uses_connection(on_error=None)
+    def _fetch_plots(self):
+        """Загрузка списка всех сюжетов из БД."""
         try:
             self.cursor.execute("SELECT * FROM plots ORDER BY title")
-            return self.cursor.fetchall()
+            return [dict(row) for row in self.cursor.fetchall()]
         except psycopg2.Error as e:
             self.logger.error(f"Ошибка получения списка сюжетов: {str(e)}")
+            return None
+
+    @_uses_connection(on_error=[])
+    def get_actors_page(self, after_id=None, limit=PAGE_SIZE, order_by="actor_id", descending=False,
+                        after_value=None):
+        """
+        Постраничное получение актеров (keyset-пагинация).
+        Страница продолжается после строки (after_value, after_id) в порядке
+        сортировки (order_by, actor_id), поэтому каждый запрос - один проход по индексу.
+
+        Args:
+            after_id: ID последнего актера предыдущей страницы (None - первая страница)
+            limit: Размер страницы
+            order_by: Столбец сортировки (ключ ACTOR_SORT_COLUMNS)
+            descending: Сортировка по убыванию
+            after_value: Значение столбца сортировки у последнего актера предыдущей страницы
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+        if order_by not in ACTOR_SORT_COLUMNS:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+
+        expression, null_value = ACTOR_SORT_COLUMNS[order_by]
+        if after_id is not None and after_value is None:
+            after_value = null_value
+        condition, order, params = self._keyset_clauses(expression, "actor_id", descending, after_id, after_value)
+
+        try:
+            self.cursor.execute(sql.SQL("""
+                SELECT * FROM actors
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT %s
+            """).format(condition=condition, order=order), params + [limit])
+            return self.cursor.fetchall()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка получения страницы актеров: {str(e)}")
             return []
 
+    def iter_actors(self, itersize=STREAM_ITERSIZE):
+        """
+        Потоковое чтение всех актеров через серверный курсор.
+        Память не зависит от числа актеров. Ошибка чтения (psycopg2.Error)
+        передается вызывающему коду.
+
+        Args:
+            itersize: Число строк, получаемых с сервера за один раз
+
+        Yields:
+            dict: Данные актера
+        """
+        yield from self._stream("SELECT * FROM actors ORDER BY actor_id", None, itersize)
+
+    @_uses_connection(on_error=None)
+    def get_plot(self, plot_id):
+        """
+        Получение сюжета по его ID.
+
+        Args:
+            plot_id: ID сюжета
+
+        Returns:
+            dict or None: Данные сюжета или None, если он не найден
+        """
+        try:
+            self.cursor.execute("SELECT * FROM plots WHERE plot_id = %s", (plot_id,))
+            return self.cursor.fetchone()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка получения сюжета: {str(e)}")
+            return None
+
+    @_uses_connection(on_error=[])
     def get_performances(self, year=None):
         """
         Получение списка всех спектаклей с возможностью фильтрации по году.
@@ -495,6 +1413,217 @@ class DatabaseManager:
             self.logger.error(f"Ошибка получения спектаклей: {str(e)}")
             return []
 
+    @_uses_connection(on_error=[])
+    def get_performances_page(self, after_year=None, limit=PAGE_SIZE, order_by="year", descending=True,
+                              after_value=None):
+        """
+        Постраничное получение спектаклей (keyset-пагинация) с прибылью,
+        рассчитанной в запросе. Страница продолжается после строки
+        (after_value, after_year) в порядке сортировки (order_by, year).
+
+        Args:
+            after_year: Год последнего спектакля предыдущей страницы (None - первая страница)
+            limit: Размер страницы
+            order_by: Столбец сортировки (ключ PERFORMANCE_SORT_COLUMNS)
+            descending: Сортировка по убыванию (по умолчанию - от новых к старым)
+            after_value: Значение столбца сортировки у последнего спектакля предыдущей страницы
+
+        Returns:
+            list: Список словарей с данными спектаклей и полем profit
+        """
+        if order_by not in PERFORMANCE_SORT_COLUMNS:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+
+        condition, order, params = self._keyset_clauses(
+            PERFORMANCE_SORT_COLUMNS[order_by], "p.year", descending, after_year, after_value)
+
+        try:
+            self.cursor.execute(sql.SQL("""
+                SELECT p.*, pl.title as plot_title, p.revenue - p.budget AS profit
+                FROM performances p
+                JOIN plots pl ON p.plot_id = pl.plot_id
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT %s
+            """).format(condition=condition, order=order), params + [limit])
+            return self.cursor.fetchall()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка получения страницы спектаклей: {str(e)}")
+            return []
+
+    @staticmethod
+    def _keyset_clauses(expression, key, descending, after_key, after_value):
+        """
+        Построение условия и порядка сортировки для keyset-пагинации
+        по паре (expression, key), где key - уникальный столбец.
+
+        Args:
+            expression: Выражение SQL столбца сортировки (из белого списка)
+            key: Уникальный столбец, завершающий порядок сортировки
+            descending: Сортировка по убыванию
+            after_key: Значение key у последней строки предыдущей страницы (None - первая страница)
+            after_value: Значение expression у последней строки предыдущей страницы
+
+        Returns:
+            tuple: (условие WHERE, выражение ORDER BY, параметры условия)
+        """
+        parts = [key] if expression == key else [expression, key]
+        direction = "DESC" if descending else "ASC"
+        order = sql.SQL(", ").join(sql.SQL(f"{part} {direction}") for part in parts)
+
+        if after_key is None:
+            return sql.SQL("TRUE"), order, []
+
+        comparison = "<" if descending else ">"
+        if len(parts) == 1:
+            return sql.SQL(f"{key} {comparison} %s"), order, [after_key]
+        return sql.SQL(f"({expression}, {key}) {comparison} (%s, %s)"), order, [after_value, after_key]
+
+    def iter_performances(self, itersize=STREAM_ITERSIZE):
+        """
+        Потоковое чтение всех спектаклей через серверный курсор.
+        Ошибка чтения (psycopg2.Error) передается вызывающему коду.
+
+        Args:
+            itersize: Число строк, получаемых с сервера за один раз
+
+        Yields:
+            dict: Данные спектакля
+        """
+        yield from self._stream("""
+            SELECT p.*, pl.title as plot_title
+            FROM performances p
+            JOIN plots pl ON p.plot_id = pl.plot_id
+            ORDER BY p.year DESC
+        """, None, itersize)
+
+    def _stream(self, query, params, itersize):
+        """
+        Выполнение запроса через именованный (серверный) курсор.
+        Для потока выделяется отдельное соединение (из пула или новое),
+        чтобы фиксации других операций не закрыли курсор.
+        Ошибка записывается в лог и передается вызывающему коду,
+        чтобы поток не завершился молча на неполных данных.
+
+        Args:
+            query: Текст запроса
+            params: Параметры запроса
+            itersize: Число строк, получаемых с сервера за один раз
+
+        Yields:
+            dict: Строки результата
+        """
+        try:
+            with self._dedicated_connection() as connection:
+                with connection.cursor(name=f"stream_{next(self._stream_ids)}", cursor_factory=DictCursor) as cursor:
+                    cursor.itersize = itersize
+                    cursor.execute(query, params)
+                    yield from cursor
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка потокового чтения: {str(e)}")
+            raise
+
+    @contextmanager
+    def _dedicated_connection(self):
+        """
+        Отдельное соединение для длительного чтения (из пула или новое).
+
+        Yields:
+            connection: Соединение с БД
+        """
+        if self.pool is not None:
+            connection = self._acquire_connection()
+        else:
+            connection = psycopg2.connect(**self.connection_params)
+
+        try:
+            yield connection
+        finally:
+            if self.pool is not None:
+                self._release_connection(connection)
+            else:
+                connection.close()
+
+    def _performance_casts_query(self):
+        """Запрос выгрузки спектаклей с составами (спектакли без актеров тоже включаются)."""
+        columns = ", ".join(f"{expression} AS {name}" for name, expression in PERFORMANCE_CAST_COLUMNS)
+        return f"""
+            SELECT {columns}
+            FROM performances p
+            JOIN plots pl ON p.plot_id = pl.plot_id
+            LEFT JOIN actor_performances ap ON ap.performance_id = p.performance_id
+            LEFT JOIN actors a ON a.actor_id = ap.actor_id
+        """
+
+    @_uses_connection(on_error=None)
+    def copy_performance_casts(self, out_file):
+        """
+        Выгрузка спектаклей с составами в CSV через COPY ... TO STDOUT.
+        Данные передаются в файл по мере получения, не накапливаясь в памяти.
+
+        Args:
+            out_file: Открытый на запись файловый объект
+
+        Returns:
+            int or None: Число выгруженных строк или None при ошибке
+        """
+        try:
+            self.cursor.copy_expert(
+                f"COPY ({self._performance_casts_query()}) TO STDOUT WITH (FORMAT csv, HEADER)", out_file)
+            self.logger.info(f"Выгружено строк истории спектаклей: {self.cursor.rowcount}",
+                             event="performance_history_exported", rows=self.cursor.rowcount)
+            return self.cursor.rowcount
+        except psycopg2.Error as e:
+            self._rollback()
+            self.logger.error(f"Ошибка выгрузки истории спектаклей: {str(e)}")
+            return None
+
+    def iter_performance_casts(self, batch_size=EXPORT_BATCH_SIZE):
+        """
+        Потоковое чтение спектаклей с составами пакетами через серверный курсор.
+        Ошибки передаются вызывающему коду, чтобы выгрузка
+        не завершилась молча на неполных данных.
+
+        Args:
+            batch_size: Число строк в пакете
+
+        Yields:
+            list: Пакет строк-кортежей в порядке PERFORMANCE_CAST_COLUMNS
+        """
+        with self._dedicated_connection() as connection:
+            with connection.cursor(name=f"stream_{next(self._stream_ids)}") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(self._performance_casts_query())
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+
+    @_uses_connection(on_error=None)
+    def get_performance(self, performance_id):
+        """
+        Получение спектакля по его ID.
+
+        Args:
+            performance_id: ID спектакля
+
+        Returns:
+            dict or None: Данные спектакля или None, если он не найден
+        """
+        try:
+            self.cursor.execute("""
+                SELECT p.*, pl.title as plot_title
+                FROM performances p
+                JOIN plots pl ON p.plot_id = pl.plot_id
+                WHERE p.performance_id = %s
+            """, (performance_id,))
+            return self.cursor.fetchone()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка получения спектакля: {str(e)}")
+            return None
+
+    @_uses_connection(on_error=[])
     def get_actors_in_performance(self, performance_id):
         """
         Получение списка актеров, участвующих в спектакле.
@@ -520,18 +1649,27 @@ class DatabaseManager:
 
     def get_game_data(self):
         """
-        Получение игровых данных (текущий год и капитал).
+        Получение игровых данных (текущий год и капитал) через кэш.
 
         Returns:
             dict: Словарь с игровыми данными
         """
+        game_data = self._read_through(CACHE_GAME_DATA, self._fetch_game_data)
+        return copy_row(game_data) if game_data is not None else None
+
+    @_uses_connection(on_error=None)
+    def _fetch_game_data(self):
+        """Загрузка игровых данных из БД."""
         try:
             self.cursor.execute("SELECT * FROM game_data WHERE id = 1")
-            return self.cursor.fetchone()
+            row = self.cursor.fetchone()
+            return dict(row) if row is not None else None
         except psycopg2.Error as e:
             self.logger.error(f"Ошибка получения игровых данных: {str(e)}")
             return None
 
+    @_invalidates(CACHE_GAME_DATA)
+    @_uses_connection(on_error=False)
     def update_game_data(self, year, capital):
         """
         Обновление игровых данных.
@@ -549,14 +1687,17 @@ class DatabaseManager:
                 SET current_year = %s, capital = %s
                 WHERE id = 1
             """, (year, capital))
-            self.connection.commit()
-            self.logger.info(f"Обновлены игровые данные: год={year}, капитал={capital}")
+            self._commit()
+            self.logger.info(f"Обновлены игровые данные: год={year}, капитал={capital}",
+                             event="game_data_updated", year=year, capital=capital)
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка обновления игровых данных: {str(e)}")
             return False
 
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=None)
     def add_actor(self, last_name, first_name, patronymic, rank, awards_count, experience):
         """
         Добавление нового актера в базу данных.
@@ -579,14 +1720,81 @@ class DatabaseManager:
                 RETURNING actor_id
             """, (last_name, first_name, patronymic, rank, awards_count, experience))
             actor_id = self.cursor.fetchone()[0]
-            self.connection.commit()
-            self.logger.info(f"Добавлен актер с ID {actor_id}")
+            self._commit()
+            self.logger.info(f"Добавлен актер с ID {actor_id}", event="actor_added", actor_id=actor_id)
             return actor_id
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка добавления актера: {str(e)}")
             return None
 
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=None)
+    def import_actors(self, rows, chunk_size=IMPORT_CHUNK_SIZE):
+        """
+        Массовый импорт актеров: строки загружаются во временную таблицу через COPY
+        порциями, затем одним запросом добавляются или обновляются по ФИО.
+        При повторении ФИО во входных данных используется последняя строка.
+
+        Args:
+            rows: Итерируемый источник кортежей
+                (номер строки, фамилия, имя, отчество, звание, награды, опыт)
+            chunk_size: Число строк в одной порции COPY
+
+        Returns:
+            tuple or None: (число добавленных, число обновленных) или None при ошибке
+        """
+        rows = iter(rows)
+        try:
+            self.cursor.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS actors_import (
+                    line_no INTEGER NOT NULL,
+                    last_name VARCHAR(100) NOT NULL,
+                    first_name VARCHAR(100) NOT NULL,
+                    patronymic VARCHAR(100) NOT NULL,
+                    rank actor_rank NOT NULL,
+                    awards_count INTEGER NOT NULL,
+                    experience INTEGER NOT NULL
+                ) ON COMMIT DROP
+            """)
+            self.cursor.execute("TRUNCATE actors_import")
+
+            # Пустое отчество сохраняется как '' (как при добавлении через интерфейс), а не NULL
+            copy_query = "COPY actors_import FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (patronymic))"
+            for chunk in iter(lambda: list(itertools.islice(rows, chunk_size)), []):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(chunk)
+                buffer.seek(0)
+                self.cursor.copy_expert(copy_query, buffer)
+
+            self.cursor.execute("""
+                WITH upserted AS (
+                    INSERT INTO actors (last_name, first_name, patronymic, rank, awards_count, experience)
+                    SELECT DISTINCT ON (last_name, first_name, patronymic)
+                           last_name, first_name, patronymic, rank, awards_count, experience
+                    FROM actors_import
+                    ORDER BY last_name, first_name, patronymic, line_no DESC
+                    ON CONFLICT ON CONSTRAINT actor_full_name_unique DO UPDATE
+                    SET rank = EXCLUDED.rank,
+                        awards_count = EXCLUDED.awards_count,
+                        experience = EXCLUDED.experience
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted)
+                FROM upserted
+            """)
+            inserted, updated = self.cursor.fetchone()
+            self._commit()
+            self.logger.info(f"Импорт актеров: добавлено {inserted}, обновлено {updated}",
+                             event="actors_imported", inserted=inserted, updated=updated)
+            return inserted, updated
+        except psycopg2.Error as e:
+            self._rollback()
+            self.logger.error(f"Ошибка импорта актеров: {str(e)}")
+            return None
+
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=(False, "Нет соединения с БД"))
     def update_actor(self, actor_id, last_name, first_name, patronymic, rank, awards_count, experience):
         """
         Обновление данных актера.
@@ -617,14 +1825,16 @@ class DatabaseManager:
                 self.logger.error(f"Актер с ID {actor_id} не найден")
                 return False, "Актер не найден"
 
-            self.connection.commit()
-            self.logger.info(f"Обновлен актер с ID {actor_id}")
+            self._commit()
+            self.logger.info(f"Обновлен актер с ID {actor_id}", event="actor_updated", actor_id=actor_id)
             return True, ""
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка обновления актера: {str(e)}")
             return False, str(e)
 
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=(False, "Нет соединения с БД"))
     def delete_actor(self, actor_id):
         """
         Удаление актера из базы данных.
@@ -636,14 +1846,20 @@ class DatabaseManager:
             tuple: (успех операции (bool), сообщение об ошибке (str))
         """
         try:
-            # Проверка участия актера ТОЛЬКО в текущих постановках
+            # Проверка участия актера ТОЛЬКО в текущих постановках: незавершенные спектакли
+            # читаются из частичного индекса performances_open_idx, состав - по первичному ключу
             self.cursor.execute("""
-                SELECT COUNT(*) FROM actor_performances ap
-                JOIN performances p ON ap.performance_id = p.performance_id
-                WHERE ap.actor_id = %s AND p.is_completed = FALSE
+                SELECT EXISTS (
+                    SELECT 1 FROM performances p
+                    WHERE p.is_completed = FALSE
+                      AND EXISTS (
+                          SELECT 1 FROM actor_performances ap
+                          WHERE ap.actor_id = %s AND ap.performance_id = p.performance_id
+                      )
+                )
             """, (actor_id,))
 
-            if self.cursor.fetchone()[0] > 0:
+            if self.cursor.fetchone()[0]:
                 self.logger.error(f"Актер с ID {actor_id} занят в текущих постановках")
                 return False, "Актер занят в текущих постановках"
 
@@ -663,14 +1879,15 @@ class DatabaseManager:
 
             # Теперь удаляем самого актера
             self.cursor.execute("DELETE FROM actors WHERE actor_id = %s", (actor_id,))
-            self.connection.commit()
-            self.logger.info(f"Удален актер с ID {actor_id}")
+            self._commit()
+            self.logger.info(f"Удален актер с ID {actor_id}", event="actor_deleted", actor_id=actor_id)
             return True, ""
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка удаления актера: {str(e)}")
             return False, str(e)
 
+    @_uses_connection(on_error=None)
     def create_performance(self, title, plot_id, year, budget):
         """
         Создание нового спектакля.
@@ -691,14 +1908,16 @@ class DatabaseManager:
                 RETURNING performance_id
             """, (title, plot_id, year, budget))
             performance_id = self.cursor.fetchone()[0]
-            self.connection.commit()
-            self.logger.info(f"Создан спектакль с ID {performance_id}")
+            self._commit()
+            self.logger.info(f"Создан спектакль с ID {performance_id}", event="performance_created",
+                             performance_id=performance_id, plot_id=plot_id, year=year, budget=budget)
             return performance_id
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка создания спектакля: {str(e)}")
             return None
 
+    @_uses_connection(on_error=False)
     def assign_actor_to_role(self, actor_id, performance_id, role, contract_cost):
         """
         Назначение актера на роль в спектакле.
@@ -717,14 +1936,48 @@ class DatabaseManager:
                 INSERT INTO actor_performances (actor_id, performance_id, role, contract_cost)
                 VALUES (%s, %s, %s, %s)
             """, (actor_id, performance_id, role, contract_cost))
-            self.connection.commit()
-            self.logger.info(f"Актер {actor_id} назначен на роль '{role}' в спектакле {performance_id}")
+            self._commit()
+            self.logger.info(f"Актер {actor_id} назначен на роль '{role}' в спектакле {performance_id}",
+                             event="actor_assigned", actor_id=actor_id, performance_id=performance_id,
+                             role=role, contract_cost=contract_cost)
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка назначения актера: {str(e)}")
             return False
 
+    @_uses_connection(on_error=False)
+    def assign_cast(self, performance_id, roles):
+        """
+        Назначение всего состава спектакля одним многострочным запросом.
+
+        Args:
+            performance_id: ID спектакля
+            roles: Список кортежей (actor_id, role, contract_cost)
+
+        Returns:
+            bool: Успешность назначения
+        """
+        if not roles:
+            return True
+
+        try:
+            execute_values(self.cursor, """
+                INSERT INTO actor_performances (actor_id, performance_id, role, contract_cost)
+                VALUES %s
+            """, [(actor_id, performance_id, role, contract_cost) for actor_id, role, contract_cost in roles],
+                page_size=len(roles))
+            self._commit()
+            self.logger.info(f"Назначен состав спектакля {performance_id}: {len(roles)} ролей",
+                             event="cast_assigned", performance_id=performance_id, roles=len(roles))
+            return True
+        except psycopg2.Error as e:
+            self._rollback()
+            self.logger.error(f"Ошибка назначения состава спектакля: {str(e)}")
+            return False
+
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=False)
     def complete_performance(self, performance_id, revenue):
         """
         Завершение спектакля с указанием выручки.
@@ -752,14 +2005,16 @@ class DatabaseManager:
                 WHERE a.actor_id = ap.actor_id AND ap.performance_id = %s
             """, (performance_id,))
 
-            self.connection.commit()
-            self.logger.info(f"Спектакль {performance_id} завершен с выручкой {revenue}")
+            self._commit()
+            self.logger.info(f"Спектакль {performance_id} завершен с выручкой {revenue}",
+                             event="performance_completed", performance_id=performance_id, revenue=revenue)
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка завершения спектакля: {str(e)}")
             return False
 
+    @_uses_connection(on_error=False)
     def update_performance_budget(self, performance_id, budget):
         """
         Обновление бюджета спектакля.
@@ -777,14 +2032,17 @@ class DatabaseManager:
                 SET budget = %s
                 WHERE performance_id = %s
             """, (budget, performance_id))
-            self.connection.commit()
-            self.logger.info(f"Обновлен бюджет спектакля {performance_id}: {budget}")
+            self._commit()
+            self.logger.info(f"Обновлен бюджет спектакля {performance_id}: {budget}",
+                             event="performance_budget_updated", performance_id=performance_id, budget=budget)
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка обновления бюджета: {str(e)}")
             return False
 
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=False)
     def upgrade_actor_rank(self, actor_id):
         """
         Повышение звания актера на одну ступень.
@@ -812,17 +2070,20 @@ class DatabaseManager:
                     SET rank = %s
                     WHERE actor_id = %s
                 """, (new_rank, actor_id))
-                self.connection.commit()
-                self.logger.info(f"Актер {actor_id} повышен до звания '{new_rank}'")
+                self._commit()
+                self.logger.info(f"Актер {actor_id} повышен до звания '{new_rank}'",
+                                 event="actor_rank_upgraded", actor_id=actor_id, rank=new_rank)
                 return True
             else:
                 self.logger.info(f"Актер {actor_id} уже имеет максимальное звание")
                 return False
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка повышения звания: {str(e)}")
             return False
 
+    @_invalidates(CACHE_ACTORS)
+    @_uses_connection(on_error=False)
     def award_actor(self, actor_id):
         """
         Присвоение награды актеру.
@@ -839,10 +2100,10 @@ class DatabaseManager:
                 SET awards_count = awards_count + 1
                 WHERE actor_id = %s
             """, (actor_id,))
-            self.connection.commit()
-            self.logger.info(f"Актеру {actor_id} присвоена награда")
+            self._commit()
+            self.logger.info(f"Актеру {actor_id} присвоена награда", event="actor_awarded", actor_id=actor_id)
             return True
         except psycopg2.Error as e:
-            self.connection.rollback()
+            self._rollback()
             self.logger.error(f"Ошибка присвоения награды: {str(e)}")
             return False
\ No newline at end of file
@@ -0,0 +1,139 @@
+"""
+Модуль выгрузки истории спектаклей с составами в файлы отчетов.
+Поддерживает CSV (через COPY) и колоночный формат Parquet (через pyarrow).
+"""
+import os
+
+import psycopg2
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from data import PERFORMANCE_CAST_COLUMNS
+from logger import Logger
+
+
+# Расширения файлов и соответствующие форматы выгрузки
+EXPORT_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+}
+
+# Алгоритм сжатия файлов Parquet
+PARQUET_COMPRESSION = "zstd"
+
+
+def is_parquet_available():
+    """Установлена ли библиотека pyarrow для выгрузки в Parquet."""
+    return pq is not None
+
+
+def performance_casts_schema():
+    """
+    Схема Arrow для выгрузки спектаклей с составами.
+
+    Returns:
+        pyarrow.Schema: Схема с типами столбцов PERFORMANCE_CAST_COLUMNS
+    """
+    types = {
+        "performance_id": pa.int32(),
+        "title": pa.string(),
+        "plot_title": pa.string(),
+        "year": pa.int32(),
+        "budget": pa.int32(),
+        "revenue": pa.int32(),
+        "profit": pa.int32(),
+        "is_completed": pa.bool_(),
+        "actor_id": pa.int32(),
+        "last_name": pa.string(),
+        "first_name": pa.string(),
+        "patronymic": pa.string(),
+        "rank": pa.string(),
+        "role": pa.string(),
+        "contract_cost": pa.int32(),
+    }
+    return pa.schema([(name, types[name]) for name, _ in PERFORMANCE_CAST_COLUMNS])
+
+
+def write_performance_casts_csv(db, path):
+    """
+    Выгрузка спектаклей с составами в CSV-файл.
+
+    Args:
+        db: DatabaseManager
+        path: Путь к файлу
+
+    Returns:
+        int or None: Число выгруженных строк или None при ошибке БД
+    """
+    with open(path, "w", newline="", encoding="utf-8") as out_file:
+        return db.copy_performance_casts(out_file)
+
+
+def write_performance_casts_parquet(db, path):
+    """
+    Выгрузка спектаклей с составами в файл Parquet.
+    Каждый пакет строк из серверного курсора записывается отдельной группой строк,
+    поэтому в памяти одновременно находится только один пакет.
+
+    Args:
+        db: DatabaseManager
+        path: Путь к файлу
+
+    Returns:
+        int: Число выгруженных строк
+    """
+    schema = performance_casts_schema()
+    rows_count = 0
+    with pq.ParquetWriter(path, schema, compression=PARQUET_COMPRESSION) as writer:
+        for rows in db.iter_performance_casts():
+            columns = zip(*rows)
+            arrays = [pa.array(values, type=field.type) for values, field in zip(columns, schema)]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows_count += len(rows)
+    return rows_count
+
+
+def export_performance_casts(db, path):
+    """
+    Выгрузка спектаклей с составами; формат определяется расширением файла.
+    При ошибке частично записанный файл удаляется.
+
+    Args:
+        db: DatabaseManager
+        path: Путь к файлу (.csv или .parquet)
+
+    Returns:
+        tuple: (успех операции (bool), сообщение (str))
+    """
+    logger = Logger()
+    export_format = EXPORT_FORMATS.get(os.path.splitext(path)[1].lower())
+    if export_format is None:
+        return False, "Поддерживаются только файлы CSV и Parquet"
+    if export_format == "parquet" and not is_parquet_available():
+        logger.warning("Модуль pyarrow не установлен, выгрузка в Parquet недоступна")
+        return False, "Для выгрузки в Parquet установите пакет pyarrow"
+
+    try:
+        if export_format == "csv":
+            rows_count = write_performance_casts_csv(db, path)
+        else:
+            rows_count = write_performance_casts_parquet(db, path)
+    except (OSError, psycopg2.Error) as e:
+        logger.error(f"Ошибка выгрузки истории спектаклей в {path}: {str(e)}")
+        rows_count = None
+        error = str(e)
+    else:
+        error = "Ошибка чтения данных из БД"
+
+    if rows_count is None:
+        if os.path.exists(path):
+            os.remove(path)
+        return False, f"Не удалось выгрузить данные: {error}"
+
+    logger.info(f"История спектаклей выгружена в {path}: {rows_count} строк")
+    return True, f"Выгружено строк: {rows_count}"
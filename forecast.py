@@ -0,0 +1,141 @@
+"""
+Модуль прогноза результатов спектакля методом Монте-Карло.
+Содержит параметры случайной модели выручки, общие для расчета результатов
+спектакля (TheaterController.calculate_performance_result) и прогноза.
+Прогноз вычисляется векторно с помощью NumPy; без NumPy используется
+медленный расчет на меньшем числе испытаний.
+"""
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Непредвиденные расходы: доля фактического бюджета
+UNEXPECTED_EXPENSES_RANGE = (0.05, 0.15)
+# Вероятность провала при соответствии и несоответствии званий актеров требованиям ролей
+FAIL_CHANCE = 0.4
+FAIL_CHANCE_MISMATCH = 0.6
+# Граница броска, после которой спектакль проходит с большим успехом
+SUCCESS_THRESHOLD = 0.9
+# Множители выручки: провал (при соответствии и несоответствии званий), обычный режим, успех
+FAIL_FACTOR_RANGE = (0.4, 0.7)
+FAIL_FACTOR_RANGE_MISMATCH = (0.3, 0.5)
+NORMAL_FACTOR_RANGE = (0.7, 1.0)
+SUCCESS_FACTOR_RANGE = (1.0, 1.4)
+# Повышение звания лучшего актера: прибыль больше этой доли полных расходов
+RANK_UPGRADE_PROFIT_SHARE = 0.3
+
+# Число испытаний прогноза (без NumPy - FALLBACK_SAMPLES)
+FORECAST_SAMPLES = 1000000
+FALLBACK_SAMPLES = 20000
+# Квантили прибыли в прогнозе
+PROFIT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def is_numpy_available():
+    """Установлена ли библиотека NumPy для быстрого прогноза."""
+    return np is not None
+
+
+def revenue_factor_ranges(matches_requirements):
+    """
+    Границы множителя выручки для провала, обычного режима и успеха.
+
+    Returns:
+        tuple: (вероятность провала, диапазон провала, диапазон обычного режима, диапазон успеха)
+    """
+    if matches_requirements:
+        return FAIL_CHANCE, FAIL_FACTOR_RANGE, NORMAL_FACTOR_RANGE, SUCCESS_FACTOR_RANGE
+    return FAIL_CHANCE_MISMATCH, FAIL_FACTOR_RANGE_MISMATCH, NORMAL_FACTOR_RANGE, SUCCESS_FACTOR_RANGE
+
+
+def _simulate_numpy(model, samples):
+    """Векторный расчет выручки, расходов и повышения звания по всем испытаниям."""
+    rng = np.random.default_rng()
+    fail_chance, fail_range, normal_range, success_range = revenue_factor_ranges(model['matches_requirements'])
+
+    # Целые суммы округляются вниз, как int() для положительных значений
+    unexpected = np.floor(model['actual_budget'] * rng.uniform(*UNEXPECTED_EXPENSES_RANGE, samples))
+
+    fate = rng.random(samples)
+    failed = fate < fail_chance
+    succeeded = fate >= SUCCESS_THRESHOLD
+    low = np.where(failed, fail_range[0], np.where(succeeded, success_range[0], normal_range[0]))
+    high = np.where(failed, fail_range[1], np.where(succeeded, success_range[1], normal_range[1]))
+    factor = low + (high - low) * rng.random(samples)
+
+    revenue = np.floor((model['base_revenue'] + model['actors_bonus']) * factor)
+    expenses = model['actual_budget'] + unexpected
+    profit = revenue - expenses
+    upgraded = (profit > 0) & (profit > expenses * RANK_UPGRADE_PROFIT_SHARE)
+    if not model['can_upgrade']:
+        upgraded[:] = False
+
+    return {
+        'samples': samples,
+        'expected_revenue': float(revenue.mean()),
+        'expected_profit': float(profit.mean()),
+        'profit_quantiles': dict(zip(PROFIT_QUANTILES, np.quantile(profit, PROFIT_QUANTILES).tolist())),
+        'loss_probability': float((profit < 0).mean()),
+        'upgrade_probability': float(upgraded.mean()),
+    }
+
+
+def _simulate_python(model, samples):
+    """Расчет по испытаниям в цикле (если NumPy не установлен)."""
+    fail_chance, fail_range, normal_range, success_range = revenue_factor_ranges(model['matches_requirements'])
+    profits = []
+    revenue_total = 0
+    upgrades = 0
+    for _ in range(samples):
+        unexpected = int(model['actual_budget'] * random.uniform(*UNEXPECTED_EXPENSES_RANGE))
+        fate = random.random()
+        if fate < fail_chance:
+            factor = random.uniform(*fail_range)
+        elif fate < SUCCESS_THRESHOLD:
+            factor = random.uniform(*normal_range)
+        else:
+            factor = random.uniform(*success_range)
+        revenue = int((model['base_revenue'] + model['actors_bonus']) * factor)
+        expenses = model['actual_budget'] + unexpected
+        profit = revenue - expenses
+        revenue_total += revenue
+        profits.append(profit)
+        if model['can_upgrade'] and profit > 0 and profit > expenses * RANK_UPGRADE_PROFIT_SHARE:
+            upgrades += 1
+
+    profits.sort()
+    return {
+        'samples': samples,
+        'expected_revenue': revenue_total / samples,
+        'expected_profit': sum(profits) / samples,
+        'profit_quantiles': {q: profits[min(int(q * samples), samples - 1)] for q in PROFIT_QUANTILES},
+        'loss_probability': sum(1 for profit in profits if profit < 0) / samples,
+        'upgrade_probability': upgrades / samples,
+    }
+
+
+def simulate(model, samples=FORECAST_SAMPLES):
+    """
+    Прогноз результатов спектакля методом Монте-Карло.
+
+    Args:
+        model: Параметры спектакля (см. TheaterController.performance_model):
+               actual_budget, base_revenue, actors_bonus, matches_requirements, can_upgrade
+        samples: Число испытаний (без NumPy - не более FALLBACK_SAMPLES)
+
+    Returns:
+        dict: Число испытаний, ожидаемые выручка и прибыль, квантили прибыли,
+              вероятности убытка и повышения звания, время расчета (мс)
+    """
+    started = time.perf_counter()
+    if is_numpy_available():
+        forecast = _simulate_numpy(model, samples)
+    else:
+        forecast = _simulate_python(model, min(samples, FALLBACK_SAMPLES))
+    forecast['elapsed_ms'] = (time.perf_counter() - started) * 1000
+    return forecast
@@ -0,0 +1,70 @@
+"""
+Модуль массового импорта актеров из CSV-файла.
+Запуск из командной строки: python import_actors.py actors.csv [параметры подключения]
+"""
+import argparse
+import csv
+import sys
+from controller import TheaterController
+from logger import Logger
+
+
+def write_rejects(path, rejected):
+    """
+    Сохранение отклоненных строк импорта в CSV-файл.
+
+    Args:
+        path: Путь к файлу отчета
+        rejected: Список кортежей (номер строки, причина)
+    """
+    with open(path, "w", newline="", encoding="utf-8") as rejects_file:
+        writer = csv.writer(rejects_file)
+        writer.writerow(("line", "reason"))
+        writer.writerows(rejected)
+
+
+def main(argv=None):
+    """
+    Импорт актеров с параметрами из командной строки.
+
+    Returns:
+        int: Код завершения процесса
+    """
+    parser = argparse.ArgumentParser(description="Массовый импорт актеров из CSV-файла")
+    parser.add_argument("path", help="CSV-файл со столбцами last_name, first_name, patronymic, "
+                                     "rank, awards_count, experience")
+    parser.add_argument("--dbname", default="task1", help="Имя базы данных")
+    parser.add_argument("--user", default="postgres", help="Имя пользователя")
+    parser.add_argument("--password", default="postgres", help="Пароль")
+    parser.add_argument("--host", default="localhost", help="Хост сервера БД")
+    parser.add_argument("--port", default="5432", help="Порт сервера БД")
+    parser.add_argument("--rejects", help="Файл для сохранения отклоненных строк")
+    args = parser.parse_args(argv)
+
+    logger = Logger()
+    controller = TheaterController()
+    controller.set_connection_params(args.dbname, args.user, args.password, args.host, args.port)
+    if not controller.connect_to_database():
+        print("Не удалось подключиться к базе данных", file=sys.stderr)
+        return 1
+
+    try:
+        success, message, rejected = controller.import_actors_csv(args.path)
+    finally:
+        controller.close()
+
+    print(message)
+    for line_no, reason in rejected[:20]:
+        print(f"  строка {line_no}: {reason}")
+    if len(rejected) > 20:
+        print(f"  ... и еще {len(rejected) - 20}")
+
+    if args.rejects and rejected:
+        write_rejects(args.rejects, rejected)
+        logger.info(f"Отклоненные строки импорта сохранены в {args.rejects}")
+
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
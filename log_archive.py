@@ -0,0 +1,330 @@
+"""
+Модуль архивирования и поиска по журналам приложения.
+При достижении предельного размера журнал переименовывается и в фоновом потоке
+сжимается в архив gzip, рядом
+с архивом сохраняется индекс: для каждого блока архива - смещение, интервал
+времени и число записей каждого уровня. Поиск распаковывает только блоки,
+подходящие по времени и уровню.
+Запуск из командной строки: python log_archive.py [--level ERROR] [--since 2026-10-13] [--until 2026-10-13]
+"""
+import argparse
+import glob
+import gzip
+import json
+import logging.handlers
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+
+# Предельный размер журнала до архивирования и число хранимых архивов
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUP_COUNT = 20
+# Размер несжатого блока архива; блоки сжимаются независимо друг от друга
+LOG_ARCHIVE_BLOCK_BYTES = 256 * 1024
+# Расширение файла индекса архива
+INDEX_SUFFIX = ".idx"
+# Расширение переименованного журнала, ожидающего сжатия
+ROTATED_SUFFIX = ".log"
+INDEX_VERSION = 1
+# Максимальное число найденных записей по умолчанию
+SEARCH_MAX_RESULTS = 1000
+# Формат времени записей журнала (см. Logger)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+
+# Начало записи журнала: "2026-10-17 06:15:04 - INFO - сообщение"
+_RECORD_HEADER = re.compile(rb"^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d) - ([A-Z]+) - ")
+
+
+def archive_paths(log_file):
+    """Архивы журнала от старых к новым (имена содержат время архивирования)."""
+    return sorted(glob.glob(glob.escape(log_file) + ".*.gz"))
+
+
+def rotated_paths(log_file):
+    """Переименованные журналы, ожидающие сжатия, от старых к новым."""
+    return sorted(glob.glob(glob.escape(log_file) + ".*" + ROTATED_SUFFIX))
+
+
+def iter_records(lines):
+    """
+    Группировка строк журнала в записи: строка с временем и уровнем
+    и следующие за ней строки многострочного сообщения.
+
+    Args:
+        lines: Итератор строк (bytes)
+
+    Yields:
+        tuple: (время (str) или None, уровень (str) или None, строки записи (list of bytes))
+    """
+    timestamp = level = None
+    record = []
+    for line in lines:
+        header = _RECORD_HEADER.match(line)
+        if header and record:
+            yield timestamp, level, record
+            record = []
+        if header:
+            timestamp, level = header.group(1).decode(), header.group(2).decode()
+        record.append(line)
+    if record:
+        yield timestamp, level, record
+
+
+def write_archive(log_file, archive_path, block_bytes=LOG_ARCHIVE_BLOCK_BYTES):
+    """
+    Сжатие журнала в архив из независимых блоков gzip и запись индекса архива.
+    Архив из нескольких блоков остается обычным файлом gzip.
+
+    Args:
+        log_file: Путь к журналу
+        archive_path: Путь к создаваемому архиву
+        block_bytes: Размер несжатого блока
+    """
+    blocks = []
+    temp_path = archive_path + ".tmp"
+    with open(log_file, "rb") as source, open(temp_path, "wb") as archive:
+        pending = []
+        pending_size = 0
+        levels = Counter()
+        first = last = None
+
+        def write_block():
+            offset = archive.tell()
+            archive.write(gzip.compress(b"".join(pending)))
+            blocks.append({"offset": offset, "length": archive.tell() - offset,
+                           "start": first, "end": last, "levels": dict(levels)})
+
+        # Блоки делятся только по границам записей
+        for timestamp, level, record in iter_records(source):
+            if pending_size >= block_bytes:
+                write_block()
+                pending, pending_size, levels, first, last = [], 0, Counter(), None, None
+            pending.extend(record)
+            pending_size += sum(len(line) for line in record)
+            if level is not None:
+                levels[level] += 1
+            if timestamp is not None:
+                first = first or timestamp
+                last = timestamp
+        if pending:
+            write_block()
+
+    os.replace(temp_path, archive_path)
+    with open(archive_path + INDEX_SUFFIX, "w", encoding="utf-8") as index_file:
+        json.dump({"version": INDEX_VERSION, "blocks": blocks}, index_file, separators=(",", ":"))
+
+
+def load_index(archive_path):
+    """
+    Индекс архива. Если индекса нет или он поврежден, весь архив
+    считается одним блоком без известного интервала времени.
+
+    Returns:
+        list: Блоки архива (словари offset, length, start, end, levels)
+    """
+    try:
+        with open(archive_path + INDEX_SUFFIX, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+        if index.get("version") == INDEX_VERSION:
+            return index["blocks"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return [{"offset": 0, "length": None, "start": None, "end": None, "levels": None}]
+
+
+def block_matches(block, since, until, levels):
+    """Могут ли в блоке быть записи за интервал [since, until) с уровнями levels."""
+    if since is not None and block["end"] is not None and block["end"] < since:
+        return False
+    if until is not None and block["start"] is not None and block["start"] >= until:
+        return False
+    if levels and block["levels"] is not None and not any(block["levels"].get(level) for level in levels):
+        return False
+    return True
+
+
+def read_block(archive_path, block):
+    """Распаковка блока архива (или всего архива, если длина блока неизвестна)."""
+    if block["length"] is None:
+        with gzip.open(archive_path, "rb") as archive:
+            return archive.read()
+    with open(archive_path, "rb") as archive:
+        archive.seek(block["offset"])
+        return gzip.decompress(archive.read(block["length"]))
+
+
+def search_logs(log_file, since=None, until=None, levels=None, text=None, max_results=SEARCH_MAX_RESULTS):
+    """
+    Поиск записей в журнале и его архивах.
+
+    Args:
+        log_file: Путь к текущему журналу
+        since: Начало интервала (строка TIMESTAMP_FORMAT, включительно)
+        until: Конец интервала (строка TIMESTAMP_FORMAT, не включительно)
+        levels: Уровни записей (None - любые)
+        text: Подстрока сообщения без учета регистра (None - любое сообщение)
+        max_results: Максимальное число найденных записей
+
+    Returns:
+        tuple: (найденные записи - список кортежей (время, уровень, текст записи),
+                достигнуто ли ограничение max_results)
+    """
+    needle = text.casefold() if text else None
+    results = []
+
+    def matches(timestamp, level, record):
+        if timestamp is None:
+            return False
+        if (since is not None and timestamp < since) or (until is not None and timestamp >= until):
+            return False
+        if levels and level not in levels:
+            return False
+        return needle is None or needle in b"".join(record).decode("utf-8", errors="replace").casefold()
+
+    def collect(records):
+        for timestamp, level, record in records:
+            if matches(timestamp, level, record):
+                message = b"".join(record).decode("utf-8", errors="replace").rstrip("\r\n")
+                results.append((timestamp, level, message))
+                if len(results) >= max_results:
+                    return True
+        return False
+
+    for archive_path in archive_paths(log_file):
+        for block in load_index(archive_path):
+            if block_matches(block, since, until, levels):
+                if collect(iter_records(read_block(archive_path, block).splitlines(keepends=True))):
+                    return results, True
+
+    # Журналы, еще не сжатые в архив (файл исчезает после сжатия)
+    for rotated_path in rotated_paths(log_file):
+        try:
+            with open(rotated_path, "rb") as rotated:
+                if collect(iter_records(rotated)):
+                    return results, True
+        except FileNotFoundError:
+            continue
+
+    if os.path.exists(log_file):
+        with open(log_file, "rb") as current:
+            if collect(iter_records(current)):
+                return results, True
+    return results, False
+
+
+class ArchivingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Обработчик журнала с архивированием по размеру: заполненный журнал переименовывается,
+    а в фоновом потоке сжимается в архив <журнал>.<время>.gz с индексом,
+    поэтому запись новых сообщений не ждет сжатия. Хранятся последние backupCount архивов.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Сжатие журналов выполняется по одному
+        self._archive_lock = threading.Lock()
+
+    def doRollover(self):
+        """Переименование заполненного журнала, открытие нового и запуск сжатия."""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            name = f"{self.baseFilename}.{stamp}"
+            suffix = 1
+            while os.path.exists(name + ".gz") or os.path.exists(name + ROTATED_SUFFIX):
+                name = f"{self.baseFilename}.{stamp}_{suffix}"
+                suffix += 1
+            os.replace(self.baseFilename, name + ROTATED_SUFFIX)
+            threading.Thread(target=self.archive_rotated, name="log-archive").start()
+
+        if not self.delay:
+            self.stream = self._open()
+
+    def archive_rotated(self):
+        """
+        Сжатие переименованных журналов (в том числе оставшихся от прерванного запуска)
+        и удаление архивов сверх backupCount.
+        """
+        with self._archive_lock:
+            try:
+                for rotated_path in rotated_paths(self.baseFilename):
+                    write_archive(rotated_path, rotated_path[:-len(ROTATED_SUFFIX)] + ".gz")
+                    os.remove(rotated_path)
+
+                if self.backupCount > 0:
+                    for old_archive in archive_paths(self.baseFilename)[:-self.backupCount]:
+                        os.remove(old_archive)
+                        if os.path.exists(old_archive + INDEX_SUFFIX):
+                            os.remove(old_archive + INDEX_SUFFIX)
+            except OSError as e:
+                # Журнал недоступен для записи ошибок архивирования его же обработчиком
+                print(f"Ошибка архивирования журнала: {str(e)}", file=sys.stderr)
+
+
+def parse_time(value, end=False):
+    """
+    Преобразование даты или даты и времени в строку TIMESTAMP_FORMAT.
+    Дата без времени как конец интервала означает конец этого дня.
+
+    Args:
+        value: "ГГГГ-ММ-ДД" или "ГГГГ-ММ-ДД ЧЧ:ММ:СС"
+        end: Значение - конец интервала
+
+    Returns:
+        str: Время в формате TIMESTAMP_FORMAT
+    """
+    try:
+        return datetime.strptime(value, TIMESTAMP_FORMAT).strftime(TIMESTAMP_FORMAT)
+    except ValueError:
+        day = datetime.strptime(value, "%Y-%m-%d")
+    if end:
+        day += timedelta(days=1)
+    return day.strftime(TIMESTAMP_FORMAT)
+
+
+def main(argv=None):
+    """
+    Поиск в журнале и архивах с параметрами из командной строки.
+
+    Returns:
+        int: Код завершения процесса
+    """
+    parser = argparse.ArgumentParser(description="Поиск записей в журнале приложения и его архивах")
+    parser.add_argument("--log", default="app.log", help="Путь к журналу")
+    parser.add_argument("--level", action="append", choices=LOG_LEVELS,
+                        help="Уровень записей (можно указать несколько раз)")
+    parser.add_argument("--since", help="Начало интервала: ГГГГ-ММ-ДД или \"ГГГГ-ММ-ДД ЧЧ:ММ:СС\"")
+    parser.add_argument("--until", help="Конец интервала (дата без времени - включительно)")
+    parser.add_argument("--text", help="Подстрока сообщения")
+    parser.add_argument("--limit", type=int, default=SEARCH_MAX_RESULTS, help="Максимальное число записей")
+    args = parser.parse_args(argv)
+
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until, end=True) if args.until else None
+    except ValueError:
+        parser.error("время указывается в формате ГГГГ-ММ-ДД или \"ГГГГ-ММ-ДД ЧЧ:ММ:СС\"")
+
+    try:
+        results, truncated = search_logs(args.log, since, until, args.level, args.text, args.limit)
+    except (OSError, EOFError, gzip.BadGzipFile) as e:
+        print(f"Ошибка чтения журнала: {str(e)}", file=sys.stderr)
+        return 1
+
+    for _, _, message in results:
+        print(message)
+    print(f"Найдено записей: {len(results)}{' (показаны первые)' if truncated else ''}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,19 +1,122 @@
 """
 Модуль логирования для приложения "Театральный менеджер".
 Использует паттерн Singleton для хранения единственного экземпляра логгера.
+Запись в файл выполняется фоновым потоком, а новые записи добавляются
+в окно логов пакетами по таймеру. Дополнительно записи с полями событий
+могут сохраняться в формате JSON Lines для анализа.
 """
+import atexit
+import itertools
+import json
 import logging
+import logging.handlers
+import mmap
 import os
+import queue
+import time
+from collections import deque
 from datetime import datetime
-from PySide6.QtCore import Signal, QObject
+try:
+    from PySide6.QtCore import QTimer
+except ImportError:
+    # Без Qt логгер работает без окна логов (инструменты командной строки, моделирование)
+    QTimer = None
+from log_archive import ArchivingFileHandler, LOG_MAX_BYTES, LOG_BACKUP_COUNT
 
 
-class LogEmitter(QObject):
-    """Класс для отправки сигналов о новых записях лога в Qt интерфейс."""
-    new_log = Signal(str)
+# Интервал добавления накопленных записей в окно логов (мс)
+LOG_DISPLAY_FLUSH_MS = 200
+# Максимальное число записей, ожидающих вывода в окно логов (более старые отбрасываются)
+LOG_DISPLAY_MAX_PENDING = 5000
+# Журнал событий в формате JSON Lines и переменная окружения, включающая его (значение - путь к файлу)
+JSON_LOG_FILE = "app.jsonl"
+JSON_LOG_ENV = "THEATER_JSON_LOG"
 
 
-class Logger(QObject):
+class LogTailReader:
+    """
+    Чтение лог-файла с конца порциями строк.
+    Файл отображается в память, поэтому читаются только запрошенные строки,
+    а не весь файл.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Смещение начала самой ранней прочитанной строки (None - чтение еще не начиналось)
+        self.offset = None
+        # Идентификатор файла: после архивирования журнала более старых строк в нем нет
+        self._file_id = None
+
+    @property
+    def at_start(self):
+        """Прочитан ли файл до начала."""
+        return self.offset == 0
+
+    def read_previous(self, max_lines):
+        """
+        Чтение не более max_lines строк, предшествующих уже прочитанным
+        (при первом вызове - последних строк файла).
+
+        Returns:
+            list: Строки в порядке следования в файле
+        """
+        if self.at_start or max_lines <= 0:
+            return []
+
+        with open(self.path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            if self.offset is not None and (stat.st_dev, stat.st_ino) != self._file_id:
+                self.offset = 0
+                return []
+            self._file_id = (stat.st_dev, stat.st_ino)
+            size = stat.st_size
+            end = size if self.offset is None else min(self.offset, size)
+            if end == 0:
+                self.offset = 0
+                return []
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # Перевод строки в конце прочитанной части не начинает новую строку
+                limit = end - 1 if mm[end - 1] == ord("\n") else end
+                start = 0
+                position = limit
+                for _ in range(max_lines):
+                    newline = mm.rfind(b"\n", 0, position)
+                    if newline < 0:
+                        start = 0
+                        break
+                    position = newline
+                    start = newline + 1
+                chunk = mm[start:limit]
+
+        self.offset = start
+        return [line.rstrip("\r") for line in chunk.decode("utf-8", errors="replace").split("\n")]
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    Форматирование записи в строку JSON: время, уровень, имя события,
+    сообщение и поля события. Выполняется в фоновом потоке записи журнала.
+    """
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "event": getattr(record, "event", None),
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _is_text_record(record):
+    """Запись предназначена для текстового журнала (а не только для журнала событий)."""
+    return not getattr(record, "structured_only", False)
+
+
+class Logger:
     """
     Класс для логирования действий в приложении.
     Реализует паттерн Singleton для обеспечения единственного экземпляра логгера.
@@ -32,10 +135,16 @@ class Logger(QObject):
         if hasattr(self, '_initialized') and self._initialized:
             return
 
-        super().__init__()
         self.logger = logging.getLogger(__name__)
-        self.emitter = LogEmitter()
+        self.log_file = log_file
         self._main_window_log_display = None
+        self._display_timer = None
+        # Записи для окна логов: (номер, время, уровень, сообщение); deque безопасна для нескольких потоков
+        self._pending = deque(maxlen=LOG_DISPLAY_MAX_PENDING)
+        # Возрастающие номера записей окна логов (next() атомарен для нескольких потоков)
+        self._display_ids = itertools.count(1)
+        # Обработчик журнала событий JSON (None - структурированный журнал отключен)
+        self._json_handler = None
         self._initialized = True
 
         # Очистка старых обработчиков если они есть
@@ -50,45 +159,144 @@ class Logger(QObject):
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-        # Настройка обработчика файла и форматтера
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        # Настройка обработчика файла и форматтера (с архивированием заполненного журнала)
+        file_handler = ArchivingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                            encoding='utf-8')
         formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        file_handler.addFilter(_is_text_record)
+
+        # Вызывающий поток только помещает запись в очередь, в файл ее записывает фоновый поток
+        self._queue = queue.Queue()
+        self.logger.addHandler(logging.handlers.QueueHandler(self._queue))
+        self._listener = logging.handlers.QueueListener(self._queue, file_handler)
+        self._listener.start()
+        # Запись оставшихся в очереди сообщений при завершении программы
+        atexit.register(self._listener.stop)
+
+        if os.environ.get(JSON_LOG_ENV):
+            self.enable_json_log(os.environ[JSON_LOG_ENV])
+
+    def enable_json_log(self, path=JSON_LOG_FILE):
+        """
+        Включение журнала событий в формате JSON Lines (одна запись - одна строка JSON).
+        Записи сериализуются фоновым потоком записи журнала.
+        """
+        if self._json_handler is not None:
+            return
+        json_handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES,
+                                                            backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+        json_handler.setFormatter(JsonLogFormatter())
+        self._json_handler = json_handler
+        # Поток записи читает список обработчиков при обработке каждой записи
+        self._listener.handlers = self._listener.handlers + (json_handler,)
+
+    @property
+    def structured(self):
+        """Включен ли журнал событий JSON."""
+        return self._json_handler is not None
+
+    def flush(self):
+        """
+        Ожидание записи в файл всех сообщений, помещенных в очередь.
+
+        Returns:
+            int: Отметка для discard_pending_display: записи окна логов с меньшими номерами
+                 помещены в очередь до ожидания и уже есть в файле
+        """
+        # Сообщение попадает в очередь раньше, чем его запись получает номер
+        marker = next(self._display_ids)
+        self._queue.join()
+        return marker
+
+    def discard_pending_display(self, marker):
+        """
+        Отбрасывание записей, ожидающих вывода в окно логов и уже записанных в файл
+        (например, после загрузки лог-файла). Более новые записи остаются в очереди вывода.
+
+        Args:
+            marker: Отметка, возвращенная flush
+        """
+        while self._pending and self._pending[0][0] < marker:
+            self._pending.popleft()
 
     def set_main_window_log_display(self, log_display):
         """Связывает текстовое поле в главном окне с логгером для отображения логов."""
         self._main_window_log_display = log_display
-        self.emitter.new_log.connect(self._update_log_display)
+        self._pending.clear()
+        # Накопленные записи выводятся одним добавлением по таймеру в потоке интерфейса
+        self._display_timer = QTimer(log_display)
+        self._display_timer.setInterval(LOG_DISPLAY_FLUSH_MS)
+        self._display_timer.timeout.connect(self._update_log_display)
+        self._display_timer.start()
         # Прокрутка вниз для показа последних логов
         if self._main_window_log_display:
             scrollbar = self._main_window_log_display.verticalScrollBar()
             scrollbar.setValue(scrollbar.maximum())
 
-    def _update_log_display(self, message):
-        """Обновляет отображение логов в интерфейсе пользователя."""
-        if self._main_window_log_display:
-            self._main_window_log_display.append(message)
-            # Прокручивание до самых новых сообщений
-            scrollbar = self._main_window_log_display.verticalScrollBar()
+    def _update_log_display(self):
+        """Добавляет накопленные записи в окно логов интерфейса пользователя."""
+        if not self._main_window_log_display or not self._pending:
+            return
+        lines = []
+        while self._pending:
+            _, created, level, message = self._pending.popleft()
+            lines.append(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(created))} - {level} - {message}")
+        # Прокручивание до самых новых сообщений, если пользователь не просматривает старые записи
+        scrollbar = self._main_window_log_display.verticalScrollBar()
+        follow = scrollbar.value() == scrollbar.maximum()
+        self._main_window_log_display.appendPlainText("\n".join(lines))
+        if follow:
             scrollbar.setValue(scrollbar.maximum())
 
-    def info(self, message):
-        """Запись информационного сообщения в лог."""
-        self.logger.info(message)
-        self.emitter.new_log.emit(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - INFO - {message}")
-
-    def warning(self, message):
-        """Запись предупреждения в лог."""
-        self.logger.warning(message)
-        self.emitter.new_log.emit(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - WARNING - {message}")
-
-    def error(self, message):
-        """Запись сообщения об ошибке в лог."""
-        self.logger.error(message)
-        self.emitter.new_log.emit(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - ERROR - {message}")
-
-    def debug(self, message):
-        """Запись отладочного сообщения в лог."""
-        self.logger.debug(message)
-        self.emitter.new_log.emit(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - DEBUG - {message}")
\ No newline at end of file
+    def _display(self, level, message):
+        """Постановка записи в очередь вывода в окно логов (если оно подключено)."""
+        if self._main_window_log_display is not None:
+            self._pending.append((next(self._display_ids), time.time(), level, message))
+
+    @staticmethod
+    def _extra(event, fields):
+        """Имя и поля события для журнала событий JSON."""
+        if event is None and not fields:
+            return None
+        return {"event": event, "fields": fields}
+
+    def info(self, message, event=None, **fields):
+        """
+        Запись информационного сообщения в лог.
+
+        Args:
+            message: Текст сообщения
+            event: Имя события для журнала событий JSON
+            fields: Поля события (performance_id, actor_id, revenue и т.п.)
+        """
+        self.logger.info(message, extra=self._extra(event, fields))
+        self._display("INFO", message)
+
+    def warning(self, message, event=None, **fields):
+        """Запись предупреждения в лог (параметры - как у info)."""
+        self.logger.warning(message, extra=self._extra(event, fields))
+        self._display("WARNING", message)
+
+    def error(self, message, event=None, **fields):
+        """Запись сообщения об ошибке в лог (параметры - как у info)."""
+        self.logger.error(message, extra=self._extra(event, fields))
+        self._display("ERROR", message)
+
+    def debug(self, message, event=None, **fields):
+        """Запись отладочного сообщения в лог (параметры - как у info)."""
+        self.logger.debug(message, extra=self._extra(event, fields))
+        self._display("DEBUG", message)
+
+    def metric(self, event, **fields):
+        """
+        Запись события только в журнал событий JSON (например, длительности операций).
+        Если журнал событий отключен, ничего не делает.
+
+        Args:
+            event: Имя события
+            fields: Поля события
+        """
+        if self._json_handler is None:
+            return
+        self.logger.info(event, extra={"event": event, "fields": fields, "structured_only": True})
\ No newline at end of file
@@ -0,0 +1,858 @@
+"""
+Модуль хранилища данных театра в памяти процесса.
+InMemoryRepository реализует TheaterRepository без БД: строки таблиц хранятся
+в списках по индексу ID - 1 (удаленные строки - None), ограничения схемы
+(уникальность, внешние ключи, проверки значений) проверяются при изменении.
+Строки имеют те же столбцы и типы значений, что и строки DatabaseManager:
+целые столбцы приводятся к int и проверяются по диапазонам INTEGER и BIGINT.
+Изменения записываются в журнал отмены, поэтому ошибка шага откатывает вызов,
+а внутри transaction() - всю единицу работы.
+Используется для массового моделирования сезонов и проверки логики
+TheaterController без сервера PostgreSQL. Успешные изменения не пишутся
+в журнал приложения, чтобы не замедлять моделирование; ошибки пишутся.
+"""
+import csv
+import os
+import threading
+from contextlib import contextmanager
+from functools import partial, wraps
+from data import ActorRank, ACTOR_SORT_COLUMNS, PERFORMANCE_SORT_COLUMNS, PAGE_SIZE, SAMPLE_FIXTURE_DIR, FIXTURE_TABLES
+from logger import Logger
+from repository import TheaterRepository, TransactionState
+
+
+# Столбцы таблиц в порядке схемы БД (строки возвращаются с теми же ключами, что и SELECT *)
+TABLE_COLUMNS = {
+    "game_data": ("id", "current_year", "capital"),
+    "actors": ("actor_id", "last_name", "first_name", "patronymic", "rank", "awards_count", "experience"),
+    "plots": ("plot_id", "title", "minimum_budget", "production_cost", "roles_count", "demand", "required_ranks"),
+    "performances": ("performance_id", "title", "plot_id", "year", "budget", "revenue", "is_completed"),
+    "actor_performances": ("actor_id", "performance_id", "role", "contract_cost"),
+}
+# Значения по умолчанию столбцов (как DEFAULT в схеме БД)
+COLUMN_DEFAULTS = {
+    "game_data": {"id": 1, "current_year": 2025, "capital": 1000000},
+    "actors": {"rank": ActorRank.BEGINNER.value, "awards_count": 0, "experience": 0},
+    "plots": {"required_ranks": [ActorRank.BEGINNER.value]},
+    "performances": {"revenue": 0, "is_completed": False},
+    "actor_performances": {},
+}
+# Типы столбцов фикстур (остальные столбцы - строки)
+INTEGER_COLUMNS = {"id", "current_year", "capital", "actor_id", "plot_id", "performance_id", "awards_count",
+                   "experience", "minimum_budget", "production_cost", "roles_count", "demand", "year", "budget",
+                   "revenue", "contract_cost"}
+# Целые столбцы типа BIGINT (остальные - INTEGER) и диапазоны значений типов
+BIGINT_COLUMNS = {"capital"}
+INTEGER_RANGE = (-2 ** 31, 2 ** 31 - 1)
+BIGINT_RANGE = (-2 ** 63, 2 ** 63 - 1)
+BOOLEAN_COLUMNS = {"is_completed"}
+ARRAY_COLUMNS = {"required_ranks"}
+# Минимальное число актеров труппы (см. DatabaseManager.delete_actor)
+MIN_ACTORS = 8
+# Атрибуты InMemoryRepository с таблицами и индексами
+STATE_ATTRIBUTES = ("_game_data", "_actors", "_plots", "_performances", "_casts",
+                    "_actor_names", "_plot_titles", "_performance_years")
+# Порядок званий как у перечисления actor_rank в БД
+RANK_ORDER = {rank.value: index for index, rank in enumerate(ActorRank)}
+
+
+class ConstraintError(ValueError):
+    """Нарушение ограничения схемы (проверки значения, внешнего ключа)."""
+
+
+class UniqueViolation(ConstraintError):
+    """Нарушение уникальности ключа (при загрузке фикстур строка пропускается)."""
+
+
+def _modifies(description, on_error, with_message=False):
+    """
+    Декоратор изменяющих методов InMemoryRepository.
+    Выполняет вызов под блокировкой хранилища; при ошибке отменяет изменения
+    вызова, помечает открытую транзакцию как неудачную и пишет ошибку в журнал.
+
+    Args:
+        description: Описание операции для сообщения об ошибке
+        on_error: Значение, возвращаемое при ошибке
+        with_message: Возвращать при ошибке кортеж (on_error, сообщение)
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self._lock:
+                mark = len(self._undo)
+                try:
+                    result = method(self, *args, **kwargs)
+                except (ValueError, OSError) as e:
+                    self._revert(mark)
+                    if self._transaction is not None:
+                        self._transaction.failed = True
+                    self.logger.error(f"Ошибка {description}: {str(e)}")
+                    return (on_error, str(e)) if with_message else on_error
+                # Вне транзакции изменения вызова сразу становятся окончательными
+                if self._transaction is None:
+                    self._undo.clear()
+                return result
+        return wrapper
+    return decorator
+
+
+def _reads(method):
+    """Декоратор читающих методов InMemoryRepository: вызов под блокировкой хранилища."""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _full_name(row):
+    """Ключ уникальности ФИО актера (None, если отчество не задано - как NULL в UNIQUE)."""
+    if row["patronymic"] is None:
+        return None
+    return row["last_name"], row["first_name"], row["patronymic"]
+
+
+def _keyset_page(rows, sort_key, cursor, descending, limit):
+    """
+    Страница строк в порядке sort_key после строки с ключом cursor (keyset-пагинация).
+
+    Args:
+        rows: Строки таблицы
+        sort_key: Функция ключа сортировки строки (значение столбца, уникальный ключ)
+        cursor: Ключ последней строки предыдущей страницы (None - первая страница)
+        descending: Сортировка по убыванию
+        limit: Размер страницы
+    """
+    rows = sorted(rows, key=sort_key, reverse=descending)
+    if cursor is not None:
+        if descending:
+            rows = [row for row in rows if sort_key(row) < cursor]
+        else:
+            rows = [row for row in rows if sort_key(row) > cursor]
+    return rows[:limit]
+
+
+def _check(condition, message):
+    """Проверка ограничения схемы."""
+    if not condition:
+        raise ConstraintError(message)
+
+
+def _integer_value(column, value):
+    """
+    Приведение значения целого столбца как при записи в PostgreSQL: дробное число
+    округляется (до четного при половине, как rint), значение вне диапазона типа - ошибка.
+    """
+    try:
+        value = round(value) if isinstance(value, float) else int(value)
+    except (OverflowError, ValueError, TypeError):
+        raise ConstraintError(f"Недопустимое целое значение столбца {column}: {value}")
+    low, high = BIGINT_RANGE if column in BIGINT_COLUMNS else INTEGER_RANGE
+    _check(low <= value <= high, f"Значение столбца {column} вне диапазона: {value}")
+    return value
+
+
+def _column_value(column, value):
+    """Значение столбца с приведением типа (NULL сохраняется)."""
+    if value is None or column not in INTEGER_COLUMNS:
+        return value
+    return _integer_value(column, value)
+
+
+def _column_values(values):
+    """Словарь значений столбцов с приведением типов."""
+    return {column: _column_value(column, value) for column, value in values.items()}
+
+
+def _parse_value(column, text):
+    """Преобразование значения CSV-файла фикстуры к типу столбца (пустое значение - NULL)."""
+    if text is None or text == "":
+        return None
+    if column in INTEGER_COLUMNS:
+        return int(text)
+    if column in BOOLEAN_COLUMNS:
+        value = text.strip().lower()
+        if value not in ("true", "t", "1", "false", "f", "0"):
+            raise ValueError(f"Недопустимое логическое значение столбца {column}: {text}")
+        return value in ("true", "t", "1")
+    if column in ARRAY_COLUMNS:
+        items = text.strip().strip("{}")
+        return [item.strip().strip('"') for item in items.split(",")] if items else []
+    return text
+
+
+class InMemoryRepository(TheaterRepository):
+    """
+    Хранилище данных театра в памяти процесса.
+    Транзакции сериализуются блокировкой хранилища: пока одна транзакция
+    открыта, вызовы из других потоков ожидают ее завершения.
+    """
+
+    def __init__(self):
+        """Инициализация пустого хранилища (игровые данные создает create_schema)."""
+        self.logger = Logger()
+        self._lock = threading.RLock()
+        self._transaction = None
+        # Журнал отмены: функции, восстанавливающие состояние, в порядке изменений
+        self._undo = []
+        self._clear()
+
+    def _clear(self):
+        """Создание пустых таблиц."""
+        self._game_data = None
+        self._actors = []
+        self._plots = []
+        self._performances = []
+        # Составы спектаклей: ID спектакля -> {ID актера: строка actor_performances}
+        self._casts = {}
+        # Индексы уникальных ключей
+        self._actor_names = {}
+        self._plot_titles = {}
+        self._performance_years = {}
+
+    def _state(self):
+        """Текущие таблицы и индексы (для отмены полной очистки)."""
+        return {name: getattr(self, name) for name in STATE_ATTRIBUTES}
+
+    def _restore(self, state):
+        """Восстановление таблиц и индексов, сохраненных _state."""
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def _revert(self, mark):
+        """Отмена изменений, записанных в журнал после позиции mark."""
+        while len(self._undo) > mark:
+            self._undo.pop()()
+
+    def _set(self, row, column, value):
+        """Изменение значения столбца строки с записью в журнал отмены."""
+        value = _column_value(column, value)
+        self._undo.append(partial(row.__setitem__, column, row[column]))
+        row[column] = value
+
+    def _index_set(self, index, key, value):
+        """Добавление ключа в индекс с записью в журнал отмены."""
+        if key in index:
+            self._undo.append(partial(index.__setitem__, key, index[key]))
+        else:
+            self._undo.append(partial(index.pop, key))
+        index[key] = value
+
+    def _index_remove(self, index, key):
+        """Удаление ключа из индекса с записью в журнал отмены."""
+        if key in index:
+            self._undo.append(partial(index.__setitem__, key, index.pop(key)))
+
+    def _put(self, rows, id_column, row):
+        """
+        Вставка строки в таблицу-список по ее ID (без ID - следующий номер, как SERIAL).
+
+        Returns:
+            int: ID строки
+        """
+        row_id = row[id_column]
+        if row_id is None:
+            row_id = row[id_column] = len(rows) + 1
+        elif row_id < 1:
+            raise ConstraintError(f"Недопустимый ключ {id_column}={row_id}")
+        elif row_id <= len(rows) and rows[row_id - 1] is not None:
+            raise UniqueViolation(f"Строка с ключом {id_column}={row_id} уже существует")
+
+        length = len(rows)
+        rows.extend([None] * (row_id - length))
+        rows[row_id - 1] = row
+        self._undo.append(partial(self._unput, rows, length, row_id))
+        return row_id
+
+    @staticmethod
+    def _unput(rows, length, row_id):
+        """Отмена _put: восстановление длины таблицы и пустого места строки."""
+        del rows[length:]
+        if row_id <= length:
+            rows[row_id - 1] = None
+
+    @staticmethod
+    def _row(rows, row_id):
+        """Строка таблицы по ID или None."""
+        if isinstance(row_id, int) and 0 < row_id <= len(rows):
+            return rows[row_id - 1]
+        return None
+
+    @staticmethod
+    def _new_row(table, values):
+        """Строка таблицы из значений столбцов с учетом значений по умолчанию."""
+        defaults = COLUMN_DEFAULTS[table]
+        return {column: _column_value(column, values[column] if values.get(column) is not None
+                                      else defaults.get(column))
+                for column in TABLE_COLUMNS[table]}
+
+    def _check_actor(self, row):
+        """Проверка ограничений строки актера."""
+        _check(row["last_name"] is not None and row["first_name"] is not None, "Не заданы фамилия или имя актера")
+        _check(row["rank"] in RANK_ORDER, f"Недопустимое звание актера: {row['rank']}")
+        _check(row["awards_count"] >= 0, "Количество наград не может быть отрицательным")
+        _check(row["experience"] >= 0, "Опыт не может быть отрицательным")
+
+    def _insert_actor(self, row):
+        """Добавление актера с проверкой ограничений и уникальности ФИО."""
+        self._check_actor(row)
+        key = _full_name(row)
+        if key is not None and key in self._actor_names:
+            raise UniqueViolation("Актер с таким ФИО уже существует")
+        actor_id = self._put(self._actors, "actor_id", row)
+        if key is not None:
+            self._index_set(self._actor_names, key, actor_id)
+        return actor_id
+
+    def _insert_plot(self, row):
+        """Добавление сюжета с проверкой ограничений и уникальности названия."""
+        _check(row["title"] is not None, "Не задано название сюжета")
+        _check(row["minimum_budget"] > 0 and row["production_cost"] > 0, "Бюджет сюжета должен быть положительным")
+        _check(row["roles_count"] >= 1, "Число ролей должно быть не меньше 1")
+        _check(1 <= row["demand"] <= 10, "Спрос должен быть от 1 до 10")
+        _check(all(rank in RANK_ORDER for rank in row["required_ranks"]), "Недопустимое звание в требованиях")
+        if row["title"] in self._plot_titles:
+            raise UniqueViolation(f"Сюжет '{row['title']}' уже существует")
+        plot_id = self._put(self._plots, "plot_id", row)
+        self._index_set(self._plot_titles, row["title"], plot_id)
+        return plot_id
+
+    def _insert_performance(self, row):
+        """Добавление спектакля с проверкой сюжета, года и бюджета."""
+        _check(row["title"] is not None, "Не задано название спектакля")
+        _check(self._row(self._plots, row["plot_id"]) is not None, f"Сюжет с ID {row['plot_id']} не найден")
+        _check(row["year"] >= 2022, "Год постановки не может быть раньше 2022")
+        _check(row["budget"] > 0, "Бюджет должен быть положительным")
+        _check(row["revenue"] >= 0, "Выручка не может быть отрицательной")
+        if row["year"] in self._performance_years:
+            raise UniqueViolation(f"Спектакль {row['year']} года уже существует")
+        performance_id = self._put(self._performances, "performance_id", row)
+        self._index_set(self._performance_years, row["year"], performance_id)
+        return performance_id
+
+    def _insert_cast_row(self, row):
+        """Назначение актера на роль с проверкой внешних ключей и уникальности пары."""
+        _check(self._row(self._actors, row["actor_id"]) is not None, f"Актер с ID {row['actor_id']} не найден")
+        _check(self._row(self._performances, row["performance_id"]) is not None,
+               f"Спектакль с ID {row['performance_id']} не найден")
+        _check(row["role"] is not None, "Не задана роль")
+        _check(row["contract_cost"] is not None and row["contract_cost"] > 0,
+               "Стоимость контракта должна быть положительной")
+
+        cast = self._casts.get(row["performance_id"])
+        if cast is None:
+            cast = self._casts[row["performance_id"]] = {}
+            self._undo.append(partial(self._casts.pop, row["performance_id"]))
+        if row["actor_id"] in cast:
+            raise UniqueViolation(f"Актер {row['actor_id']} уже занят в спектакле {row['performance_id']}")
+        cast[row["actor_id"]] = row
+        self._undo.append(partial(cast.pop, row["actor_id"]))
+
+    def _set_game_data(self, row):
+        """Запись строки игровых данных с проверкой ограничений."""
+        row = _column_values(row)
+        _check(row["id"] == 1, "Строка игровых данных должна иметь id = 1")
+        _check(row["current_year"] >= 2022, "Год не может быть раньше 2022")
+        _check(row["capital"] >= 0, "Капитал не может быть отрицательным")
+        self._undo.append(partial(setattr, self, "_game_data", self._game_data))
+        self._game_data = row
+
+    def _performance_view(self, row):
+        """Строка спектакля с названием сюжета (как p.*, pl.title AS plot_title)."""
+        return dict(row, plot_title=self._plots[row["plot_id"] - 1]["title"])
+
+    def schema_exists(self):
+        """Созданы ли игровые данные."""
+        return self._game_data is not None
+
+    @_modifies("создания схемы", on_error=False)
+    def create_schema(self):
+        """Создание начальных игровых данных (таблицы в памяти существуют всегда)."""
+        if self._game_data is None:
+            self._set_game_data(dict(COLUMN_DEFAULTS["game_data"]))
+        return True
+
+    @contextmanager
+    def transaction(self):
+        """
+        Единица работы: изменения внутри блока сохраняются при выходе
+        или отменяются по журналу отмены. Вложенные блоки присоединяются
+        к внешней транзакции.
+
+        Yields:
+            TransactionState: Состояние транзакции
+        """
+        with self._lock:
+            if self._transaction is not None:
+                yield self._transaction
+                return
+
+            state = TransactionState()
+            self._transaction = state
+            try:
+                yield state
+            except BaseException:
+                state.failed = True
+                raise
+            finally:
+                self._transaction = None
+                if state.failed:
+                    self._revert(0)
+                    self.logger.error("Транзакция отменена")
+                else:
+                    state.committed = True
+                self._undo.clear()
+
+    @_modifies("добавления тестовых данных", on_error=False)
+    def init_sample_data(self, fixture_dir=None):
+        """
+        Загрузка данных из набора CSV-файлов (фикстуры).
+
+        Args:
+            fixture_dir: Каталог с файлами <таблица>.csv (по умолчанию - тестовые данные)
+
+        Returns:
+            bool: Успешность инициализации
+        """
+        self._load_fixtures(fixture_dir or SAMPLE_FIXTURE_DIR)
+        return True
+
+    def _load_fixtures(self, fixture_dir):
+        """
+        Загрузка всех таблиц фикстуры. Строки с уже существующими ключами
+        пропускаются (как ON CONFLICT DO NOTHING).
+
+        Args:
+            fixture_dir: Каталог с файлами <таблица>.csv
+        """
+        inserters = {
+            "game_data": self._insert_game_data,
+            "actors": self._insert_actor,
+            "plots": self._insert_plot,
+            "performances": self._insert_performance,
+            "actor_performances": self._insert_cast_row,
+        }
+        for table in FIXTURE_TABLES:
+            path = os.path.join(fixture_dir, f"{table}.csv")
+            if not os.path.exists(path):
+                continue
+            with open(path, newline="", encoding="utf-8") as fixture_file:
+                reader = csv.DictReader(fixture_file)
+                if not reader.fieldnames:
+                    raise ValueError(f"Файл фикстуры {path} не содержит заголовка")
+                for values in reader:
+                    row = self._new_row(table, {column.strip(): _parse_value(column.strip(), text)
+                                                for column, text in values.items()})
+                    try:
+                        inserters[table](row)
+                    except UniqueViolation:
+                        pass
+
+        # Начальные игровые данные, если фикстура их не содержит
+        if self._game_data is None:
+            self._set_game_data(dict(COLUMN_DEFAULTS["game_data"]))
+
+    def _insert_game_data(self, row):
+        """Загрузка строки игровых данных из фикстуры (существующая строка сохраняется)."""
+        if self._game_data is not None:
+            raise UniqueViolation("Игровые данные уже существуют")
+        self._set_game_data(row)
+
+    @_modifies("сброса данных", on_error=False)
+    def reset_database(self, fixture_dir=None):
+        """
+        Сброс всех данных к начальному состоянию фикстуры.
+
+        Args:
+            fixture_dir: Каталог фикстуры (по умолчанию - тестовые данные)
+
+        Returns:
+            bool: Успешность сброса
+        """
+        self._undo.append(partial(self._restore, self._state()))
+        self._clear()
+        self._load_fixtures(fixture_dir or SAMPLE_FIXTURE_DIR)
+        return True
+
+    @_reads
+    def get_actors(self):
+        """
+        Получение списка всех актеров.
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+        return [dict(actor) for actor in self._actors if actor is not None]
+
+    @_reads
+    def get_actors_page(self, after_id=None, limit=PAGE_SIZE, order_by="actor_id", descending=False,
+                        after_value=None):
+        """
+        Постраничное получение актеров в порядке (order_by, actor_id)
+        после строки (after_value, after_id).
+
+        Args:
+            after_id: ID последнего актера предыдущей страницы (None - первая страница)
+            limit: Размер страницы
+            order_by: Столбец сортировки (ключ ACTOR_SORT_COLUMNS)
+            descending: Сортировка по убыванию
+            after_value: Значение столбца сортировки у последнего актера предыдущей страницы
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+        if order_by not in ACTOR_SORT_COLUMNS:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+
+        def sort_value(value):
+            if order_by == "patronymic":
+                return value or ""
+            if order_by == "rank":
+                return RANK_ORDER.get(value)
+            return value
+
+        cursor = None
+        if after_id is not None:
+            if order_by == "actor_id":
+                cursor = (after_id, after_id)
+            elif sort_value(after_value) is None:
+                # Сравнение с NULL в БД не выбирает ни одной строки
+                return []
+            else:
+                cursor = (sort_value(after_value), after_id)
+
+        actors = _keyset_page((actor for actor in self._actors if actor is not None),
+                              lambda actor: (sort_value(actor[order_by]), actor["actor_id"]),
+                              cursor, descending, limit)
+        return [dict(actor) for actor in actors]
+
+    @_reads
+    def get_plots(self):
+        """
+        Получение списка всех сюжетов в порядке названий.
+
+        Returns:
+            list: Список словарей с данными сюжетов
+        """
+        plots = sorted((plot for plot in self._plots if plot is not None), key=lambda plot: plot["title"])
+        return [dict(plot, required_ranks=list(plot["required_ranks"])) for plot in plots]
+
+    @_reads
+    def get_plot(self, plot_id):
+        """
+        Получение сюжета по его ID.
+
+        Returns:
+            dict or None: Данные сюжета или None, если он не найден
+        """
+        plot = self._row(self._plots, plot_id)
+        return dict(plot, required_ranks=list(plot["required_ranks"])) if plot is not None else None
+
+    @_reads
+    def get_performances(self, year=None):
+        """
+        Получение спектаклей (с названием сюжета), всех - от новых к старым, или за год.
+
+        Returns:
+            list: Список словарей с данными спектаклей
+        """
+        if year:
+            performance = self._row(self._performances, self._performance_years.get(year))
+            return [self._performance_view(performance)] if performance is not None else []
+        performances = sorted((row for row in self._performances if row is not None),
+                              key=lambda row: row["year"], reverse=True)
+        return [self._performance_view(row) for row in performances]
+
+    @_reads
+    def get_performances_page(self, after_year=None, limit=PAGE_SIZE, order_by="year", descending=True,
+                              after_value=None):
+        """
+        Постраничное получение спектаклей с полем profit в порядке (order_by, year)
+        после строки (after_value, after_year).
+
+        Args:
+            after_year: Год последнего спектакля предыдущей страницы (None - первая страница)
+            limit: Размер страницы
+            order_by: Столбец сортировки (ключ PERFORMANCE_SORT_COLUMNS)
+            descending: Сортировка по убыванию (по умолчанию - от новых к старым)
+            after_value: Значение столбца сортировки у последнего спектакля предыдущей страницы
+
+        Returns:
+            list: Список словарей с данными спектаклей и полем profit
+        """
+        if order_by not in PERFORMANCE_SORT_COLUMNS:
+            raise ValueError(f"Недопустимый столбец сортировки: {order_by}")
+
+        cursor = None
+        if after_year is not None:
+            if order_by == "year":
+                cursor = (after_year, after_year)
+            elif after_value is None:
+                # Сравнение с NULL в БД не выбирает ни одной строки
+                return []
+            else:
+                cursor = (after_value, after_year)
+
+        performances = [self._performance_view(row) for row in self._performances if row is not None]
+        for row in performances:
+            row["profit"] = row["revenue"] - row["budget"]
+        return _keyset_page(performances, lambda row: (row[order_by], row["year"]), cursor, descending, limit)
+
+    @_reads
+    def get_performance(self, performance_id):
+        """
+        Получение спектакля по его ID.
+
+        Returns:
+            dict or None: Данные спектакля или None, если он не найден
+        """
+        performance = self._row(self._performances, performance_id)
+        return self._performance_view(performance) if performance is not None else None
+
+    @_reads
+    def get_actors_in_performance(self, performance_id):
+        """
+        Получение актеров спектакля с ролями по убыванию стоимости контракта.
+
+        Returns:
+            list: Список словарей с данными актеров и их ролей
+        """
+        actors = [dict(self._actors[actor_id - 1], role=row["role"], contract_cost=row["contract_cost"])
+                  for actor_id, row in self._casts.get(performance_id, {}).items()]
+        actors.sort(key=lambda actor: actor["contract_cost"], reverse=True)
+        return actors
+
+    @_reads
+    def get_game_data(self):
+        """
+        Получение игровых данных (текущий год и капитал).
+
+        Returns:
+            dict or None: Словарь с игровыми данными
+        """
+        return dict(self._game_data) if self._game_data is not None else None
+
+    @_modifies("обновления игровых данных", on_error=False)
+    def update_game_data(self, year, capital):
+        """
+        Обновление игровых данных.
+
+        Returns:
+            bool: Успешность обновления
+        """
+        if self._game_data is not None:
+            self._set_game_data(dict(self._game_data, current_year=year, capital=capital))
+        return True
+
+    @_modifies("добавления актера", on_error=None)
+    def add_actor(self, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Добавление нового актера.
+
+        Returns:
+            int or None: ID добавленного актера или None при ошибке
+        """
+        return self._insert_actor(self._new_row("actors", {
+            "last_name": last_name, "first_name": first_name, "patronymic": patronymic,
+            "rank": rank, "awards_count": awards_count, "experience": experience}))
+
+    @_modifies("импорта актеров", on_error=None)
+    def import_actors(self, rows, chunk_size=None):
+        """
+        Массовый импорт актеров: добавление или обновление по ФИО.
+        При повторении ФИО во входных данных используется последняя строка.
+
+        Args:
+            rows: Итерируемый источник кортежей
+                (номер строки, фамилия, имя, отчество, звание, награды, опыт)
+            chunk_size: Не используется (совместимость с DatabaseManager.import_actors)
+
+        Returns:
+            tuple or None: (число добавленных, число обновленных) или None при ошибке
+        """
+        latest = {}
+        for line_no, last_name, first_name, patronymic, rank, awards_count, experience in rows:
+            key = (last_name, first_name, patronymic or "")
+            if key not in latest or latest[key][0] < line_no:
+                latest[key] = (line_no, rank, awards_count, experience)
+
+        inserted = updated = 0
+        for (last_name, first_name, patronymic), (_, rank, awards_count, experience) in latest.items():
+            awards_count = _column_value("awards_count", awards_count)
+            experience = _column_value("experience", experience)
+            actor_id = self._actor_names.get((last_name, first_name, patronymic))
+            if actor_id is None:
+                self._insert_actor(self._new_row("actors", {
+                    "last_name": last_name, "first_name": first_name, "patronymic": patronymic,
+                    "rank": rank, "awards_count": awards_count, "experience": experience}))
+                inserted += 1
+            else:
+                actor = self._actors[actor_id - 1]
+                self._check_actor(dict(actor, rank=rank, awards_count=awards_count, experience=experience))
+                self._set(actor, "rank", rank)
+                self._set(actor, "awards_count", awards_count)
+                self._set(actor, "experience", experience)
+                updated += 1
+        return inserted, updated
+
+    @_modifies("обновления актера", on_error=False, with_message=True)
+    def update_actor(self, actor_id, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Обновление данных актера.
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+        actor = self._row(self._actors, actor_id)
+        if actor is None:
+            self.logger.error(f"Актер с ID {actor_id} не найден")
+            return False, "Актер не найден"
+
+        values = _column_values({"last_name": last_name, "first_name": first_name, "patronymic": patronymic,
+                                 "rank": rank, "awards_count": awards_count, "experience": experience})
+        updated = dict(actor, **values)
+        self._check_actor(updated)
+        old_key, new_key = _full_name(actor), _full_name(updated)
+        if new_key != old_key:
+            if new_key is not None and new_key in self._actor_names:
+                raise UniqueViolation("Актер с таким ФИО уже существует")
+            if old_key is not None:
+                self._index_remove(self._actor_names, old_key)
+            if new_key is not None:
+                self._index_set(self._actor_names, new_key, actor_id)
+        for column, value in values.items():
+            self._set(actor, column, value)
+        return True, ""
+
+    @_modifies("удаления актера", on_error=False, with_message=True)
+    def delete_actor(self, actor_id):
+        """
+        Удаление актера (только если он не занят в текущих постановках).
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+        casts = [(performance_id, cast) for performance_id, cast in self._casts.items() if actor_id in cast]
+        if any(not self._performances[performance_id - 1]["is_completed"] for performance_id, _ in casts):
+            self.logger.error(f"Актер с ID {actor_id} занят в текущих постановках")
+            return False, "Актер занят в текущих постановках"
+
+        if sum(1 for actor in self._actors if actor is not None) <= MIN_ACTORS:
+            self.logger.error(f"Невозможно удалить актера: минимальное число актеров - {MIN_ACTORS}")
+            return False, f"Минимальное число актеров - {MIN_ACTORS}"
+
+        # Удаление всех связей с прошлыми постановками и самого актера
+        for _, cast in casts:
+            self._undo.append(partial(cast.__setitem__, actor_id, cast.pop(actor_id)))
+        actor = self._row(self._actors, actor_id)
+        if actor is not None:
+            if _full_name(actor) is not None:
+                self._index_remove(self._actor_names, _full_name(actor))
+            self._undo.append(partial(self._actors.__setitem__, actor_id - 1, actor))
+            self._actors[actor_id - 1] = None
+        return True, ""
+
+    @_modifies("создания спектакля", on_error=None)
+    def create_performance(self, title, plot_id, year, budget):
+        """
+        Создание нового незавершенного спектакля.
+
+        Returns:
+            int or None: ID созданного спектакля или None при ошибке
+        """
+        return self._insert_performance(self._new_row("performances", {
+            "title": title, "plot_id": plot_id, "year": year, "budget": budget}))
+
+    @_modifies("назначения актера", on_error=False)
+    def assign_actor_to_role(self, actor_id, performance_id, role, contract_cost):
+        """
+        Назначение актера на роль в спектакле.
+
+        Returns:
+            bool: Успешность назначения
+        """
+        self._insert_cast_row(self._new_row("actor_performances", {
+            "actor_id": actor_id, "performance_id": performance_id, "role": role, "contract_cost": contract_cost}))
+        return True
+
+    @_modifies("назначения состава спектакля", on_error=False)
+    def assign_cast(self, performance_id, roles):
+        """
+        Назначение всего состава спектакля (все роли или ни одной).
+
+        Args:
+            performance_id: ID спектакля
+            roles: Список кортежей (actor_id, role, contract_cost)
+
+        Returns:
+            bool: Успешность назначения
+        """
+        for actor_id, role, contract_cost in roles:
+            self._insert_cast_row(self._new_row("actor_performances", {
+                "actor_id": actor_id, "performance_id": performance_id, "role": role,
+                "contract_cost": contract_cost}))
+        return True
+
+    @_modifies("завершения спектакля", on_error=False)
+    def complete_performance(self, performance_id, revenue):
+        """
+        Завершение спектакля с указанием выручки и увеличение опыта его актеров.
+
+        Returns:
+            bool: Успешность завершения
+        """
+        performance = self._row(self._performances, performance_id)
+        if performance is not None:
+            _check(revenue >= 0, "Выручка не может быть отрицательной")
+            self._set(performance, "revenue", revenue)
+            self._set(performance, "is_completed", True)
+        for actor_id in self._casts.get(performance_id, {}):
+            actor = self._actors[actor_id - 1]
+            self._set(actor, "experience", actor["experience"] + 1)
+        return True
+
+    @_modifies("обновления бюджета", on_error=False)
+    def update_performance_budget(self, performance_id, budget):
+        """
+        Обновление бюджета спектакля.
+
+        Returns:
+            bool: Успешность обновления
+        """
+        performance = self._row(self._performances, performance_id)
+        if performance is not None:
+            _check(budget > 0, "Бюджет должен быть положительным")
+            self._set(performance, "budget", budget)
+        return True
+
+    @_modifies("повышения звания", on_error=False)
+    def upgrade_actor_rank(self, actor_id):
+        """
+        Повышение звания актера на одну ступень.
+
+        Returns:
+            bool: Было ли звание повышено
+        """
+        actor = self._row(self._actors, actor_id)
+        _check(actor is not None, f"Актер с ID {actor_id} не найден")
+
+        rank_order = list(ActorRank)
+        rank_idx = RANK_ORDER[actor["rank"]]
+        if rank_idx < len(rank_order) - 1:
+            self._set(actor, "rank", rank_order[rank_idx + 1].value)
+            return True
+        self.logger.info(f"Актер {actor_id} уже имеет максимальное звание")
+        return False
+
+    @_modifies("присвоения награды", on_error=False)
+    def award_actor(self, actor_id):
+        """
+        Присвоение награды актеру.
+
+        Returns:
+            bool: Успешность присвоения
+        """
+        actor = self._row(self._actors, actor_id)
+        if actor is not None:
+            self._set(actor, "awards_count", actor["awards_count"] + 1)
+        return True
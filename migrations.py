@@ -0,0 +1,331 @@
+"""
+Модуль версионных миграций схемы базы данных театра.
+Базовая схема создается DatabaseManager.create_schema (версия 0),
+последующие изменения описываются пронумерованными миграциями.
+Запуск из командной строки: python migrations.py status|upgrade [параметры подключения]
+"""
+import argparse
+import sys
+import psycopg2
+from psycopg2 import sql
+from logger import Logger
+
+
+# Размер пакета по умолчанию при заполнении данных порциями
+BACKFILL_BATCH_SIZE = 5000
+# Максимальное ожидание блокировки DDL-запросом, чтобы миграция не останавливала работу клиентов
+MIGRATION_LOCK_TIMEOUT = "5s"
+# Ключ рекомендательной блокировки: миграции выполняет только один клиент одновременно
+MIGRATION_ADVISORY_LOCK = 7510001
+
+
+class SqlStep:
+    """Шаг миграции: SQL-запрос, выполняемый в транзакции миграции."""
+    transactional = True
+
+    def __init__(self, statement):
+        self.statement = statement
+
+    def apply(self, connection, logger):
+        """Выполнение шага."""
+        with connection.cursor() as cursor:
+            cursor.execute(self.statement)
+
+
+class ConcurrentIndex:
+    """
+    Шаг миграции: построение индекса без блокировки записи (CREATE INDEX CONCURRENTLY).
+    Выполняется вне транзакции. Невалидный индекс, оставшийся
+    после прерванного построения, удаляется и строится заново.
+    """
+    transactional = False
+
+    def __init__(self, name, table, definition, unique=False):
+        """
+        Args:
+            name: Имя индекса
+            table: Имя таблицы
+            definition: Столбцы и условия индекса, например "(performance_id)"
+            unique: Уникальный индекс
+        """
+        self.name = name
+        self.table = table
+        self.definition = definition
+        self.unique = unique
+
+    def apply(self, connection, logger):
+        """Выполнение шага."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT i.indisvalid FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = %s
+            """, (self.name,))
+            row = cursor.fetchone()
+            if row is not None and row[0]:
+                return
+            if row is not None:
+                logger.warning(f"Индекс {self.name} невалиден и будет построен заново")
+                cursor.execute(sql.SQL("DROP INDEX CONCURRENTLY IF EXISTS {}").format(sql.Identifier(self.name)))
+
+            cursor.execute(sql.SQL("CREATE {unique}INDEX CONCURRENTLY {name} ON {table} {definition}").format(
+                unique=sql.SQL("UNIQUE " if self.unique else ""),
+                name=sql.Identifier(self.name),
+                table=sql.Identifier(self.table),
+                definition=sql.SQL(self.definition)))
+            logger.info(f"Построен индекс {self.name}")
+
+
+class Backfill:
+    """
+    Шаг миграции: заполнение данных порциями, каждая в своей транзакции.
+    Запрос должен обрабатывать не более %(batch_size)s строк и пропускать
+    уже обработанные, шаг повторяется, пока запрос изменяет строки.
+    """
+    transactional = False
+
+    def __init__(self, statement, batch_size=BACKFILL_BATCH_SIZE):
+        self.statement = statement
+        self.batch_size = batch_size
+
+    def apply(self, connection, logger):
+        """Выполнение шага."""
+        total = 0
+        with connection.cursor() as cursor:
+            while True:
+                cursor.execute(self.statement, {"batch_size": self.batch_size})
+                if cursor.rowcount <= 0:
+                    break
+                total += cursor.rowcount
+        logger.info(f"Заполнено строк: {total}")
+
+
+class Migration:
+    """
+    Пронумерованная миграция схемы.
+    Если все шаги транзакционные, миграция применяется атомарно; иначе шаги
+    выполняются по очереди и должны быть повторяемыми (IF NOT EXISTS и т.п.),
+    а версия записывается после успешного выполнения всех шагов.
+    """
+
+    def __init__(self, version, name, steps):
+        self.version = version
+        self.name = name
+        self.steps = steps
+
+    @property
+    def transactional(self):
+        """Можно ли выполнить миграцию в одной транзакции."""
+        return all(step.transactional for step in self.steps)
+
+
+# Миграции в порядке применения (версии возрастают, номера не переиспользуются)
+MIGRATIONS = [
+    Migration(1, "Индексы для частых запросов", [
+        # Поиск состава спектакля: первичный ключ actor_performances начинается с actor_id
+        ConcurrentIndex("actor_performances_performance_idx", "actor_performances", "(performance_id)"),
+        # Текущие (незавершенные) постановки: проверка занятости актера при удалении (delete_actor)
+        ConcurrentIndex("performances_open_idx", "performances", "(performance_id) WHERE is_completed = FALSE"),
+        # Проверка внешнего ключа при удалении сюжета
+        ConcurrentIndex("performances_plot_idx", "performances", "(plot_id)"),
+        # Keyset-пагинация актеров: (столбец сортировки, actor_id), см. ACTOR_SORT_COLUMNS
+        ConcurrentIndex("actors_last_name_page_idx", "actors", "(last_name, actor_id)"),
+        ConcurrentIndex("actors_first_name_page_idx", "actors", "(first_name, actor_id)"),
+        ConcurrentIndex("actors_patronymic_page_idx", "actors", "((COALESCE(patronymic, '')), actor_id)"),
+        ConcurrentIndex("actors_rank_page_idx", "actors", "(rank, actor_id)"),
+        ConcurrentIndex("actors_experience_page_idx", "actors", "(experience, actor_id)"),
+        ConcurrentIndex("actors_awards_page_idx", "actors", "(awards_count, actor_id)"),
+        # Keyset-пагинация спектаклей: (столбец сортировки, year), см. PERFORMANCE_SORT_COLUMNS
+        ConcurrentIndex("performances_title_page_idx", "performances", "(title, year)"),
+        ConcurrentIndex("performances_budget_page_idx", "performances", "(budget, year)"),
+        ConcurrentIndex("performances_revenue_page_idx", "performances", "(revenue, year)"),
+        ConcurrentIndex("performances_profit_page_idx", "performances", "((revenue - budget), year)"),
+    ]),
+]
+
+
+class MigrationRunner:
+    """
+    Применение миграций к БД и учет версий в таблице schema_version.
+    Использует отдельное соединение в режиме автофиксации.
+    """
+
+    def __init__(self, connection_params, migrations=None):
+        """
+        Args:
+            connection_params: Параметры подключения к БД
+            migrations: Список миграций (по умолчанию - MIGRATIONS)
+        """
+        self.logger = Logger()
+        self.connection_params = connection_params
+        self.migrations = sorted(MIGRATIONS if migrations is None else migrations, key=lambda m: m.version)
+
+    @property
+    def latest_version(self):
+        """Версия последней миграции (0, если миграций нет)."""
+        return self.migrations[-1].version if self.migrations else 0
+
+    def _connect(self):
+        """Открытие соединения для миграций."""
+        connection = psycopg2.connect(**self.connection_params)
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute("SET lock_timeout = %s", (MIGRATION_LOCK_TIMEOUT,))
+        return connection
+
+    def _ensure_version_table(self, connection):
+        """Создание таблицы версий схемы, если ее нет."""
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name VARCHAR(200) NOT NULL,
+                    applied_at TIMESTAMP NOT NULL DEFAULT NOW()
+                )
+            """)
+
+    def _applied(self, connection):
+        """Примененные миграции: версия -> время применения."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT version, applied_at FROM schema_version")
+            return dict(cursor.fetchall())
+
+    def status(self):
+        """
+        Состояние миграций.
+
+        Returns:
+            list or None: Список кортежей (версия, название, время применения или None),
+                          None при ошибке
+        """
+        try:
+            connection = self._connect()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка подключения для миграций: {str(e)}")
+            return None
+
+        try:
+            self._ensure_version_table(connection)
+            applied = self._applied(connection)
+            return [(m.version, m.name, applied.get(m.version)) for m in self.migrations]
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка получения состояния миграций: {str(e)}")
+            return None
+        finally:
+            connection.close()
+
+    def upgrade(self, target=None):
+        """
+        Применение непримененных миграций (до версии target включительно).
+
+        Args:
+            target: Версия, до которой выполняется обновление (по умолчанию - последняя)
+
+        Returns:
+            tuple: (успех операции (bool), сообщение (str))
+        """
+        try:
+            connection = self._connect()
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка подключения для миграций: {str(e)}")
+            return False, str(e)
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", (MIGRATION_ADVISORY_LOCK,))
+                if not cursor.fetchone()[0]:
+                    return False, "Миграции уже выполняются другим клиентом"
+                cursor.execute("SELECT 1 FROM information_schema.tables WHERE table_name = 'game_data'")
+                if cursor.fetchone() is None:
+                    return False, "Базовая схема БД не создана"
+
+            self._ensure_version_table(connection)
+            applied = self._applied(connection)
+            pending = [m for m in self.migrations
+                       if m.version not in applied and (target is None or m.version <= target)]
+
+            for migration in pending:
+                self._apply(connection, migration)
+
+            if not pending:
+                return True, "Схема БД в актуальном состоянии"
+            return True, f"Применено миграций: {len(pending)}"
+        except psycopg2.Error as e:
+            self.logger.error(f"Ошибка применения миграций: {str(e)}")
+            return False, str(e)
+        finally:
+            # Рекомендательная блокировка снимается при закрытии соединения
+            connection.close()
+
+    def _apply(self, connection, migration):
+        """Применение одной миграции и запись ее версии."""
+        self.logger.info(f"Применение миграции {migration.version}: {migration.name}")
+        if migration.transactional:
+            connection.autocommit = False
+            try:
+                for step in migration.steps:
+                    step.apply(connection, self.logger)
+                self._record(connection, migration)
+                connection.commit()
+            except psycopg2.Error:
+                connection.rollback()
+                raise
+            finally:
+                connection.autocommit = True
+        else:
+            for step in migration.steps:
+                step.apply(connection, self.logger)
+            self._record(connection, migration)
+        self.logger.info(f"Миграция {migration.version} применена")
+
+    def _record(self, connection, migration):
+        """Запись версии примененной миграции."""
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO schema_version (version, name) VALUES (%s, %s)",
+                           (migration.version, migration.name))
+
+
+def main(argv=None):
+    """
+    Просмотр состояния и применение миграций из командной строки.
+
+    Returns:
+        int: Код завершения процесса
+    """
+    parser = argparse.ArgumentParser(description="Миграции схемы БД театра")
+    parser.add_argument("command", choices=("status", "upgrade"), help="Команда")
+    parser.add_argument("--target", type=int, help="Версия, до которой выполняется обновление")
+    parser.add_argument("--dbname", default="task1", help="Имя базы данных")
+    parser.add_argument("--user", default="postgres", help="Имя пользователя")
+    parser.add_argument("--password", default="postgres", help="Пароль")
+    parser.add_argument("--host", default="localhost", help="Хост сервера БД")
+    parser.add_argument("--port", default="5432", help="Порт сервера БД")
+    args = parser.parse_args(argv)
+
+    runner = MigrationRunner({
+        "dbname": args.dbname,
+        "user": args.user,
+        "password": args.password,
+        "host": args.host,
+        "port": args.port
+    })
+
+    if args.command == "status":
+        migrations = runner.status()
+        if migrations is None:
+            print("Не удалось получить состояние миграций", file=sys.stderr)
+            return 1
+        for version, name, applied_at in migrations:
+            state = f"применена {applied_at:%Y-%m-%d %H:%M:%S}" if applied_at else "не применена"
+            print(f"{version:4d}  {name}  [{state}]")
+        if not migrations:
+            print("Миграций нет")
+        return 0
+
+    success, message = runner.upgrade(args.target)
+    print(message)
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
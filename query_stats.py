@@ -0,0 +1,409 @@
+"""
+Модуль сбора статистики запросов к базе данных.
+Измеряет время методов DatabaseManager и отдельных запросов, группирует
+запросы по нормализованному тексту и записывает медленные запросы с планом выполнения.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from functools import lru_cache
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extras import DictCursor
+from logger import Logger
+
+
+# Верхние границы интервалов гистограммы времени выполнения (мс)
+LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+# Порог медленного запроса по умолчанию (мс)
+SLOW_QUERY_THRESHOLD_MS = 200
+# Файл журнала медленных запросов
+SLOW_QUERY_LOG = "slow_queries.log"
+# Максимальное число различных запросов в статистике (остальные учитываются вместе)
+MAX_FINGERPRINTS = 500
+OTHER_QUERIES = "<другие запросы>"
+# Запросы, для которых можно получить план через EXPLAIN
+EXPLAINABLE_STATEMENTS = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH")
+# Число выполнений запроса за одно действие, начиная с которого он считается N+1
+REPEATED_QUERY_MIN = 3
+# Число хранимых отчетов о последних действиях пользователя
+MAX_ACTION_REPORTS = 100
+
+# Замены при нормализации текста запроса (порядок важен)
+_NORMALIZE_PATTERNS = (
+    (re.compile(r"--[^\n]*"), " "),
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"%\(\w+\)s|%s"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"\s+"), " "),
+    # Многострочный VALUES (execute_values) и списки значений
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+"), "(...)"),
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)"), "(?, ...)"),
+)
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(query):
+    """
+    Нормализованный текст запроса: значения заменены на ?, пробелы сжаты.
+    Запросы, отличающиеся только значениями, имеют одинаковый отпечаток.
+    """
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        query = pattern.sub(replacement, query)
+    return query.strip()
+
+
+def query_text(cursor, query):
+    """Текст запроса в виде строки (для составных и байтовых запросов)."""
+    if isinstance(query, sql.Composable):
+        return query.as_string(cursor)
+    if isinstance(query, bytes):
+        return query.decode(cursor.connection.encoding)
+    return query
+
+
+class LatencyHistogram:
+    """Гистограмма времени выполнения с интервалами LATENCY_BUCKETS_MS."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms, rows=0):
+        """Учет одного выполнения."""
+        self.calls += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)] += 1
+
+    def percentile(self, fraction):
+        """Оценка перцентиля: верхняя граница интервала, в который он попадает."""
+        threshold = fraction * self.calls
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= threshold and count:
+                bound = LATENCY_BUCKETS_MS[index] if index < len(LATENCY_BUCKETS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return 0.0
+
+    def snapshot(self, name):
+        """Сводка по гистограмме в виде словаря."""
+        return {
+            "name": name,
+            "calls": self.calls,
+            "total_ms": self.total_ms,
+            "avg_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_ms": self.max_ms,
+            "rows": self.rows,
+            "buckets": list(zip(LATENCY_BUCKETS_MS + (None,), self.buckets)),
+        }
+
+
+class QueryBudgetExceeded(Exception):
+    """Действие выполнило больше запросов, чем допускает его лимит (в строгом режиме)."""
+
+
+class ActionQueries:
+    """Запросы к БД, выполненные в рамках одного действия пользователя."""
+
+    def __init__(self, name, budget=None):
+        """
+        Args:
+            name: Название действия
+            budget: Допустимое число запросов (None - без ограничения)
+        """
+        self.name = name
+        self.budget = budget
+        self.queries = 0
+        self.elapsed_ms = 0.0
+        self.fingerprints = Counter()
+        # Одинаковые запросы с одинаковыми параметрами: (отпечаток, хэш текста и параметров)
+        self.statements = Counter()
+
+    def record(self, key, text, vars):
+        """Учет запроса, выполненного в рамках действия."""
+        self.queries += 1
+        self.fingerprints[key] += 1
+        self.statements[key, hash((text, repr(vars)))] += 1
+
+    @property
+    def over_budget(self):
+        """Превышен ли лимит запросов."""
+        return self.budget is not None and self.queries > self.budget
+
+    def repeated(self):
+        """Запросы, выполненные не менее REPEATED_QUERY_MIN раз с разными значениями (N+1)."""
+        return [(key, count) for key, count in self.fingerprints.most_common() if count >= REPEATED_QUERY_MIN]
+
+    def duplicates(self):
+        """Запросы, выполненные повторно с теми же параметрами."""
+        duplicates = Counter()
+        for (key, _), count in self.statements.items():
+            if count > 1:
+                duplicates[key] += count
+        return duplicates.most_common()
+
+    def summary(self):
+        """Сводка по действию в виде словаря."""
+        return {
+            "name": self.name,
+            "queries": self.queries,
+            "distinct": len(self.fingerprints),
+            "repeated": self.repeated(),
+            "duplicates": self.duplicates(),
+            "budget": self.budget,
+            "over_budget": self.over_budget,
+            "elapsed_ms": self.elapsed_ms,
+        }
+
+    def report(self):
+        """Текстовый отчет о запросах действия."""
+        lines = [f"Действие '{self.name}': запросов {self.queries} (различных {len(self.fingerprints)}), "
+                 f"{self.elapsed_ms:.0f} мс"]
+        if self.over_budget:
+            lines.append(f"  превышен лимит запросов: {self.budget}")
+        for key, count in self.repeated():
+            lines.append(f"  повторяется {count} раз: {key[:200]}")
+        for key, count in self.duplicates():
+            lines.append(f"  одинаковые параметры, {count} раз: {key[:200]}")
+        return "\n".join(lines)
+
+
+class TimedCursor(DictCursor):
+    """Курсор, измеряющий время выполнения запросов (см. QueryStats.cursor_class)."""
+    stats = None
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().execute(query, vars)
+            failed = False
+            return result
+        finally:
+            self.stats.record_query(self, query, vars, (time.perf_counter() - started) * 1000, failed)
+
+    def copy_expert(self, query, file, size=8192):
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = super().copy_expert(query, file, size)
+            failed = False
+            return result
+        finally:
+            self.stats.record_query(self, query, None, (time.perf_counter() - started) * 1000, failed)
+
+
+class QueryStats:
+    """
+    Статистика времени выполнения методов DatabaseManager и запросов.
+    Безопасна для использования из нескольких потоков.
+    """
+
+    def __init__(self, slow_threshold_ms=SLOW_QUERY_THRESHOLD_MS, slow_log_file=SLOW_QUERY_LOG):
+        self.logger = Logger()
+        self.slow_threshold_ms = slow_threshold_ms
+        self.slow_log_file = slow_log_file
+        self._slow_logger = None
+        self._lock = threading.Lock()
+        # Стек вызываемых методов DatabaseManager для каждого потока
+        self._local = threading.local()
+        self._methods = {}
+        self._queries = {}
+        # Лимиты числа запросов по названиям действий и отчеты о последних действиях
+        self.budgets = {}
+        self.strict_budgets = False
+        self._actions = deque(maxlen=MAX_ACTION_REPORTS)
+
+    def cursor_class(self):
+        """Класс курсора, записывающего статистику в этот объект."""
+        return type("TimedCursor", (TimedCursor,), {"stats": self})
+
+    def set_slow_threshold(self, threshold_ms):
+        """Установка порога медленного запроса (мс)."""
+        self.slow_threshold_ms = threshold_ms
+
+    @contextmanager
+    def track(self, method):
+        """Измерение времени вызова метода DatabaseManager."""
+        stack = self._local.__dict__.setdefault("methods", [])
+        stack.append(method)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._methods.setdefault(method, LatencyHistogram()).record(elapsed_ms)
+            self.logger.metric("db_method", method=method, duration_ms=round(elapsed_ms, 3))
+
+    def set_query_budget(self, action, max_queries):
+        """Установка лимита числа запросов для действия (None - без ограничения)."""
+        if max_queries is None:
+            self.budgets.pop(action, None)
+        else:
+            self.budgets[action] = max_queries
+
+    @contextmanager
+    def action(self, name, budget=None):
+        """
+        Учет запросов, выполненных в текущем потоке в рамках действия пользователя.
+        По завершении действия отчет сохраняется, а при повторяющихся запросах
+        или превышении лимита записывается предупреждение в лог. В строгом режиме
+        (strict_budgets) превышение лимита вызывает QueryBudgetExceeded.
+
+        Args:
+            name: Название действия
+            budget: Допустимое число запросов (по умолчанию - из budgets)
+        """
+        action = ActionQueries(name, self.budgets.get(name) if budget is None else budget)
+        actions = self._local.__dict__.setdefault("actions", [])
+        actions.append(action)
+        started = time.perf_counter()
+        try:
+            yield action
+        finally:
+            actions.pop()
+            action.elapsed_ms = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._actions.append(action.summary())
+            repeated = action.repeated()
+            # Поля события вычисляются, только если журнал событий включен
+            if self.logger.structured:
+                self.logger.metric("user_action", action=name, queries=action.queries,
+                                   distinct_queries=len(action.fingerprints), repeated_queries=len(repeated),
+                                   duration_ms=round(action.elapsed_ms, 3))
+            if action.over_budget or repeated or action.duplicates():
+                self.logger.warning(action.report())
+        if self.strict_budgets and action.over_budget:
+            raise QueryBudgetExceeded(action.report())
+
+    def current_method(self):
+        """Метод DatabaseManager, выполняющийся в текущем потоке."""
+        stack = getattr(self._local, "methods", None)
+        return stack[-1] if stack else None
+
+    def record_query(self, cursor, query, vars, elapsed_ms, failed):
+        """
+        Учет выполненного запроса; медленные запросы записываются в журнал с планом.
+
+        Args:
+            cursor: Курсор, выполнивший запрос
+            query: Запрос (строка, байты или составной запрос)
+            vars: Параметры запроса
+            elapsed_ms: Время выполнения (мс)
+            failed: Завершился ли запрос ошибкой
+        """
+        try:
+            text = query_text(cursor, query)
+        except psycopg2.Error:
+            # Составной запрос нельзя преобразовать в текст без открытого соединения
+            text = str(query)
+        key = fingerprint(text)
+        rows = cursor.rowcount if not failed else 0
+        for action in getattr(self._local, "actions", ()):
+            action.record(key, text, vars)
+        with self._lock:
+            if key not in self._queries and len(self._queries) >= MAX_FINGERPRINTS:
+                key = OTHER_QUERIES
+            self._queries.setdefault(key, LatencyHistogram()).record(elapsed_ms, rows)
+
+        if not failed and elapsed_ms >= self.slow_threshold_ms:
+            self._log_slow_query(cursor.connection, text, vars, key, elapsed_ms, rows)
+
+    def _log_slow_query(self, connection, text, vars, key, elapsed_ms, rows):
+        """Запись медленного запроса и его плана в журнал медленных запросов."""
+        words = text.split(None, 1)
+        if words and words[0].upper() in EXPLAINABLE_STATEMENTS:
+            plan = self._explain(connection, text, vars)
+        else:
+            plan = "(план недоступен для этого запроса)"
+
+        method = self.current_method() or "-"
+        self.logger.warning(f"Медленный запрос ({elapsed_ms:.0f} мс) в {method}: {key[:120]}")
+        self._get_slow_logger().warning(
+            f"{elapsed_ms:.1f} мс, строк: {rows}, метод: {method}\n{key}\n{plan}\n")
+
+    def _explain(self, connection, text, vars):
+        """
+        План выполнения запроса (EXPLAIN без выполнения).
+        В открытой транзакции используется точка сохранения, чтобы ошибка
+        получения плана не прервала транзакцию.
+        """
+        savepoint = not connection.autocommit
+        with connection.cursor() as cursor:
+            if savepoint:
+                cursor.execute("SAVEPOINT query_stats_explain")
+            try:
+                cursor.execute("EXPLAIN " + text, vars)
+                plan = "\n".join(row[0] for row in cursor.fetchall())
+            except psycopg2.Error as e:
+                if savepoint:
+                    cursor.execute("ROLLBACK TO SAVEPOINT query_stats_explain")
+                return f"(план недоступен: {str(e).strip()})"
+            if savepoint:
+                cursor.execute("RELEASE SAVEPOINT query_stats_explain")
+            return plan
+
+    def _get_slow_logger(self):
+        """Отдельный журнал медленных запросов (создается при первой записи)."""
+        if self._slow_logger is None:
+            slow_logger = logging.getLogger(f"{__name__}.slow")
+            slow_logger.propagate = False
+            if not slow_logger.handlers:
+                handler = logging.FileHandler(self.slow_log_file, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"))
+                slow_logger.addHandler(handler)
+            self._slow_logger = slow_logger
+        return self._slow_logger
+
+    def method_stats(self):
+        """
+        Статистика по методам DatabaseManager.
+
+        Returns:
+            list: Сводки гистограмм (словари), по убыванию суммарного времени
+        """
+        with self._lock:
+            stats = [histogram.snapshot(name) for name, histogram in self._methods.items()]
+        return sorted(stats, key=lambda item: item["total_ms"], reverse=True)
+
+    def query_stats(self):
+        """
+        Статистика по нормализованным запросам.
+
+        Returns:
+            list: Сводки гистограмм (словари), по убыванию суммарного времени
+        """
+        with self._lock:
+            stats = [histogram.snapshot(name) for name, histogram in self._queries.items()]
+        return sorted(stats, key=lambda item: item["total_ms"], reverse=True)
+
+    def action_stats(self):
+        """
+        Отчеты о последних действиях пользователя.
+
+        Returns:
+            list: Сводки действий (словари), начиная с последнего
+        """
+        with self._lock:
+            return list(reversed(self._actions))
+
+    def reset(self):
+        """Очистка накопленной статистики."""
+        with self._lock:
+            self._methods.clear()
+            self._queries.clear()
+            self._actions.clear()
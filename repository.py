@@ -0,0 +1,287 @@
+"""
+Модуль интерфейса хранилища данных театра.
+Описывает операции, через которые TheaterController читает и изменяет данные:
+актеров, сюжеты, спектакли, составы и игровые данные. Реализации - DatabaseManager
+(PostgreSQL) и InMemoryRepository (данные в памяти процесса, для массового
+моделирования без БД).
+"""
+from abc import ABC, abstractmethod
+
+
+class TransactionState:
+    """
+    Состояние единицы работы, открытой через TheaterRepository.transaction().
+    """
+
+    def __init__(self):
+        self.failed = False
+        self.committed = False
+        # Ключи кэша, затронутые внутри транзакции
+        self.invalidated = set()
+
+    def rollback(self):
+        """Пометка транзакции на откат при выходе из блока."""
+        self.failed = True
+
+
+class TheaterRepository(ABC):
+    """
+    Хранилище данных театра.
+    Методы возвращают строки как словари с именами столбцов таблиц БД
+    и сообщают об ошибках возвращаемым значением, как DatabaseManager.
+    Ошибка шага внутри transaction() отменяет всю единицу работы.
+    """
+
+    def connect(self):
+        """
+        Подготовка хранилища к работе.
+
+        Returns:
+            bool: Успешность подключения
+        """
+        return True
+
+    def disconnect(self):
+        """Освобождение ресурсов хранилища."""
+
+    def schema_exists(self):
+        """Созданы ли структуры для хранения данных."""
+        return True
+
+    def create_schema(self):
+        """Создание структур для хранения данных."""
+        return True
+
+    def migrate(self, target=None):
+        """Обновление структур хранения до последней (или указанной) версии."""
+        return True
+
+    @abstractmethod
+    def transaction(self):
+        """
+        Единица работы: изменения внутри блока сохраняются вместе при выходе
+        или отменяются целиком (ошибка шага, исключение, state.rollback()).
+        Вложенные блоки присоединяются к внешней транзакции.
+
+        Yields:
+            TransactionState: Состояние транзакции
+        """
+
+    @abstractmethod
+    def init_sample_data(self, fixture_dir=None):
+        """
+        Заполнение данными из набора CSV-файлов (фикстуры).
+
+        Args:
+            fixture_dir: Каталог с файлами <таблица>.csv (по умолчанию - тестовые данные)
+
+        Returns:
+            bool: Успешность инициализации
+        """
+
+    @abstractmethod
+    def reset_database(self, fixture_dir=None):
+        """
+        Сброс всех данных к начальному состоянию фикстуры.
+
+        Returns:
+            bool: Успешность сброса
+        """
+
+    @abstractmethod
+    def get_actors(self):
+        """
+        Список всех актеров в порядке ID.
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+
+    @abstractmethod
+    def get_actors_page(self, after_id=None, limit=None, order_by="actor_id", descending=False,
+                        after_value=None):
+        """
+        Страница актеров после строки (after_value, after_id) в порядке (order_by, actor_id).
+
+        Returns:
+            list: Список словарей с данными актеров
+        """
+
+    @abstractmethod
+    def get_plots(self):
+        """
+        Список всех сюжетов в порядке названий.
+
+        Returns:
+            list: Список словарей с данными сюжетов
+        """
+
+    @abstractmethod
+    def get_plot(self, plot_id):
+        """
+        Сюжет по ID.
+
+        Returns:
+            dict or None: Данные сюжета или None, если он не найден
+        """
+
+    @abstractmethod
+    def get_performances(self, year=None):
+        """
+        Спектакли с названием сюжета (plot_title), все или за год.
+
+        Returns:
+            list: Список словарей с данными спектаклей
+        """
+
+    @abstractmethod
+    def get_performances_page(self, after_year=None, limit=None, order_by="year", descending=True,
+                              after_value=None):
+        """
+        Страница спектаклей с полями plot_title и profit после строки
+        (after_value, after_year) в порядке (order_by, year).
+
+        Returns:
+            list: Список словарей с данными спектаклей
+        """
+
+    @abstractmethod
+    def get_performance(self, performance_id):
+        """
+        Спектакль с названием сюжета (plot_title) по ID.
+
+        Returns:
+            dict or None: Данные спектакля или None, если он не найден
+        """
+
+    @abstractmethod
+    def get_actors_in_performance(self, performance_id):
+        """
+        Актеры спектакля с ролью и стоимостью контракта, по убыванию стоимости контракта.
+
+        Returns:
+            list: Список словарей с данными актеров и их ролей
+        """
+
+    @abstractmethod
+    def get_game_data(self):
+        """
+        Игровые данные (current_year, capital).
+
+        Returns:
+            dict or None: Словарь с игровыми данными
+        """
+
+    @abstractmethod
+    def update_game_data(self, year, capital):
+        """
+        Обновление текущего года и капитала.
+
+        Returns:
+            bool: Успешность обновления
+        """
+
+    @abstractmethod
+    def add_actor(self, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Добавление актера.
+
+        Returns:
+            int or None: ID добавленного актера или None при ошибке
+        """
+
+    @abstractmethod
+    def import_actors(self, rows):
+        """
+        Добавление или обновление актеров по ФИО.
+
+        Args:
+            rows: Кортежи (номер строки, фамилия, имя, отчество, звание, награды, опыт)
+
+        Returns:
+            tuple or None: (число добавленных, число обновленных) или None при ошибке
+        """
+
+    @abstractmethod
+    def update_actor(self, actor_id, last_name, first_name, patronymic, rank, awards_count, experience):
+        """
+        Обновление данных актера.
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+
+    @abstractmethod
+    def delete_actor(self, actor_id):
+        """
+        Удаление актера, не занятого в текущих постановках.
+
+        Returns:
+            tuple: (успех операции (bool), сообщение об ошибке (str))
+        """
+
+    @abstractmethod
+    def create_performance(self, title, plot_id, year, budget):
+        """
+        Создание незавершенного спектакля.
+
+        Returns:
+            int or None: ID созданного спектакля или None при ошибке
+        """
+
+    @abstractmethod
+    def assign_actor_to_role(self, actor_id, performance_id, role, contract_cost):
+        """
+        Назначение актера на роль в спектакле.
+
+        Returns:
+            bool: Успешность назначения
+        """
+
+    @abstractmethod
+    def assign_cast(self, performance_id, roles):
+        """
+        Назначение всего состава спектакля.
+
+        Args:
+            roles: Список кортежей (actor_id, role, contract_cost)
+
+        Returns:
+            bool: Успешность назначения
+        """
+
+    @abstractmethod
+    def complete_performance(self, performance_id, revenue):
+        """
+        Завершение спектакля с выручкой и увеличение опыта его актеров.
+
+        Returns:
+            bool: Успешность завершения
+        """
+
+    @abstractmethod
+    def update_performance_budget(self, performance_id, budget):
+        """
+        Обновление бюджета спектакля.
+
+        Returns:
+            bool: Успешность обновления
+        """
+
+    @abstractmethod
+    def upgrade_actor_rank(self, actor_id):
+        """
+        Повышение звания актера на одну ступень.
+
+        Returns:
+            bool: Было ли звание повышено
+        """
+
+    @abstractmethod
+    def award_actor(self, actor_id):
+        """
+        Присвоение награды актеру.
+
+        Returns:
+            bool: Успешность присвоения
+        """
@@ -0,0 +1,115 @@
+"""
+Тесты хранилища данных в памяти процесса (InMemoryRepository)
+вместе с бизнес-логикой TheaterController.
+Запуск: python -m unittest test_memory_repository
+"""
+import random
+import unittest
+
+from controller import TheaterController
+from memory_repository import InMemoryRepository, INTEGER_RANGE, BIGINT_RANGE
+
+
+class InMemoryRepositoryTest(unittest.TestCase):
+    """Сезон театра и единицы работы на тестовых данных в памяти."""
+
+    def setUp(self):
+        random.seed(1)
+        self.repo = InMemoryRepository()
+        self.controller = TheaterController(self.repo)
+        self.assertTrue(self.controller.connect_to_database())
+        self.assertTrue(self.controller.initialize_database())
+
+    def affordable_plot(self):
+        """Сюжет, минимальный бюджет которого не превышает капитал."""
+        capital = self.repo.get_game_data()['capital']
+        return next(plot for plot in self.repo.get_plots() if plot['minimum_budget'] <= capital)
+
+    def cast_for(self, plot):
+        """Состав для сюжета: (actor_id, роль, стоимость контракта)."""
+        actors = self.repo.get_actors()[:plot['roles_count']]
+        return [(actor['actor_id'], f"Роль {i + 1}", 10000) for i, actor in enumerate(actors)]
+
+    def test_create_calculate_skip_year(self):
+        game_data = self.repo.get_game_data()
+        plot = self.affordable_plot()
+        budget = plot['minimum_budget']
+
+        success, performance_id = self.controller.create_new_performance(
+            "Проверка", plot['plot_id'], game_data['current_year'], budget, self.cast_for(plot))
+        self.assertTrue(success)
+        self.assertEqual(self.repo.get_game_data()['capital'], game_data['capital'] - budget)
+        self.assertEqual(len(self.repo.get_actors_in_performance(performance_id)), plot['roles_count'])
+
+        success, result = self.controller.calculate_performance_result(performance_id)
+        self.assertTrue(success)
+        performance = self.repo.get_performance(performance_id)
+        self.assertTrue(performance['is_completed'])
+        self.assertEqual(performance['revenue'], result['revenue'])
+        self.assertEqual(self.repo.get_game_data()['current_year'], game_data['current_year'] + 1)
+
+        year = self.repo.get_game_data()['current_year']
+        outcome = self.controller.skip_year()
+        self.assertEqual(outcome['year'], year + 1)
+        self.assertEqual(self.repo.get_game_data(), {'id': 1, 'current_year': year + 1,
+                                                     'capital': outcome['capital']})
+
+    def test_transaction_rollback(self):
+        game_data = self.repo.get_game_data()
+        performances = self.repo.get_performances()
+
+        with self.repo.transaction() as tx:
+            self.assertTrue(self.repo.update_game_data(game_data['current_year'] + 5, 1))
+            self.assertIsNotNone(self.repo.create_performance("Откат", 1, game_data['current_year'], 500000))
+            tx.rollback()
+
+        self.assertFalse(tx.committed)
+        self.assertEqual(self.repo.get_game_data(), game_data)
+        self.assertEqual(self.repo.get_performances(), performances)
+
+    def test_failed_step_rolls_back_transaction(self):
+        game_data = self.repo.get_game_data()
+
+        with self.repo.transaction() as tx:
+            self.assertTrue(self.repo.update_game_data(game_data['current_year'], 1))
+            # Несуществующий сюжет: ошибка шага отменяет всю единицу работы
+            self.assertIsNone(self.repo.create_performance("Ошибка", 10 ** 6, game_data['current_year'], 1))
+
+        self.assertTrue(tx.failed)
+        self.assertFalse(tx.committed)
+        self.assertEqual(self.repo.get_game_data(), game_data)
+
+    def test_produce_performance_rolls_back_creation(self):
+        game_data = self.repo.get_game_data()
+        performances = self.repo.get_performances()
+        plot = self.affordable_plot()
+        self.controller.calculate_performance_result = lambda performance_id: (False, "Ошибка расчета")
+
+        success, _ = self.controller.produce_performance(
+            "Проверка", plot['plot_id'], game_data['current_year'], plot['minimum_budget'], self.cast_for(plot))
+
+        self.assertFalse(success)
+        self.assertEqual(self.repo.get_game_data(), game_data)
+        self.assertEqual(self.repo.get_performances(), performances)
+
+    def test_integer_columns(self):
+        # Дробные значения округляются, как при записи в INTEGER
+        actor_id = self.repo.add_actor("Целов", "Иван", "", "Начинающий", 1.5, 2.6)
+        actor = next(actor for actor in self.repo.get_actors() if actor['actor_id'] == actor_id)
+        self.assertEqual((actor['awards_count'], actor['experience']), (2, 3))
+        self.assertIsInstance(actor['experience'], int)
+
+        # Значения вне диапазона типа столбца не записываются
+        game_data = self.repo.get_game_data()
+        self.assertFalse(self.repo.update_game_data(INTEGER_RANGE[1] + 1, game_data['capital']))
+        self.assertFalse(self.repo.update_game_data(game_data['current_year'], BIGINT_RANGE[1] + 1))
+        self.assertTrue(self.repo.update_game_data(game_data['current_year'], INTEGER_RANGE[1] + 1))
+        self.assertEqual(self.repo.get_game_data()['capital'], INTEGER_RANGE[1] + 1)
+
+        success, _ = self.repo.update_actor(actor_id, "Целов", "Иван", "", "Начинающий", INTEGER_RANGE[1], 0)
+        self.assertTrue(success)
+        self.assertFalse(self.repo.award_actor(actor_id))
+
+
+if __name__ == "__main__":
+    unittest.main()
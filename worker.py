@@ -0,0 +1,171 @@
+"""
+Модуль фонового выполнения операций с базой данных.
+Позволяет вызывать методы контроллера вне потока графического интерфейса.
+"""
+import threading
+from contextlib import nullcontext
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from logger import Logger
+
+
+# Число потоков для фоновых операций с БД
+WORKER_THREADS = 4
+
+
+class TaskSignals(QObject):
+    """Сигналы завершения фоновой задачи."""
+    finished = Signal(object, object)
+    failed = Signal(object, str)
+
+
+class DbTask(QRunnable):
+    """
+    Фоновая задача: вызов функции с аргументами в потоке пула.
+    """
+
+    def __init__(self, func, args, kwargs, on_success=None, on_error=None, action=None):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_success = on_success
+        self.on_error = on_error
+        # Контекст учета запросов действия пользователя (открывается в потоке пула)
+        self.action = action
+        self.signals = TaskSignals()
+        self.cancelled = False
+        # Поток пула, выполняющий задачу (None - задача не выполняется)
+        self.thread_id = None
+        self._thread_lock = threading.Lock()
+        self.setAutoDelete(False)
+
+    def cancel(self):
+        """Отмена задачи: результат не будет доставлен."""
+        self.cancelled = True
+
+    def interrupt(self, cancel_queries):
+        """
+        Прерывание запроса задачи, если она выполняется.
+        Под блокировкой поток не может перейти к следующей задаче пула.
+
+        Args:
+            cancel_queries: Функция прерывания запросов по набору потоков
+        """
+        with self._thread_lock:
+            if self.thread_id is not None:
+                cancel_queries({self.thread_id})
+
+    def run(self):
+        """Выполнение задачи в потоке пула."""
+        if self.cancelled:
+            self.signals.finished.emit(self, None)
+            return
+
+        with self._thread_lock:
+            self.thread_id = threading.get_ident()
+        try:
+            with self.action if self.action is not None else nullcontext():
+                result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self, str(e))
+            return
+        finally:
+            with self._thread_lock:
+                self.thread_id = None
+        self.signals.finished.emit(self, result)
+
+
+class DbWorker(QObject):
+    """
+    Исполнитель операций с БД в фоновом пуле потоков.
+    Обработчики результатов вызываются в потоке интерфейса.
+    Сообщает о занятости для индикатора и поддерживает отмену.
+    """
+    busy_changed = Signal(bool)
+
+    def __init__(self, controller, parent=None, max_threads=WORKER_THREADS):
+        super().__init__(parent)
+        self.controller = controller
+        self.logger = Logger()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._tasks = set()
+
+    def submit(self, func, *args, on_success=None, on_error=None, action=None, query_budget=None, **kwargs):
+        """
+        Запуск функции в фоновом потоке.
+
+        Args:
+            func: Вызываемая функция (обычно метод контроллера)
+            args: Позиционные аргументы функции
+            on_success: Обработчик результата
+            on_error: Обработчик текста ошибки
+            action: Название действия пользователя для учета запросов к БД
+            query_budget: Допустимое число запросов действия
+            kwargs: Именованные аргументы функции
+
+        Returns:
+            DbTask: Запущенная задача
+        """
+        if action is not None:
+            action = self.controller.query_action(action, query_budget)
+        task = DbTask(func, args, kwargs, on_success, on_error, action)
+        # Слоты объекта из потока интерфейса: сигналы из пула доставляются через очередь событий
+        task.signals.finished.connect(self._on_task_finished)
+        task.signals.failed.connect(self._on_task_failed)
+
+        was_busy = self.is_busy()
+        self._tasks.add(task)
+        if not was_busy:
+            self.busy_changed.emit(True)
+
+        self.pool.start(task)
+        return task
+
+    def is_busy(self):
+        """Есть ли незавершенные задачи."""
+        return bool(self._tasks)
+
+    def cancel(self, task):
+        """
+        Отмена одной задачи; ее выполняющийся запрос к БД прерывается,
+        запросы других задач продолжают выполняться.
+        """
+        if task is None or task not in self._tasks:
+            return
+        task.cancel()
+        task.interrupt(self.controller.cancel_queries)
+
+    def cancel_all(self):
+        """Отмена всех задач и прерывание выполняющихся запросов к БД."""
+        if not self._tasks:
+            return
+        # Ожидающие задачи завершатся сразу, выполняющиеся получат ошибку отмены запроса
+        for task in self._tasks:
+            task.cancel()
+        self.controller.cancel_queries()
+        self.logger.warning("Фоновые операции с БД отменены")
+
+    def wait_for_done(self, msecs=-1):
+        """Ожидание завершения всех задач."""
+        return self.pool.waitForDone(msecs)
+
+    def _on_task_finished(self, task, result):
+        """Доставка результата задачи."""
+        self._finish(task)
+        if not task.cancelled and task.on_success:
+            task.on_success(result)
+
+    def _on_task_failed(self, task, message):
+        """Доставка ошибки задачи."""
+        self._finish(task)
+        self.logger.error(f"Ошибка фоновой операции: {message}")
+        if not task.cancelled and task.on_error:
+            task.on_error(message)
+
+    def _finish(self, task):
+        """Учет завершения задачи."""
+        self._tasks.discard(task)
+        if not self._tasks:
+            self.busy_changed.emit(False)